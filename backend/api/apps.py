@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from . import changes, checks, graph  # noqa: F401  (checks registers itself)
+        changes.connect_signals()
+        graph.connect_signals()
@@ -0,0 +1,161 @@
+"""
+Collects which planning rows a request changed, for the per-project change log.
+
+ProjectRevisionMiddleware opens a collection around every project-scoped
+write; model signals (and explicit record_change() calls in views that write
+with queryset.update()) fill it, and the middleware stores it as
+ProjectChange rows under the revision it just bumped. A request that
+collected nothing leaves the revision alone.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .models import (
+    AcceptanceCriterion,
+    Day,
+    Dependency,
+    DependencyView,
+    Milestone,
+    MilestoneTodo,
+    Phase,
+    Project,
+    Task,
+    TaskLegend,
+    TaskLegendAssignment,
+    TaskLegendType,
+    Team,
+)
+
+# Change-log entity name for each tracked model.
+TRACKED_MODELS = {
+    Team: "teams",
+    Task: "tasks",
+    Milestone: "milestones",
+    Dependency: "dependencies",
+    Phase: "phases",
+    Day: "days",
+}
+
+# Models that aren't in the change log but do show up in revision-tagged
+# responses (project settings, dependency views, legends): writing them moves
+# the revision without adding change-log entries.
+UNTRACKED_MODELS = (Project, DependencyView, TaskLegend, TaskLegendType)
+
+# Sentinel key: the request replaced the project wholesale (e.g. snapshot restore).
+RESET = ("*", 0)
+# Sentinel key: the request wrote rows of UNTRACKED_MODELS.
+UNTRACKED = ("*", 1)
+
+_pending = ContextVar("project_changes", default=None)
+
+
+@contextmanager
+def collecting_changes():
+    """Collect {(entity, id): action} for the duration of the block."""
+    token = _pending.set({})
+    try:
+        yield _pending.get()
+    finally:
+        _pending.reset(token)
+
+
+def record_change(entity, ids, action="updated"):
+    """Note that rows ``ids`` of ``entity`` were created, updated or deleted."""
+    pending = _pending.get()
+    if pending is None:
+        return
+    for entity_id in ids:
+        key = (entity, entity_id)
+        previous = pending.get(key)
+        # created + updated stays created; a delete always wins
+        if previous is None or action == "deleted":
+            pending[key] = action
+
+
+def record_reset():
+    """Invalidate the whole change log; clients fall back to a full refetch."""
+    pending = _pending.get()
+    if pending is not None:
+        pending[RESET] = "reset"
+
+
+def record_untracked_write():
+    """Note a write the change log doesn't cover; the revision still has to move."""
+    pending = _pending.get()
+    if pending is not None:
+        pending[UNTRACKED] = "updated"
+
+
+def record_task_done_change(task_ids):
+    """Acceptance criteria changed: the tasks and their milestones' effective done state changed."""
+    if _pending.get() is None:
+        return
+    record_change("tasks", task_ids)
+    record_change("milestones", Milestone.objects.filter(task_id__in=task_ids).values_list("id", flat=True))
+
+
+# ─── signal receivers ────────────────────────────────────
+
+def _on_save(sender, instance, created, **kwargs):
+    entity = TRACKED_MODELS.get(sender)
+    if sender is Day:
+        # Days are computed; a stored row is only an override, so log the day by index.
+        record_change("days", [instance.day_index])
+    elif entity:
+        record_change(entity, [instance.pk], "created" if created else "updated")
+    elif sender is MilestoneTodo:
+        record_change("milestones", [instance.milestone_id])
+    elif sender is TaskLegendAssignment:
+        record_change("tasks", [instance.task_id])
+    elif sender is AcceptanceCriterion:
+        record_task_done_change([instance.task_id])
+
+
+def _on_delete(sender, instance, **kwargs):
+    entity = TRACKED_MODELS.get(sender)
+    if sender is Day:
+        record_change("days", [instance.day_index])
+    elif entity:
+        record_change(entity, [instance.pk], "deleted")
+    elif sender is MilestoneTodo:
+        record_change("milestones", [instance.milestone_id])
+    elif sender is TaskLegendAssignment:
+        record_change("tasks", [instance.task_id])
+    elif sender is AcceptanceCriterion:
+        record_task_done_change([instance.task_id])
+
+
+def _on_task_members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if reverse:
+        record_change("tasks", pk_set or [])
+    else:
+        record_change("tasks", [instance.pk])
+
+
+def _on_untracked_write(sender, **kwargs):
+    if kwargs.get("action", "post_").startswith("post_"):
+        record_untracked_write()
+
+
+def connect_signals():
+    """Called from ApiConfig.ready(). Receivers are bound per model so
+    untracked models keep Django's fast-delete path."""
+    for model in (*TRACKED_MODELS, MilestoneTodo, TaskLegendAssignment, AcceptanceCriterion):
+        post_save.connect(_on_save, sender=model, dispatch_uid=f"project_changes_save_{model.__name__}")
+        post_delete.connect(_on_delete, sender=model, dispatch_uid=f"project_changes_delete_{model.__name__}")
+    m2m_changed.connect(
+        _on_task_members_changed, sender=Task.assigned_members.through,
+        dispatch_uid="project_changes_task_members",
+    )
+    for model in UNTRACKED_MODELS:
+        post_save.connect(_on_untracked_write, sender=model, dispatch_uid=f"project_changes_untracked_save_{model.__name__}")
+        post_delete.connect(_on_untracked_write, sender=model, dispatch_uid=f"project_changes_untracked_delete_{model.__name__}")
+    for through in (Project.members.through, Team.members.through):
+        m2m_changed.connect(
+            _on_untracked_write, sender=through, dispatch_uid=f"project_changes_untracked_{through.__name__}",
+        )
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core import checks
+
+from .views.helpers import shared_cache
+
+
+@checks.register()
+def check_project_access_cache(app_configs, **kwargs):
+    """PROJECT_ACCESS_CACHE_TIMEOUT needs a cache every worker process sees."""
+    if getattr(settings, "PROJECT_ACCESS_CACHE_TIMEOUT", None) and not shared_cache():
+        return [checks.Warning(
+            "PROJECT_ACCESS_CACHE_TIMEOUT is ignored: the default cache is local to each process, "
+            "so membership changes would not reach the other workers.",
+            hint="Configure a shared cache, e.g. set CACHE_DIR.",
+            id="api.W001",
+        )]
+    return []
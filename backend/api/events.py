@@ -0,0 +1,269 @@
+"""
+Live project events for the server-sent-events stream.
+
+Every project write that changes rows is turned into one compact event per
+revision ("milestones 4 and 7 updated, task 2 deleted"). Events carry the
+revision as their id, so a reconnecting client sends it back as
+Last-Event-ID and is replayed everything after it from the change log.
+
+ProjectEventBroker fans events out to the streams open in this process; each
+stream has a bounded queue and is told to resync instead of buffering
+without limit when it falls behind. How events travel from the writing
+request to the broker is the job of a pluggable backend
+(PROJECT_EVENTS_BACKEND):
+
+    LocalBackend      delivers straight to the in-process broker. Enough for
+                      a single process (runserver, tests).
+    ChangeLogBackend  one poller thread per process reads the revisions of
+                      watched projects and turns new ProjectChange rows into
+                      events, so streams see writes made by other workers.
+
+A backend implements ``publish(project_id, event)`` (called after the write
+commits) and ``watch(project_id, revision)`` / ``unwatch(project_id)``.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import DatabaseError, close_old_connections
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .models import Project, ProjectChange
+
+logger = logging.getLogger(__name__)
+
+# Returned by Subscription.get() when the subscriber's queue overflowed.
+RESYNC = object()
+
+
+def change_event(revision, changes):
+    """Event for ``changes`` ({(entity, id): action}) committed as ``revision``."""
+    grouped = {}
+    for (entity, entity_id), action in changes.items():
+        grouped.setdefault(entity, {}).setdefault(action, []).append(entity_id)
+    for actions in grouped.values():
+        for ids in actions.values():
+            ids.sort()
+    return {"id": revision, "type": "change", "data": {"revision": revision, "changes": grouped}}
+
+
+def reset_event(revision):
+    """The project was replaced wholesale (or the log no longer reaches back): refetch everything."""
+    return {"id": revision, "type": "reset", "data": {"revision": revision}}
+
+
+def resync_event(since, revision=None):
+    """Too much to stream: fetch GET /changes/?since=<since> instead."""
+    return {"id": revision, "type": "resync", "data": {"since": since, "revision": revision}}
+
+
+def events_since(project_id, since, limit=None):
+    """
+    Rebuild the events after revision ``since`` from the change log.
+    Returns a single reset event when the log no longer reaches ``since``
+    and a single resync event when it holds more than ``limit`` entries.
+    """
+    if limit is None:
+        limit = settings.PROJECT_EVENTS_REPLAY_LIMIT
+    floor, revision = Project.objects.filter(pk=project_id).values_list("change_log_floor", "revision").first() or (0, 0)
+    if since < floor:
+        return [reset_event(revision)]
+
+    entries = list(
+        ProjectChange.objects
+        .filter(project_id=project_id, revision__gt=since)
+        .order_by("revision", "id")
+        .values_list("revision", "entity", "entity_id", "action")[:limit + 1]
+    )
+    if len(entries) > limit:
+        return [resync_event(since, revision)]
+
+    by_revision = {}
+    for entry_revision, entity, entity_id, action in entries:
+        by_revision.setdefault(entry_revision, {})[(entity, entity_id)] = action
+    return [change_event(rev, changes) for rev, changes in by_revision.items()]
+
+
+# ═══════════════════════════════════════════════════════
+#  BROKER
+# ═══════════════════════════════════════════════════════
+
+class Subscription:
+    """One open stream's queue of pending events."""
+
+    def __init__(self, project_id, max_pending):
+        self.project_id = project_id
+        self._max_pending = max_pending
+        self._events = deque()
+        self._overflowed = False
+        self._ready = threading.Condition()
+
+    def push(self, event):
+        with self._ready:
+            if len(self._events) >= self._max_pending:
+                # Slow consumer: drop the backlog rather than grow without bound.
+                self._events.clear()
+                self._overflowed = True
+            else:
+                self._events.append(event)
+            self._ready.notify()
+
+    def get(self, timeout):
+        """Next event, RESYNC after an overflow, or None when ``timeout`` passes."""
+        with self._ready:
+            if not self._events and not self._overflowed:
+                self._ready.wait(timeout)
+            if self._overflowed:
+                self._overflowed = False
+                return RESYNC
+            return self._events.popleft() if self._events else None
+
+
+class ProjectEventBroker:
+    def __init__(self, backend, max_pending):
+        self.backend = backend
+        self.max_pending = max_pending
+        self._subscriptions = {}  # project_id -> set of Subscription
+        self._lock = threading.Lock()
+        backend.attach(self)
+
+    def subscribe(self, project_id, revision):
+        """Open a subscription; ``revision`` is the project's revision the stream starts from."""
+        subscription = Subscription(project_id, self.max_pending)
+        with self._lock:
+            first = project_id not in self._subscriptions
+            self._subscriptions.setdefault(project_id, set()).add(subscription)
+        if first:
+            self.backend.watch(project_id, revision)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscriptions.get(subscription.project_id, set())
+            subscribers.discard(subscription)
+            last = not subscribers
+            if last:
+                self._subscriptions.pop(subscription.project_id, None)
+        if last:
+            self.backend.unwatch(subscription.project_id)
+
+    def publish(self, project_id, event):
+        self.backend.publish(project_id, event)
+
+    def deliver(self, project_id, event):
+        """Hand ``event`` to every stream of ``project_id`` open in this process."""
+        with self._lock:
+            subscribers = list(self._subscriptions.get(project_id, ()))
+        for subscription in subscribers:
+            subscription.push(event)
+
+
+# ═══════════════════════════════════════════════════════
+#  BACKENDS
+# ═══════════════════════════════════════════════════════
+
+class LocalBackend:
+    """Deliver events in-process, straight from the writing request."""
+
+    def attach(self, broker):
+        self.broker = broker
+
+    def publish(self, project_id, event):
+        self.broker.deliver(project_id, event)
+
+    def watch(self, project_id, revision):
+        pass
+
+    def unwatch(self, project_id):
+        pass
+
+
+class ChangeLogBackend:
+    """
+    Use the change log as the transport. The log is written in the same
+    transaction as the change, so ``publish`` has nothing to do; a poller
+    thread checks the watched projects' revisions with one query every
+    PROJECT_EVENTS_POLL_SECONDS and replays new revisions from the log.
+    """
+
+    def __init__(self):
+        self._seen = {}  # project_id -> last revision delivered
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def attach(self, broker):
+        self.broker = broker
+
+    def publish(self, project_id, event):
+        pass
+
+    def watch(self, project_id, revision):
+        with self._lock:
+            self._seen.setdefault(project_id, revision)
+            if self._thread is None:
+                self._start()
+
+    def unwatch(self, project_id):
+        with self._lock:
+            self._seen.pop(project_id, None)
+
+    def _start(self):
+        self._thread = threading.Thread(target=self._run, name="project-events-poller", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(settings.PROJECT_EVENTS_POLL_SECONDS)
+            try:
+                self.poll()
+            except DatabaseError:
+                logger.exception("Polling project revisions failed")
+            finally:
+                close_old_connections()
+
+    def poll(self):
+        """Deliver the events of every watched project whose revision moved."""
+        with self._lock:
+            seen = dict(self._seen)
+        if not seen:
+            return
+        for project_id, revision in Project.objects.filter(id__in=seen).values_list("id", "revision"):
+            since = seen[project_id]
+            if revision <= since:
+                continue
+            for event in events_since(project_id, since):
+                self.broker.deliver(project_id, event)
+            with self._lock:
+                if project_id in self._seen:
+                    self._seen[project_id] = revision
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            backend = import_string(settings.PROJECT_EVENTS_BACKEND)()
+            _broker = ProjectEventBroker(backend, settings.PROJECT_EVENTS_MAX_PENDING)
+        return _broker
+
+
+@receiver(setting_changed)
+def _reset_broker(setting, **kwargs):
+    global _broker
+    if setting in ("PROJECT_EVENTS_BACKEND", "PROJECT_EVENTS_MAX_PENDING"):
+        _broker = None
+
+
+def publish_changes(project_id, revision, changes, reset=False):
+    """Publish the event for a committed revision (see ProjectRevisionMiddleware)."""
+    event = reset_event(revision) if reset else change_event(revision, changes)
+    get_broker().publish(project_id, event)
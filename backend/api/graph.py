@@ -0,0 +1,248 @@
+"""
+Per-project milestone dependency graph.
+
+DependencyGraph loads a project's milestones and Dependency edges once
+(two queries) into compact CSR adjacency arrays over dense node indices and
+answers cycle checks, ancestor / descendant closures and topological order
+in O(nodes + edges).
+
+Graphs are cached per process by get_dependency_graph(), and only once the
+transaction that read them has committed. A cached graph is keyed on
+Project.revision, so a write made by another worker is picked up on the
+next request; writes in this process (Dependency saves/deletes, milestones
+created or deleted) drop the entry immediately through signals.
+Code that writes edges without signals (bulk_create, queryset.update) must
+call invalidate_dependency_graph().
+"""
+
+import threading
+from array import array
+from collections import OrderedDict, deque
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .models import Dependency, Milestone
+
+
+class DependencyCycleError(ValueError):
+    """The graph has a cycle, so there is no topological order."""
+
+    def __init__(self, milestone_ids):
+        self.milestone_ids = milestone_ids
+        super().__init__(f"Dependency cycle among milestones {milestone_ids}")
+
+
+class DependencyGraph:
+    def __init__(self, milestone_ids, edges):
+        """``milestone_ids``: every node; ``edges``: (source_id, target_id, weight) triples."""
+        self.ids = array("q", sorted(milestone_ids))
+        self.index = {milestone_id: i for i, milestone_id in enumerate(self.ids)}
+        n = len(self.ids)
+
+        # Edges sorted by source: edge k runs sources[k] -> targets[k].
+        pairs = sorted(
+            (self.index[source], self.index[target], weight)
+            for source, target, weight in edges
+            if source in self.index and target in self.index
+        )
+        self.sources = array("l", (s for s, _, _ in pairs))
+        self.targets = array("l", (t for _, t, _ in pairs))
+        self.weights = [w for _, _, w in pairs]
+
+        # CSR: out-neighbours of i are targets[out_offsets[i]:out_offsets[i + 1]].
+        self.out_offsets = self._offsets(self.sources, n)
+        # Reverse CSR: in_edges lists edge numbers grouped by target.
+        self.in_edges = array("l", sorted(range(len(pairs)), key=self.targets.__getitem__))
+        self.in_offsets = self._offsets(array("l", (self.targets[k] for k in self.in_edges)), n)
+
+    @staticmethod
+    def _offsets(grouped, n):
+        offsets = array("l", [0]) * (n + 1)
+        for node in grouped:
+            offsets[node + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+        return offsets
+
+    @classmethod
+    def load(cls, project_id):
+        milestone_ids = Milestone.objects.filter(project_id=project_id).values_list("id", flat=True)
+        edges = Dependency.objects.filter(source__project_id=project_id).values_list("source_id", "target_id", "weight")
+        return cls(list(milestone_ids), list(edges))
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def edge_count(self):
+        return len(self.targets)
+
+    # ── traversal ──
+
+    def _successors(self, i):
+        return self.targets[self.out_offsets[i]:self.out_offsets[i + 1]]
+
+    def _predecessors(self, i):
+        return [self.sources[k] for k in self.in_edges[self.in_offsets[i]:self.in_offsets[i + 1]]]
+
+    def _reach(self, start, neighbours):
+        """Indices reachable from ``start`` (excluding it unless on a cycle), BFS order."""
+        seen = bytearray(len(self.ids))
+        queue = deque(neighbours(start))
+        found = []
+        while queue:
+            node = queue.popleft()
+            if seen[node]:
+                continue
+            seen[node] = 1
+            found.append(node)
+            queue.extend(neighbours(node))
+        return found
+
+    def descendants(self, milestone_id):
+        """Ids of every milestone that (transitively) depends on ``milestone_id``."""
+        if milestone_id not in self.index:
+            return []
+        return sorted(self.ids[i] for i in self._reach(self.index[milestone_id], self._successors))
+
+    def ancestors(self, milestone_id):
+        """Ids of every milestone ``milestone_id`` (transitively) depends on."""
+        if milestone_id not in self.index:
+            return []
+        return sorted(self.ids[i] for i in self._reach(self.index[milestone_id], self._predecessors))
+
+    def cycle_path(self, source_id, target_id):
+        """
+        If adding source -> target would close a cycle, return it as a list of
+        milestone ids [source, target, ..., source]; otherwise None.
+        """
+        if source_id == target_id:
+            return [source_id, source_id]
+        if source_id not in self.index or target_id not in self.index:
+            return None
+        start, goal = self.index[target_id], self.index[source_id]
+        parent = {start: None}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            if node == goal:
+                path = []
+                while node is not None:
+                    path.append(self.ids[node])
+                    node = parent[node]
+                return [source_id, *reversed(path)]
+            for successor in self._successors(node):
+                if successor not in parent:
+                    parent[successor] = node
+                    queue.append(successor)
+        return None
+
+    def would_create_cycle(self, source_id, target_id):
+        return self.cycle_path(source_id, target_id) is not None
+
+    def topological_order(self, ignore=()):
+        """
+        Milestone ids with every edge's source before its target (Kahn's
+        algorithm), leaving out edges whose weight is in ``ignore``. Raises
+        DependencyCycleError naming the milestones that sit on or behind a
+        cycle.
+        """
+        return [self.ids[i] for i in self.topological_indices(ignore)]
+
+    def topological_indices(self, ignore=()):
+        """topological_order() as node indices (positions in ``ids``)."""
+        n = len(self.ids)
+        in_degree = array("l", [0]) * n
+        for k, target in enumerate(self.targets):
+            if self.weights[k] not in ignore:
+                in_degree[target] += 1
+        ready = deque(i for i in range(n) if in_degree[i] == 0)
+        order = array("l")
+        while ready:
+            node = ready.popleft()
+            order.append(node)
+            for k in range(self.out_offsets[node], self.out_offsets[node + 1]):
+                if self.weights[k] in ignore:
+                    continue
+                successor = self.targets[k]
+                in_degree[successor] -= 1
+                if in_degree[successor] == 0:
+                    ready.append(successor)
+        if len(order) < n:
+            raise DependencyCycleError(sorted(self.ids[i] for i in range(n) if in_degree[i] > 0))
+        return order
+
+    def layers(self, ignore=()):
+        """
+        Longest-path layer of every node, aligned with ``ids``: 0 for nodes
+        without predecessors, otherwise one more than the deepest
+        predecessor. Edges whose weight is in ``ignore`` are left out.
+        """
+        layer = array("l", [0]) * len(self.ids)
+        for node in self.topological_indices(ignore):
+            next_layer = layer[node] + 1
+            for k in range(self.out_offsets[node], self.out_offsets[node + 1]):
+                target = self.targets[k]
+                if next_layer > layer[target] and self.weights[k] not in ignore:
+                    layer[target] = next_layer
+        return layer
+
+
+# ═══════════════════════════════════════════════════════
+#  CACHE
+# ═══════════════════════════════════════════════════════
+
+_cache = OrderedDict()  # project_id -> (revision, DependencyGraph), least recently used first
+_cache_lock = threading.Lock()
+
+
+def get_dependency_graph(project):
+    """The (cached) dependency graph of ``project`` at its current revision."""
+    with _cache_lock:
+        entry = _cache.get(project.id)
+        if entry is not None and entry[0] == project.revision:
+            _cache.move_to_end(project.id)
+            return entry[1]
+
+    graph = DependencyGraph.load(project.id)
+    # never cache what a rolled-back transaction saw
+    transaction.on_commit(lambda: _store(project.id, project.revision, graph))
+    return graph
+
+
+def _store(project_id, revision, graph):
+    with _cache_lock:
+        _cache[project_id] = (revision, graph)
+        _cache.move_to_end(project_id)
+        while len(_cache) > settings.DEPENDENCY_GRAPH_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def invalidate_dependency_graph(project_id):
+    with _cache_lock:
+        _cache.pop(project_id, None)
+
+
+def _on_dependency_change(sender, instance, **kwargs):
+    # every node is in its project's graph, so the cached graphs tell us the project
+    with _cache_lock:
+        stale = [project_id for project_id, (_, graph) in _cache.items() if instance.source_id in graph.index]
+        for project_id in stale:
+            del _cache[project_id]
+
+
+def _on_milestone_change(sender, instance, created=True, **kwargs):
+    # moves don't change the graph; new or removed nodes do
+    if created:
+        invalidate_dependency_graph(instance.project_id)
+
+
+def connect_signals():
+    """Called from ApiConfig.ready()."""
+    post_save.connect(_on_dependency_change, sender=Dependency, dispatch_uid="dependency_graph_save")
+    post_delete.connect(_on_dependency_change, sender=Dependency, dispatch_uid="dependency_graph_delete")
+    post_save.connect(_on_milestone_change, sender=Milestone, dispatch_uid="dependency_graph_milestone_save")
+    post_delete.connect(_on_milestone_change, sender=Milestone, dispatch_uid="dependency_graph_milestone_delete")
+
@@ -0,0 +1,115 @@
+"""
+Resource leveling: delay milestones so no team has more milestones active on
+a day than its capacity.
+
+level_resources() is a serial list scheduler. Milestones become ready once
+every predecessor has been placed (suggestion edges don't count) and are
+taken from a priority queue by (earliest allowed start, latest start, id),
+so work that is ready early and has the least slack goes first. Each one is
+placed on the first day, no earlier than planned, where its team has room on
+every open day it spans. Milestones are only ever delayed, and never past
+their latest start: a backward pass bounds that by the task's hard deadline,
+the project's last day and the latest starts of everything downstream. If
+there is no room before that bound the milestone stays at its earliest
+allowed start and the overload is reported instead.
+
+Blocked days take no capacity, and a delayed milestone never starts on one.
+"""
+
+import heapq
+from array import array
+
+import numpy as np
+
+from .schedule import NO_DEADLINE, SOFT_WEIGHTS
+from .workload import load_matrix
+
+
+def _latest_starts(graph, order, durations, deadlines, last_day):
+    latest = array("l", [0]) * len(graph)
+    for node in reversed(order):
+        end = last_day
+        if NO_DEADLINE < deadlines[node] < end:
+            end = deadlines[node]
+        for k in range(graph.out_offsets[node], graph.out_offsets[node + 1]):
+            if graph.weights[k] not in SOFT_WEIGHTS:
+                end = min(end, latest[graph.targets[k]] - 1)
+        latest[node] = end - durations[node] + 1
+    return latest
+
+
+def _overloads(rows, starts, durations, capacities, width, blocked):
+    """(row, day, load) of every open day on which a capped team is over capacity."""
+    load = load_matrix(rows, starts, durations, len(capacities), width)
+    over = (load > capacities[:, None]) & ~blocked[None, :width]
+    return [(int(row), int(day), int(load[row, day])) for row, day in np.argwhere(over)]
+
+
+def level_resources(graph, starts, durations, deadlines, teams, capacity, days=0, blocked_days=()):
+    """
+    ``teams[i]`` is the team id of milestone graph.ids[i] (or None),
+    ``capacity`` maps team id -> milestones per day; other teams are
+    unconstrained. ``days`` is the project length (0 if it has no dates).
+
+    Returns (new starts aligned with graph.ids, remaining overloads as
+    (team_id, day, load) tuples, overloads before leveling as a count).
+    """
+    n = len(graph)
+    order = graph.topological_indices(SOFT_WEIGHTS)
+    capped_teams = [team_id for team_id in capacity if team_id is not None]
+    row_of = {team_id: row for row, team_id in enumerate(capped_teams)}
+    capacities = np.array([capacity[team_id] for team_id in capped_teams], dtype=np.int64)
+    rows = array("l", (row_of.get(team_id, -1) for team_id in teams))
+
+    # Enough room to queue every capped milestone after the last planned end.
+    planned_end = max((starts[i] + durations[i] for i in range(n)), default=0)
+    width = max(days, planned_end) + sum(durations[i] for i in range(n) if rows[i] >= 0) + 1
+    blocked = np.zeros(width + max(durations, default=1), dtype=bool)
+    blocked[[d for d in blocked_days if 0 <= d < width]] = True
+    load = np.zeros((len(capped_teams), len(blocked)), dtype=np.int64)
+
+    capped = [i for i in range(n) if rows[i] >= 0]
+    overloads_before = len(_overloads(
+        [rows[i] for i in capped], [starts[i] for i in capped], [durations[i] for i in capped],
+        capacities, width, blocked,
+    ))
+
+    latest = _latest_starts(graph, order, durations, deadlines, (days or width) - 1)
+    pending = array("l", [0]) * n
+    for k, target in enumerate(graph.targets):
+        if graph.weights[k] not in SOFT_WEIGHTS:
+            pending[target] += 1
+    ready_at = array("l", starts)
+    queue = [(ready_at[i], latest[i], graph.ids[i], i) for i in range(n) if not pending[i]]
+    heapq.heapify(queue)
+
+    placed = array("l", starts)
+    while queue:
+        earliest, _, _, node = heapq.heappop(queue)
+        duration, row = durations[node], rows[node]
+        start = earliest
+        for day in range(earliest, min(max(earliest, latest[node]), width - 1) + 1):
+            if day != starts[node] and blocked[day]:
+                continue
+            span = slice(day, day + duration)
+            if row < 0 or not (load[row, span][~blocked[span]] >= capacities[row]).any():
+                start = day
+                break
+        if row >= 0:
+            load[row, start:start + duration] += 1
+        placed[node] = start
+
+        for k in range(graph.out_offsets[node], graph.out_offsets[node + 1]):
+            if graph.weights[k] in SOFT_WEIGHTS:
+                continue
+            target = graph.targets[k]
+            ready_at[target] = max(ready_at[target], start + duration)
+            pending[target] -= 1
+            if not pending[target]:
+                heapq.heappush(queue, (ready_at[target], latest[target], graph.ids[target], target))
+
+    remaining = _overloads(
+        [rows[i] for i in capped], [placed[i] for i in capped], [durations[i] for i in capped],
+        capacities, width, blocked,
+    )
+    return placed, [(capped_teams[row], day, count) for row, day, count in remaining], overloads_before
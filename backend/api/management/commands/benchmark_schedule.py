@@ -0,0 +1,81 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+import numpy as np
+
+from api.graph import DependencyGraph
+from api.risk import duration_ranges, simulate
+from api.schedule import CriticalPath, NO_DEADLINE
+from api.workload import load_matrix
+
+
+def synthetic_graph(milestones, fan_in, seed):
+    """A random DAG: each milestone depends on up to ``fan_in`` earlier ones."""
+    rng = random.Random(seed)
+    edges = []
+    for target in range(1, milestones):
+        for source in rng.sample(range(max(0, target - 200), target), min(fan_in, target)):
+            edges.append((source, target, rng.choice(("strong", "strong", "weak", "suggestion"))))
+    durations = [rng.randint(1, 10) for _ in range(milestones)]
+    deadlines = [rng.randint(milestones, 5 * milestones) if rng.random() < 0.01 else NO_DEADLINE for _ in range(milestones)]
+    return range(milestones), edges, durations, deadlines
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the dependency graph build, critical path pass, team workload matrix "
+        "and Monte Carlo schedule risk run on a synthetic project."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--milestones", type=int, default=10000)
+        parser.add_argument("--fan-in", type=int, default=3, help="Dependencies per milestone (default 3).")
+        parser.add_argument("--teams", type=int, default=20)
+        parser.add_argument("--days", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--risk-samples", type=int, default=10000, help="Monte Carlo scenarios, run once (0 to skip).")
+        parser.add_argument("--workers", type=int, default=1, help="Processes to shard the scenarios over.")
+
+    def handle(self, *args, **options):
+        ids, edges, durations, deadlines = synthetic_graph(options["milestones"], options["fan_in"], options["seed"])
+        rng = random.Random(options["seed"])
+        days, teams = options["days"], options["teams"]
+        rows = [rng.randrange(teams) for _ in ids]
+        starts = [rng.randrange(days) for _ in ids]
+        blocked = rng.sample(range(days), days // 10)
+
+        build, passes, workload = [], [], []
+        for _ in range(options["repeat"]):
+            started = time.perf_counter()
+            graph = DependencyGraph(ids, edges)
+            built = time.perf_counter()
+            result = CriticalPath(graph, [0] * len(graph), durations, deadlines)
+            result.critical_chain()
+            passed = time.perf_counter()
+            load_matrix(rows, starts, durations, teams, days, blocked)
+            workload.append(time.perf_counter() - passed)
+            passes.append(passed - built)
+            build.append(built - started)
+
+        self.stdout.write(
+            f"{len(graph)} milestones, {graph.edge_count} dependencies, finish day {result.finish}, "
+            f"{int((result.slack <= 0).sum())} critical"
+        )
+        self.stdout.write(f"graph build:   best {min(build) * 1000:.1f} ms")
+        self.stdout.write(self.style.SUCCESS(f"critical path: best {min(passes) * 1000:.1f} ms"))
+        self.stdout.write(self.style.SUCCESS(f"workload ({teams} teams x {days} days): best {min(workload) * 1000:.1f} ms"))
+
+        samples = options["risk_samples"]
+        if samples:
+            low, mode, high = duration_ranges(durations, [rng.choice(("easy", "medium", "hard")) for _ in ids])
+            started = time.perf_counter()
+            finish, _ = simulate(graph, result.earliest_start, low, mode, high, samples, seed=options["seed"], workers=options["workers"])
+            elapsed = time.perf_counter() - started
+            p50, p90 = np.percentile(finish, (50, 90), method="inverted_cdf")
+            self.stdout.write(self.style.SUCCESS(
+                f"schedule risk ({samples} samples, {options['workers']} worker(s)): {elapsed * 1000:.1f} ms, "
+                f"P50 day {int(p50)}, P90 day {int(p90)}"
+            ))
@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.models import Project, ProjectChange
+
+
+class Command(BaseCommand):
+    help = "Compact project change logs: keep the newest entry per row and drop revisions outside the retention window."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--project", type=int, help="Only compact this project id.")
+        parser.add_argument(
+            "--keep",
+            type=int,
+            default=None,
+            help=f"Revisions of history to keep (default: PROJECT_CHANGE_LOG_RETENTION={settings.PROJECT_CHANGE_LOG_RETENTION}).",
+        )
+
+    def handle(self, *args, **options):
+        projects = Project.objects.filter(changes__isnull=False).distinct().order_by("id")
+        if options["project"]:
+            projects = projects.filter(id=options["project"])
+
+        total = 0
+        for project in projects:
+            removed = ProjectChange.compact(project.id, options["keep"])
+            project.refresh_from_db(fields=["revision", "change_log_floor"])
+            total += removed
+            self.stdout.write(
+                f"#{project.id} {project.name}: removed {removed} entries, "
+                f"serving changes since revision {project.change_log_floor} (current {project.revision})"
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"Total: removed {total} change log entries"))
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+
+from api.models import Project, ProjectSnapshot
+
+
+def _fmt(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+class Command(BaseCommand):
+    help = "Report project snapshot storage (raw vs. stored bytes) and optionally repack legacy snapshots."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--project", type=int, help="Only report on this project id.")
+        parser.add_argument(
+            "--repack",
+            action="store_true",
+            help="Re-encode all snapshots (including uncompressed legacy rows) into compressed keyframe/delta chains first.",
+        )
+
+    def handle(self, *args, **options):
+        projects = Project.objects.filter(snapshots__isnull=False).distinct().order_by("id")
+        if options["project"]:
+            projects = projects.filter(id=options["project"])
+
+        total_raw = total_stored = 0
+        for project in projects:
+            if options["repack"]:
+                ProjectSnapshot.repack(project)
+
+            raw = stored = keyframes = deltas = legacy = 0
+            for snapshot in ProjectSnapshot.objects.filter(project=project):
+                size = snapshot.stored_size
+                stored += size
+                if snapshot.is_legacy:
+                    legacy += 1
+                    raw += size
+                    continue
+                raw += snapshot.raw_size
+                if snapshot.base_id is None:
+                    keyframes += 1
+                else:
+                    deltas += 1
+
+            total_raw += raw
+            total_stored += stored
+            self.stdout.write(
+                f"#{project.id} {project.name}: {keyframes} keyframes, {deltas} deltas, {legacy} legacy — "
+                f"{_fmt(raw)} raw, {_fmt(stored)} stored, {_fmt(raw - stored)} saved"
+            )
+
+        ratio = (1 - total_stored / total_raw) * 100 if total_raw else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Total: {_fmt(total_raw)} raw, {_fmt(total_stored)} stored, "
+            f"{_fmt(total_raw - total_stored)} saved ({ratio:.1f}%)"
+        ))
@@ -0,0 +1,54 @@
+from functools import partial
+
+from django.db import transaction
+from django.urls import Resolver404, resolve
+
+from .changes import RESET, UNTRACKED, collecting_changes
+from .events import publish_changes
+from .models import Project, ProjectChange
+
+def _project_id(path):
+    """The project a /api/projects/<id>/... URL is scoped to, or None."""
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return None
+    if not match.route.startswith("api/projects/<int:"):
+        return None
+    return match.kwargs.get("project_id", match.kwargs.get("pk"))
+
+
+class ProjectRevisionMiddleware:
+    """
+    Run every write to a project-scoped endpoint in a transaction and, if it
+    succeeded and actually changed rows (as collected by api.changes), bump
+    Project.revision inside it. Read-only POSTs (dry runs, validations,
+    simulations) and rejected requests leave the revision, and so the ETags
+    and revision-keyed caches derived from it, alone. The rows the request
+    changed are appended to the project's change log under the new revision
+    and, once the transaction commits, published to the project's live event
+    stream.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method in ("GET", "HEAD", "OPTIONS"):
+            return self.get_response(request)
+        project_id = _project_id(request.path_info)
+        if project_id is None:
+            return self.get_response(request)
+
+        with transaction.atomic(), collecting_changes() as changes:
+            response = self.get_response(request)
+            if 200 <= response.status_code < 300 and changes:
+                revision = Project.bump_revision(project_id)
+                changes.pop(UNTRACKED, None)
+                if changes.pop(RESET, None):
+                    ProjectChange.reset(project_id, revision)
+                    transaction.on_commit(partial(publish_changes, project_id, revision, {}, reset=True))
+                elif changes and revision is not None:
+                    ProjectChange.log(project_id, revision, changes)
+                    transaction.on_commit(partial(publish_changes, project_id, revision, changes))
+        return response
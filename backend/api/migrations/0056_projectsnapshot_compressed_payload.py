@@ -0,0 +1,29 @@
+# Generated by Django 5.0.7 on 2026-10-18 14:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0055_merge_20260320_1315'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectsnapshot',
+            name='base',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='deltas', to='api.projectsnapshot'),
+        ),
+        migrations.AddField(
+            model_name='projectsnapshot',
+            name='payload',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='projectsnapshot',
+            name='raw_size',
+            field=models.IntegerField(default=0),
+        ),
+    ]
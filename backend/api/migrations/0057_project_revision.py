@@ -0,0 +1,18 @@
+# Generated by Django 5.0.7 on 2026-10-18 14:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0056_projectsnapshot_compressed_payload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='revision',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.0.7 on 2026-10-18 14:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def start_log_at_current_revision(apps, schema_editor):
+    # Nothing was logged before this migration: clients at older revisions must refetch.
+    Project = apps.get_model('api', 'Project')
+    Project.objects.update(change_log_floor=models.F('revision'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0057_project_revision'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='change_log_floor',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.RunPython(start_log_at_current_revision, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='ProjectChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('revision', models.PositiveBigIntegerField()),
+                ('entity', models.CharField(max_length=20)),
+                ('entity_id', models.BigIntegerField()),
+                ('action', models.CharField(choices=[('created', 'Created'), ('updated', 'Updated'), ('deleted', 'Deleted')], max_length=10)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='changes', to='api.project')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['project', 'revision'], name='api_project_project_654983_idx')],
+            },
+        ),
+    ]
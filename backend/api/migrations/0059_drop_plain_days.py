@@ -0,0 +1,25 @@
+from django.db import migrations
+from django.db.models import Q
+
+
+def drop_plain_days(apps, schema_editor):
+    # Days are computed from the project dates now; keep only rows that override something.
+    Day = apps.get_model('api', 'Day')
+    Day.objects.filter(
+        Q(purpose__isnull=True) | Q(purpose=''),
+        Q(description__isnull=True) | Q(description=''),
+        Q(color__isnull=True) | Q(color=''),
+        purpose_teams__isnull=True,
+        is_blocked=False,
+    ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0058_project_change_log'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_plain_days, migrations.RunPython.noop),
+    ]
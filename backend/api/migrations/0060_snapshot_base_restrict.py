@@ -0,0 +1,19 @@
+# Generated by Django 5.0.7 on 2026-10-18 15:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0059_drop_plain_days'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='projectsnapshot',
+            name='base',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.RESTRICT, related_name='deltas', to='api.projectsnapshot'),
+        ),
+    ]
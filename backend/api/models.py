@@ -1,7 +1,10 @@
 from gc import set_debug
 
-from django.db import models
-from django.db.models import SET_NULL
+import json
+import zlib
+
+from django.db import models, transaction
+from django.db.models import SET_NULL, Case, Exists, F, OuterRef, Value, When
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from datetime import date as date_class, timedelta
@@ -20,47 +23,110 @@ class Project(models.Model):
     start_date = models.DateField(blank=True, null=True)
     end_date = models.DateField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Bumped by every write to the project's planning data (see ProjectRevisionMiddleware).
+    revision = models.PositiveBigIntegerField(default=0)
+    # Oldest revision the change log can still answer "changes since" for.
+    change_log_floor = models.PositiveBigIntegerField(default=0)
 
     def __str__(self):
         return self.name
 
+    @staticmethod
+    def bump_revision(project_id):
+        """Increment the project's revision and return the new value."""
+        Project.objects.filter(pk=project_id).update(revision=F("revision") + 1)
+        return Project.objects.filter(pk=project_id).values_list("revision", flat=True).first()
+
     def get_days_count(self):
         """Return number of days in project timespan"""
         if self.start_date and self.end_date:
             return (self.end_date - self.start_date).days + 1
         return 0
 
-    def create_days(self):
-        """Create Day objects for this project based on start and end dates"""
-        if not self.start_date or not self.end_date:
+    def get_days(self):
+        """
+        Every day of the project timespan, in order. Days are computed from
+        start_date/end_date; only days with overrides (purpose, blocked, ...)
+        are stored, and those rows are returned in place of the computed ones.
+        """
+        count = self.get_days_count()
+        if count <= 0:
             return []
-        
-        created_days = []
-        current_date = self.start_date
-        index = 0
-        
-        while current_date <= self.end_date:
-            day, created = Day.objects.get_or_create(
-                project=self,
-                date=current_date,
-                defaults={'day_index': index}
-            )
-            if not created:
+        overrides = {
+            day.date: day
+            for day in Day.objects.filter(project=self, date__range=(self.start_date, self.end_date))
+        }
+        days = []
+        for index in range(count):
+            current = self.start_date + timedelta(days=index)
+            day = overrides.get(current) or Day(project=self, date=current)
+            day.day_index = index
+            days.append(day)
+        return days
+
+    def get_day(self, day_index):
+        """The day at ``day_index`` (stored or computed), or None outside the timespan."""
+        if day_index < 0 or day_index >= self.get_days_count():
+            return None
+        current = self.start_date + timedelta(days=day_index)
+        day = Day.objects.filter(project=self, date=current).first() or Day(project=self, date=current)
+        day.day_index = day_index
+        return day
+
+    def blocked_day_indices(self):
+        """
+        Indices of the blocked days in the timespan, derived from their dates:
+        a stored Day.day_index lags a date change until sync_day_overrides().
+        """
+        if not (self.start_date and self.end_date):
+            return []
+        dates = Day.objects.filter(
+            project=self, is_blocked=True, date__range=(self.start_date, self.end_date),
+        ).values_list("date", flat=True)
+        return sorted((day - self.start_date).days for day in dates)
+
+    def sync_day_overrides(self, start_date=None, end_date=None):
+        """
+        Fit the stored day overrides to the timespan (the project's own dates
+        unless given): drop the ones outside it and re-index the rest. Costs
+        O(overrides), not O(days). Returns the number of overrides deleted.
+        """
+        start_date = start_date or self.start_date
+        end_date = end_date or self.end_date
+        overrides = Day.objects.filter(project=self)
+        if not (start_date and end_date):
+            return overrides.delete()[0]
+        deleted, _ = overrides.exclude(date__range=(start_date, end_date)).delete()
+        moved = []
+        for day in overrides.only("id", "date", "day_index"):
+            index = (day.date - start_date).days
+            if day.day_index != index:
                 day.day_index = index
-                day.save(update_fields=['day_index'])
-            created_days.append(day)
-            current_date += timedelta(days=1)
-            index += 1
-        
-        return created_days
+                moved.append(day)
+        Day.objects.bulk_update(moved, ["day_index"])
+        return deleted
+
+    def milestones_out_of_range(self, days_count):
+        """
+        Milestones that would not fit a timespan of ``days_count`` days (start
+        before day 0, or ending on/after day ``days_count``), found with one
+        annotated query. Shared by validate_project_dates and
+        update_days_on_date_change.
+        """
+        return list(
+            Milestone.objects
+            .filter(project=self)
+            .outside_range(days_count)
+            .order_by("id")
+            .values("id", "name", "start_index", "duration", "end_index", task_name=F("task__name"))
+            .annotate(required_days=F("end_index") + 1)
+        )
 
     def update_days_on_date_change(self, old_start, old_end, new_start, new_end):
         """
         Update days when project dates change.
         Returns dict with 'success', 'error', 'created', 'deleted' info.
         """
-        from django.db.models import Max
-        
         result = {
             'success': True,
             'error': None,
@@ -68,57 +134,19 @@ class Project(models.Model):
             'deleted': 0,
             'milestones_out_of_range': []
         }
-        
+
         # Check if any milestones would be out of range
         if new_end and new_start:
-            new_days_count = (new_end - new_start).days + 1
-            
-            # Find milestones that would exceed the new range
-            out_of_range_milestones = Milestone.objects.filter(
-                project=self
-            ).filter(
-                models.Q(start_index__gte=new_days_count) |
-                models.Q(start_index__lt=0)
-            )
-            
-            # Also check milestones where start_index + duration exceeds range
-            all_milestones = Milestone.objects.filter(project=self)
-            for ms in all_milestones:
-                if ms.start_index + ms.duration > new_days_count:
-                    result['milestones_out_of_range'].append({
-                        'id': ms.id,
-                        'name': ms.name,
-                        'start_index': ms.start_index,
-                        'duration': ms.duration,
-                        'end_index': ms.start_index + ms.duration - 1
-                    })
-            
-            for ms in out_of_range_milestones:
-                if ms.id not in [m['id'] for m in result['milestones_out_of_range']]:
-                    result['milestones_out_of_range'].append({
-                        'id': ms.id,
-                        'name': ms.name,
-                        'start_index': ms.start_index,
-                        'duration': ms.duration,
-                        'end_index': ms.start_index + ms.duration - 1
-                    })
-        
+            result['milestones_out_of_range'] = self.milestones_out_of_range((new_end - new_start).days + 1)
+
         if result['milestones_out_of_range']:
             result['success'] = False
             result['error'] = 'Some milestones would be outside the new date range'
             return result
         
-        # Delete days outside new range
+        # Drop / re-index day overrides for the new range (days themselves are computed)
         if new_start and new_end:
-            deleted_count, _ = Day.objects.filter(project=self).exclude(
-                date__gte=new_start,
-                date__lte=new_end
-            ).delete()
-            result['deleted'] = deleted_count
-            
-            # Create/update days for new range
-            created_days = self.create_days()
-            result['created'] = len([d for d in created_days if d])
+            result['deleted'] = self.sync_day_overrides(new_start, new_end)
         
         return result
 
@@ -146,6 +174,24 @@ class Team(models.Model):
 #  TASK
 # ═══════════════════════════════════════════════
 
+def _all_done(items):
+    """Expression: ``items`` (a queryset filtered on OuterRef) is non-empty and
+    none of its rows are still open."""
+    return Case(
+        When(Exists(items) & ~Exists(items.filter(done=False)), then=Value(True)),
+        default=Value(False),
+        output_field=models.BooleanField(),
+    )
+
+
+class TaskQuerySet(models.QuerySet):
+    def with_done_state(self):
+        """Annotate ``is_done`` (all acceptance criteria done) in the database."""
+        return self.annotate(
+            is_done=_all_done(AcceptanceCriterion.objects.filter(task=OuterRef("pk"))),
+        )
+
+
 class Task(models.Model):
     name = models.CharField(max_length=200, blank=True, null=True)
     description = models.TextField(blank=True, null=True)
@@ -164,6 +210,8 @@ class Task(models.Model):
     team_index = models.IntegerField(default=0)
     order_index = models.IntegerField(default=0)
 
+    objects = TaskQuerySet.as_manager()
+
     def __str__(self):
         return self.name or "Untitled"
     
@@ -191,6 +239,12 @@ class AcceptanceCriterion(models.Model):
 # ═══════════════════════════════════════════════
 
 class Day(models.Model):
+    """
+    A day of a project's calendar. Only days that override something are
+    stored; the rest are computed by Project.get_days().
+    """
+    OVERRIDE_FIELDS = ("purpose", "purpose_teams", "description", "is_blocked", "color")
+
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="days")
     date = models.DateField()
     day_index = models.IntegerField(default=0)  # 0-based index from project start
@@ -207,6 +261,18 @@ class Day(models.Model):
     def __str__(self):
         return f"{self.project.name} - Day {self.day_index} ({self.date})"
 
+    @property
+    def has_overrides(self):
+        return bool(self.purpose or self.purpose_teams is not None or self.description or self.is_blocked or self.color)
+
+    def save_override(self):
+        """Store this day if it overrides anything, otherwise drop its stored row."""
+        if self.has_overrides:
+            self.save()
+        elif self.pk is not None:
+            self.delete()
+            self.pk = None
+
     @property
     def is_weekend(self):
         """Check if this day is a weekend (Saturday=5, Sunday=6)"""
@@ -234,6 +300,29 @@ class Day(models.Model):
 #  MILESTONE
 # ═══════════════════════════════════════════════
 
+class MilestoneQuerySet(models.QuerySet):
+    def outside_range(self, days_count):
+        """Milestones that don't fit days 0..days_count-1; annotates ``end_index``."""
+        return self.annotate(end_index=F("start_index") + F("duration") - 1).filter(
+            models.Q(start_index__lt=0) | models.Q(start_index__gte=days_count) | models.Q(end_index__gte=days_count)
+        )
+
+    def with_done_state(self):
+        """
+        Annotate ``is_done`` (all own TODOs done) and ``is_done_effective``
+        (own TODOs done, or every acceptance criterion of the parent task done).
+        """
+        task_done = _all_done(AcceptanceCriterion.objects.filter(task=OuterRef("task_id")))
+        own_done = _all_done(MilestoneTodo.objects.filter(milestone=OuterRef("pk")))
+        return self.annotate(is_done=own_done).annotate(
+            is_done_effective=Case(
+                When(is_done=True, then=Value(True)),
+                default=task_done,
+                output_field=models.BooleanField(),
+            ),
+        )
+
+
 class Milestone(models.Model):
     name = models.CharField(max_length=200)
     description = models.TextField(blank=True, null=True)
@@ -242,6 +331,8 @@ class Milestone(models.Model):
     start_index = models.IntegerField(default=0)
     duration = models.IntegerField(default=1)
 
+    objects = MilestoneQuerySet.as_manager()
+
 
 class MilestoneTodo(models.Model):
     """Individual TODO item belonging to a Milestone (mirrors AcceptanceCriterion)."""
@@ -573,25 +664,275 @@ class DependencyView(models.Model):
 #  PROJECT SNAPSHOT (full project state backup)
 # ═══════════════════════════════════════════════
 
+def _pack_json(obj):
+    return zlib.compress(json.dumps(obj, separators=(",", ":")).encode(), 6)
+
+
+def _unpack_json(blob):
+    return json.loads(zlib.decompress(bytes(blob)))
+
+
+def _snapshot_delta(base, data):
+    """
+    Encode ``data`` against ``base`` (both snapshot dicts).
+
+    Unchanged sections are omitted. A changed list section is stored as a
+    sequence of either literal rows or ``[start, stop]`` runs of rows copied
+    from the base section, so reordered, added and removed rows all round-trip
+    exactly.
+    """
+    delta = {}
+    for key, rows in data.items():
+        base_rows = base.get(key)
+        if rows == base_rows:
+            continue
+        if not isinstance(rows, list) or not isinstance(base_rows, list):
+            delta[key] = {"value": rows}
+            continue
+        positions = {}
+        for index, row in enumerate(base_rows):
+            positions.setdefault(json.dumps(row, sort_keys=True), index)
+        ops = []
+        for row in rows:
+            index = positions.get(json.dumps(row, sort_keys=True))
+            if index is None:
+                ops.append(row)
+            elif ops and isinstance(ops[-1], list) and ops[-1][1] == index:
+                ops[-1][1] = index + 1
+            else:
+                ops.append([index, index + 1])
+        delta[key] = {"rows": ops}
+    removed = [key for key in base if key not in data]
+    if removed:
+        delta["__removed__"] = removed
+    return delta
+
+
+def _apply_snapshot_delta(base, delta):
+    """Inverse of _snapshot_delta."""
+    data = {key: value for key, value in base.items() if key not in delta.get("__removed__", ())}
+    for key, change in delta.items():
+        if key == "__removed__":
+            continue
+        if "value" in change:
+            data[key] = change["value"]
+            continue
+        base_rows = base[key]
+        rows = []
+        for op in change["rows"]:
+            if isinstance(op, list):
+                rows.extend(base_rows[op[0]:op[1]])
+            else:
+                rows.append(op)
+        data[key] = rows
+    return data
+
+
+class ProjectSnapshotQuerySet(models.QuerySet):
+    def delete(self):
+        """Promote deltas that outlive their keyframe, then delete (see ProjectSnapshot.delete)."""
+        with transaction.atomic():
+            doomed = set(self.values_list("id", flat=True))
+            keyframes = ProjectSnapshot.objects.filter(id__in=doomed, deltas__isnull=False).distinct()
+            for keyframe in keyframes:
+                keyframe._promote_deltas(exclude=doomed)
+            return super().delete()
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+
 class ProjectSnapshot(models.Model):
     """
     A complete snapshot of all project data at a point in time.
     Stores teams, tasks, milestones, dependencies, days, phases, and views
-    as a single JSON blob so the entire state can be restored.
+    so the entire state can be restored.
+
+    The state lives zlib-compressed in ``payload``. A keyframe (``base`` is
+    null) holds the full state; a delta holds only the changes against its
+    keyframe, so reading any snapshot costs at most two decompressions.
+    A new keyframe is written every SNAPSHOT_KEYFRAME_INTERVAL snapshots.
+    Deleting a keyframe, one at a time or through a queryset, first promotes
+    its surviving deltas; ``base`` is RESTRICT so no other path can drop them.
+    Rows written before compression keep their state in ``data``.
     """
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="snapshots")
     name = models.CharField(max_length=200)
     description = models.TextField(blank=True, default="")
-    data = models.JSONField(default=dict)
+    data = models.JSONField(default=dict)  # legacy, uncompressed rows only
+    payload = models.BinaryField(blank=True, null=True, editable=False)
+    base = models.ForeignKey("self", on_delete=models.RESTRICT, null=True, blank=True, related_name="deltas")
+    raw_size = models.IntegerField(default=0)  # bytes of the uncompressed JSON state
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="created_snapshots")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = ProjectSnapshotQuerySet.as_manager()
+
     class Meta:
         ordering = ["-created_at"]
 
     def __str__(self):
         return f"Snapshot: {self.name} ({self.project.name})"
 
+    @property
+    def is_legacy(self):
+        return self.payload is None
+
+    @property
+    def stored_size(self):
+        if self.is_legacy:
+            return len(json.dumps(self.data, separators=(",", ":")))
+        return len(self.payload)
+
+    def load_data(self):
+        """Return the full snapshot state, rebuilding deltas from their keyframe."""
+        if self.is_legacy:
+            return self.data
+        state = _unpack_json(self.payload)
+        if self.base_id is None:
+            return state
+        return _apply_snapshot_delta(self.base.load_data(), state)
+
+    def _pack(self, data, keyframe=None, keyframe_data=None):
+        """Encode ``data`` as a keyframe, or as a delta against ``keyframe`` when that is smaller."""
+        self.raw_size = len(json.dumps(data, separators=(",", ":")))
+        self.data = {}
+        self.payload = _pack_json(data)
+        self.base = None
+        if keyframe is not None:
+            delta = _pack_json(_snapshot_delta(keyframe_data, data))
+            if len(delta) < len(self.payload):
+                self.payload = delta
+                self.base = keyframe
+
+    @classmethod
+    def _current_keyframe(cls, project):
+        """The keyframe the next snapshot of ``project`` may be encoded against, if any."""
+        latest = cls.objects.filter(project=project).order_by("-created_at", "-id").first()
+        if latest is None or latest.is_legacy:
+            return None
+        keyframe = latest.base or latest
+        interval = getattr(settings, "SNAPSHOT_KEYFRAME_INTERVAL", 10)
+        if keyframe.deltas.count() + 1 >= interval:
+            return None
+        return keyframe
+
+    @classmethod
+    def store(cls, project, data, **fields):
+        """Create a compressed snapshot of ``data`` for ``project``."""
+        snapshot = cls(project=project, **fields)
+        keyframe = cls._current_keyframe(project)
+        snapshot._pack(data, keyframe, keyframe.load_data() if keyframe else None)
+        snapshot.save()
+        return snapshot
+
+    @classmethod
+    def repack(cls, project):
+        """Re-encode every snapshot of ``project`` (legacy rows included) into keyframe/delta chains."""
+        interval = getattr(settings, "SNAPSHOT_KEYFRAME_INTERVAL", 10)
+        snapshots = list(cls.objects.filter(project=project).select_related("base").order_by("created_at", "id"))
+        states = [snapshot.load_data() for snapshot in snapshots]
+        keyframe = keyframe_data = None
+        since_keyframe = 0
+        with transaction.atomic():
+            for snapshot, data in zip(snapshots, states):
+                if keyframe is not None and since_keyframe + 1 >= interval:
+                    keyframe = None
+                snapshot._pack(data, keyframe, keyframe_data)
+                snapshot.save(update_fields=["data", "payload", "base", "raw_size"])
+                if snapshot.base_id is None:
+                    keyframe, keyframe_data, since_keyframe = snapshot, data, 0
+                else:
+                    since_keyframe += 1
+        return snapshots
+
+    def _promote_deltas(self, exclude=()):
+        """Make the oldest delta of this keyframe (not in ``exclude``) a keyframe and re-encode the rest against it."""
+        dependents = list(self.deltas.exclude(id__in=exclude).order_by("created_at", "id"))
+        if not dependents:
+            return
+        base_data = self.load_data()
+        states = [_apply_snapshot_delta(base_data, _unpack_json(d.payload)) for d in dependents]
+        new_keyframe = dependents[0]
+        new_keyframe._pack(states[0])
+        new_keyframe.save(update_fields=["data", "payload", "base", "raw_size"])
+        for dependent, data in zip(dependents[1:], states[1:]):
+            dependent._pack(data, new_keyframe, states[0])
+            dependent.save(update_fields=["data", "payload", "base", "raw_size"])
+
+    def delete(self, *args, **kwargs):
+        """Promote the oldest dependent delta to keyframe before removing a keyframe."""
+        with transaction.atomic():
+            self._promote_deltas()
+            return super().delete(*args, **kwargs)
+
+
+class ProjectChange(models.Model):
+    """
+    Append-only log of planning rows created, updated or deleted by each
+    project revision. Powers GET /projects/<id>/changes/?since=<revision>.
+    """
+    ACTION_CHOICES = [
+        ("created", "Created"),
+        ("updated", "Updated"),
+        ("deleted", "Deleted"),
+    ]
+
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="changes")
+    revision = models.PositiveBigIntegerField()
+    entity = models.CharField(max_length=20)  # "tasks", "milestones", ...
+    entity_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+
+    class Meta:
+        indexes = [models.Index(fields=["project", "revision"])]
+
+    def __str__(self):
+        return f"{self.project_id}@{self.revision}: {self.action} {self.entity} {self.entity_id}"
+
+    @classmethod
+    def log(cls, project_id, revision, changes):
+        """Write one entry per changed row for ``revision``; ``changes`` is {(entity, id): action}."""
+        cls.objects.bulk_create([
+            cls(project_id=project_id, revision=revision, entity=entity, entity_id=entity_id, action=action)
+            for (entity, entity_id), action in changes.items()
+        ], batch_size=1000)
+        interval = getattr(settings, "PROJECT_CHANGE_LOG_COMPACT_EVERY", 0)
+        if interval and revision % interval == 0:
+            cls.compact(project_id)
+
+    @classmethod
+    def reset(cls, project_id, revision):
+        """Drop the log: clients holding an older revision must refetch everything."""
+        cls.objects.filter(project_id=project_id).delete()
+        Project.objects.filter(pk=project_id).update(change_log_floor=revision)
+
+    @classmethod
+    def compact(cls, project_id, keep_revisions=None):
+        """
+        Keep only the newest entry per row (and its "created" entry), then
+        drop entries older than the last ``keep_revisions`` revisions and raise
+        the project's floor to match. Returns the number of entries removed.
+
+        The net action /changes reports for a row depends only on its first
+        entry after ``since`` and its last one, and a middle entry is always
+        an update, so keeping the create and the newest entry answers every
+        ``since`` exactly as the full log did.
+        """
+        if keep_revisions is None:
+            keep_revisions = getattr(settings, "PROJECT_CHANGE_LOG_RETENTION", 500)
+        entries = cls.objects.filter(project_id=project_id)
+        latest = entries.values("entity", "entity_id").annotate(last=models.Max("id")).values("last")
+        created = entries.filter(action="created").values("id")
+        removed, _ = entries.exclude(id__in=latest).exclude(id__in=created).delete()
+
+        revision = Project.objects.filter(pk=project_id).values_list("revision", flat=True).first() or 0
+        cutoff = revision - keep_revisions
+        if cutoff > 0:
+            removed += entries.filter(revision__lte=cutoff).delete()[0]
+            Project.objects.filter(pk=project_id, change_log_floor__lt=cutoff).update(change_log_floor=cutoff)
+        return removed
+
 
 # ═══════════════════════════════════════════════
 #  USER SHORTCUTS (per-user keyboard shortcut mapping)
@@ -0,0 +1,65 @@
+"""
+Interval index over a project's phases, for overlap checks.
+
+Phases overlap-check per scope: global phases (team=None) against other
+global phases, team phases against phases of the same team. PhaseIndex keeps
+each scope's phases sorted by start together with a running maximum of their
+ends, so "which phases overlap [start, start + duration)" is two bisections
+plus the matches. Phases in one scope never overlap each other (that is what
+the index guards), so the running maximum of the ends is each phase's own
+end and a query is O(log n + k). load() reads only the scopes being checked,
+with one query.
+"""
+
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+
+from django.db.models import Q
+
+from .models import Phase
+
+
+class PhaseIndex:
+    def __init__(self, phases):
+        """``phases``: (id, team_id, start_index, duration, name) tuples."""
+        scopes = {}
+        for phase in phases:
+            scopes.setdefault(phase[1], []).append(phase)
+        self._scopes = {}
+        for team_id, rows in scopes.items():
+            rows.sort(key=lambda row: row[2])
+            ends = [start + duration for _, _, start, duration, _ in rows]
+            self._scopes[team_id] = (
+                [row[2] for row in rows],   # starts, ascending
+                ends,                       # exclusive ends
+                list(accumulate(ends, max)),  # running max of ends, ascending
+                [(row[0], row[4]) for row in rows],  # (id, name)
+            )
+
+    @classmethod
+    def load(cls, project, scopes, exclude=()):
+        """
+        Index of ``project``'s phases in ``scopes`` (team ids, None for the
+        global scope), leaving out the ids in ``exclude``.
+        """
+        scopes = set(scopes)
+        in_scope = Q(team_id__in=[team_id for team_id in scopes if team_id is not None])
+        if None in scopes:
+            in_scope |= Q(team__isnull=True)
+        rows = Phase.objects.filter(in_scope, project=project).exclude(pk__in=exclude)
+        return cls(rows.values_list("id", "team_id", "start_index", "duration", "name"))
+
+    def overlapping(self, team_id, start_index, duration, exclude_id=None):
+        """(id, name) of the phases in ``team_id``'s scope overlapping [start, start + duration)."""
+        scope = self._scopes.get(team_id)
+        if scope is None:
+            return []
+        starts, ends, max_ends, phases = scope
+        end_index = start_index + duration
+        # candidates start before our end, and from ``lo`` on some earlier phase reaches past our start
+        lo = bisect_right(max_ends, start_index)
+        hi = bisect_left(starts, end_index)
+        return [
+            phases[i] for i in range(lo, hi)
+            if ends[i] > start_index and phases[i][0] != exclude_id
+        ]
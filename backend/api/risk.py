@@ -0,0 +1,134 @@
+"""
+Monte Carlo schedule risk: how likely is the project to finish by a day?
+
+Each scenario draws every milestone's duration from a triangular
+distribution (optimistic, planned, pessimistic) and replays the plan: a
+milestone starts on its planned day, or later if a (non-suggestion)
+predecessor slips into it. Scenarios are simulated together as a
+(samples x milestones) matrix, one array operation per topological layer of
+the dependency graph, so the Python work grows with the number of layers,
+not with samples x milestones. Samples are processed in chunks to bound
+memory and can be sharded over worker processes.
+
+A milestone is critical in a scenario if it ends on the project's last
+finishing day or, walking backwards, directly holds up a critical successor.
+Its criticality index is the share of scenarios in which it is critical.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .schedule import SOFT_WEIGHTS
+
+# Duration spread per Task.difficulty, as (optimistic, pessimistic) factors
+# of the planned duration; the planned duration is the most likely value.
+DIFFICULTY_SPREAD = {
+    "easy": (0.9, 1.25),
+    "medium": (0.8, 1.5),
+    "hard": (0.75, 2.0),
+}
+DEFAULT_SPREAD = DIFFICULTY_SPREAD["medium"]
+
+
+def duration_ranges(durations, difficulties, explicit=None):
+    """
+    (low, mode, high) arrays of day counts per milestone: ``explicit[i]``
+    if given, otherwise the planned duration spread by the task's difficulty.
+    """
+    mode = np.asarray(durations, dtype=np.float64)
+    factors = np.array([DIFFICULTY_SPREAD.get((d or "").strip().lower(), DEFAULT_SPREAD) for d in difficulties])
+    factors = factors.reshape(len(mode), 2)
+    low, high = mode * factors[:, 0], mode * factors[:, 1]
+    for i, (lo, most, hi) in (explicit or {}).items():
+        low[i], mode[i], high[i] = lo, most, hi
+    return low, mode, high
+
+
+class _Layers:
+    """The graph's nodes and non-suggestion edges grouped by topological layer."""
+
+    def __init__(self, graph):
+        layer = np.asarray(graph.layers(SOFT_WEIGHTS), dtype=np.int64)
+        keep = np.array([w not in SOFT_WEIGHTS for w in graph.weights], dtype=bool)
+        sources = np.asarray(graph.sources, dtype=np.int64)[keep]
+        targets = np.asarray(graph.targets, dtype=np.int64)[keep]
+        self.count = int(layer.max()) + 1 if len(layer) else 0
+
+        # incoming edges of each layer, grouped by target (for the forward pass)
+        self.incoming = []
+        for depth in range(self.count):
+            mask = layer[targets] == depth
+            self.incoming.append(_grouped(sources[mask], targets[mask]))
+        # outgoing edges of each layer, grouped by source (for the backward pass)
+        self.outgoing = []
+        for depth in range(self.count):
+            mask = layer[sources] == depth
+            self.outgoing.append(_grouped(targets[mask], sources[mask]))
+
+
+def _grouped(other, key):
+    """Edges sorted by ``key``: (key values, other ends, start offset of each key's run)."""
+    order = np.argsort(key, kind="stable")
+    other, key = other[order], key[order]
+    keys, offsets = np.unique(key, return_index=True)
+    return keys, other, offsets
+
+
+def _simulate_chunk(layers, starts, low, mode, high, samples, seed):
+    """Finish day per scenario and the number of scenarios each milestone was critical in."""
+    rng = np.random.default_rng(seed)
+    n = len(starts)
+    duration = np.ones((samples, n), dtype=np.int64)
+    spread = high > low
+    if spread.any():
+        drawn = rng.triangular(low[spread], mode[spread], high[spread], size=(samples, int(spread.sum())))
+        duration[:, spread] = np.maximum(np.ceil(drawn), 1)
+    duration[:, ~spread] = np.maximum(np.round(mode[~spread]), 1)
+
+    start = np.broadcast_to(np.asarray(starts, dtype=np.int64), (samples, n)).copy()
+    for keys, sources, offsets in layers.incoming:
+        if len(keys):
+            ready = start[:, sources] + duration[:, sources]
+            start[:, keys] = np.maximum(start[:, keys], np.maximum.reduceat(ready, offsets, axis=1))
+    end = start + duration - 1
+    finish = end.max(axis=1) if n else np.zeros(samples, dtype=np.int64)
+
+    critical = end == finish[:, None]
+    for keys, targets, offsets in reversed(layers.outgoing):
+        if len(keys):
+            sources = np.repeat(keys, np.diff(np.append(offsets, len(targets))))
+            holds_up = critical[:, targets] & (end[:, sources] + 1 == start[:, targets])
+            critical[:, keys] |= np.logical_or.reduceat(holds_up, offsets, axis=1)
+    return finish, critical.sum(axis=0)
+
+
+def _simulate_shard(layers, starts, low, mode, high, samples, seed_sequence, chunk):
+    finishes, critical = [], np.zeros(len(starts), dtype=np.int64)
+    for offset, child in zip(range(0, samples, chunk), seed_sequence.spawn(-(-samples // chunk))):
+        finish, chunk_critical = _simulate_chunk(layers, starts, low, mode, high, min(chunk, samples - offset), child)
+        finishes.append(finish)
+        critical += chunk_critical
+    return np.concatenate(finishes), critical
+
+
+def simulate(graph, starts, low, mode, high, samples, seed=None, workers=1, chunk=1000):
+    """
+    Run ``samples`` scenarios. Returns (finish day per scenario, criticality
+    index per milestone aligned with graph.ids). With ``workers`` > 1 the
+    samples are split into shards run in separate processes.
+    """
+    layers = _Layers(graph)
+    starts = np.asarray(starts, dtype=np.int64)
+    shards = max(1, min(workers, samples))
+    sizes = [samples // shards + (i < samples % shards) for i in range(shards)]
+    seeds = np.random.SeedSequence(seed).spawn(shards)
+    args = [(layers, starts, low, mode, high, size, shard_seed, chunk) for size, shard_seed in zip(sizes, seeds)]
+    if shards == 1:
+        results = [_simulate_shard(*args[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=shards) as pool:
+            results = list(pool.map(_simulate_shard, *zip(*args)))
+    finish = np.concatenate([shard_finish for shard_finish, _ in results])
+    critical = sum(shard_critical for _, shard_critical in results)
+    return finish, critical / samples
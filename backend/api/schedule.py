@@ -0,0 +1,270 @@
+"""
+Schedule analysis on top of the dependency graph (see graph.py).
+
+CriticalPath runs the forward and backward pass of the critical path method
+as NumPy array operations, one topological layer at a time (see
+hard_edge_layers()), so the Python work grows with the depth of the graph,
+not with its size:
+
+    earliest start  the planned start_index, or later if a predecessor
+                    hasn't finished by then
+    latest start    as late as possible without delaying a successor, the
+                    task's hard deadline or the project finish
+    slack           latest - earliest start; 0 (or negative, when a hard
+                    deadline can't be met) marks a critical milestone
+
+cascade_shift() places dragged milestones and pushes everything that
+depends on them forward by the least amount that keeps the dependencies
+satisfied, in one pass in topological order. validate_moves() checks a
+whole proposed move set at once and lists every constraint it breaks.
+
+Days are inclusive indices: a milestone of duration d starting on day s ends
+on day s + d - 1 and its successors may start on s + d. Suggestion
+dependencies are advisory and don't constrain the schedule.
+"""
+
+from array import array
+
+import numpy as np
+
+from .graph import DependencyCycleError
+from .models import Milestone
+
+# Dependency weights that don't constrain the schedule.
+SOFT_WEIGHTS = frozenset({"suggestion"})
+
+NO_DEADLINE = -1
+
+
+def schedule_arrays(graph, project_id):
+    """
+    (start_index, durations, deadlines) of the graph's milestones, aligned
+    with ``graph.ids``, read with one query. ``deadlines[i]`` is the task's
+    hard deadline (last day the milestone may end on) or NO_DEADLINE.
+    """
+    n = len(graph)
+    starts = array("l", [0]) * n
+    durations = array("l", [1]) * n
+    deadlines = array("l", [NO_DEADLINE]) * n
+    rows = Milestone.objects.filter(project_id=project_id).values_list("id", "start_index", "duration", "task__hard_deadline")
+    for milestone_id, start_index, duration, hard_deadline in rows:
+        i = graph.index.get(milestone_id)
+        if i is None:
+            continue
+        starts[i] = start_index
+        durations[i] = max(duration or 1, 1)
+        if hard_deadline is not None:
+            deadlines[i] = hard_deadline
+    return starts, durations, deadlines
+
+
+def hard_edge_layers(graph):
+    """
+    Longest-path layer of every node (0 without predecessors) and the
+    non-suggestion edges as (layer, sources, targets) NumPy arrays, found
+    with Kahn's algorithm one whole layer at a time. Raises
+    DependencyCycleError naming the milestones on or behind a cycle.
+    """
+    n = len(graph)
+    keep = np.fromiter((w not in SOFT_WEIGHTS for w in graph.weights), dtype=bool, count=graph.edge_count)
+    sources = np.asarray(graph.sources, dtype=np.int64)[keep]  # still sorted by source
+    targets = np.asarray(graph.targets, dtype=np.int64)[keep]
+    out_offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=n), out=out_offsets[1:])
+
+    in_degree = np.bincount(targets, minlength=n)
+    layer = np.zeros(n, dtype=np.int64)
+    frontier = np.flatnonzero(in_degree == 0)
+    depth = placed = 0
+    while len(frontier):
+        layer[frontier] = depth
+        placed += len(frontier)
+        counts = out_offsets[frontier + 1] - out_offsets[frontier]
+        first = np.repeat(out_offsets[frontier] - np.cumsum(counts) + counts, counts)
+        successors, removed = np.unique(targets[first + np.arange(counts.sum())], return_counts=True)
+        in_degree[successors] -= removed
+        frontier = successors[in_degree[successors] == 0]
+        depth += 1
+    if placed < n:
+        raise DependencyCycleError([graph.ids[i] for i in np.flatnonzero(in_degree > 0)])
+    return layer, sources, targets
+
+
+def _by_layer(layer, key):
+    """Edge numbers grouped by ``layer[key]``: one array per layer, shallowest first."""
+    order = np.argsort(layer[key], kind="stable")
+    bounds = np.searchsorted(layer[key][order], np.arange(int(layer.max(initial=0)) + 2))
+    return [order[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+
+class CriticalPath:
+    """Forward / backward pass over ``graph``; every array is aligned with ``graph.ids``."""
+
+    def __init__(self, graph, starts, durations, deadlines):
+        self.graph = graph
+        n = len(graph)
+        layer, sources, targets = hard_edge_layers(graph)
+        starts = np.asarray(starts, dtype=np.int64).reshape(n)
+        durations = np.asarray(durations, dtype=np.int64).reshape(n)
+        deadlines = np.asarray(deadlines, dtype=np.int64).reshape(n)
+
+        # Forward pass, one layer at a time: each layer's predecessors are final.
+        earliest = starts.copy()
+        incoming = _by_layer(layer, targets)
+        for edges in incoming[1:]:
+            np.maximum.at(earliest, targets[edges], earliest[sources[edges]] + durations[sources[edges]])
+        # the predecessor that fixes the earliest start (lowest id on a tie)
+        drives = earliest[sources] + durations[sources] == earliest[targets]
+        driver = np.full(n, n, dtype=np.int64)
+        np.minimum.at(driver, targets[drives], sources[drives])
+        driver[driver == n] = -1
+        self.finish = int((earliest + durations - 1).max(initial=-1))
+
+        # Backward pass, deepest layer first: each layer's successors are final.
+        latest_end = np.full(n, self.finish, dtype=np.int64)
+        has_deadline = (deadlines > NO_DEADLINE) & (deadlines < self.finish)
+        latest_end[has_deadline] = deadlines[has_deadline]
+        latest = latest_end - durations + 1
+        outgoing = _by_layer(layer, sources)
+        for depth in range(len(outgoing) - 1, -1, -1):
+            edges = outgoing[depth]
+            if len(edges):
+                np.minimum.at(latest_end, sources[edges], latest[targets[edges]] - 1)
+                nodes = np.unique(sources[edges])
+                latest[nodes] = latest_end[nodes] - durations[nodes] + 1
+
+        self.starts = starts
+        self.durations = durations
+        self.earliest_start = earliest
+        self.latest_start = latest
+        self.driver = driver
+        self.slack = latest - earliest
+
+    def critical_chain(self):
+        """
+        Milestone ids of the most critical chain, first to last: from the
+        least-slack milestone that finishes last back through the
+        predecessors that drive its start.
+        """
+        if not len(self.graph):
+            return []
+        node = int(np.lexsort((-(self.earliest_start + self.durations), self.slack))[0])
+        chain = []
+        while node != -1:
+            chain.append(self.graph.ids[node])
+            node = int(self.driver[node])
+        chain.reverse()
+        return chain
+
+    def rows(self):
+        """One dict per milestone, in ``graph.ids`` order."""
+        ids = self.graph.ids
+        columns = zip(
+            self.starts.tolist(), self.earliest_start.tolist(), self.latest_start.tolist(),
+            self.durations.tolist(), self.slack.tolist(), self.driver.tolist(),
+        )
+        return [
+            {
+                "id": milestone_id,
+                "start_index": start,
+                "earliest_start": earliest,
+                "earliest_finish": earliest + duration - 1,
+                "latest_start": latest,
+                "latest_finish": latest + duration - 1,
+                "slack": slack,
+                "critical": slack <= 0,
+                "driving_predecessor": ids[driver] if driver != -1 else None,
+            }
+            for milestone_id, (start, earliest, latest, duration, slack, driver) in zip(ids, columns)
+        ]
+
+
+def cascade_shift(graph, starts, durations, moves, blocked_days=()):
+    """
+    Place ``moves`` ({milestone_id: start_index}) and push every milestone
+    that (transitively) depends on a moved one forward by the least amount
+    that satisfies its dependencies; a pushed milestone never starts on a
+    blocked day. Milestones are never pulled backwards.
+
+    Returns {milestone_id: new start_index} for every milestone whose start
+    changes. Deadlines aren't checked here; run validate_moves() on the result.
+    """
+    targets, weights, out_offsets = graph.targets, graph.weights, graph.out_offsets
+    start = array("l", starts)
+    changed = bytearray(len(graph))
+    for milestone_id, index in moves.items():
+        i = graph.index[milestone_id]
+        start[i] = index
+        changed[i] = 1
+
+    for node in graph.topological_indices(SOFT_WEIGHTS):
+        if not changed[node]:
+            continue
+        # every predecessor has been visited, so this start is final
+        end = start[node] + durations[node] - 1
+        for k in range(out_offsets[node], out_offsets[node + 1]):
+            target = targets[k]
+            if weights[k] in SOFT_WEIGHTS or start[target] > end:
+                continue
+            shifted = end + 1
+            while shifted in blocked_days:
+                shifted += 1
+            if shifted > start[target]:
+                start[target] = shifted
+                changed[target] = 1
+
+    return {graph.ids[i]: start[i] for i in range(len(graph)) if start[i] != starts[i]}
+
+
+def validate_moves(graph, starts, durations, deadlines, moves, days_count=None):
+    """
+    Every constraint broken once all of ``moves`` ({milestone_id:
+    start_index}) are applied together: starting before day 0, ending after
+    the last project day (``days_count``, None to skip), ending after the
+    task's hard deadline, and a dependency whose target would start before
+    its source has finished. Only the moved milestones and the dependencies
+    touching them are checked, each once. Returns a list of violation dicts.
+    """
+    sources, targets, weights = graph.sources, graph.targets, graph.weights
+    start = array("l", starts)
+    moved = bytearray(len(graph))
+    for milestone_id, index in moves.items():
+        i = graph.index[milestone_id]
+        start[i] = index
+        moved[i] = 1
+
+    violations = []
+    edges = []
+    for i, milestone_id in enumerate(graph.ids):
+        if not moved[i]:
+            continue
+        end = start[i] + durations[i] - 1
+        if start[i] < 0:
+            violations.append({
+                "type": "before_start", "milestone_id": milestone_id,
+                "detail": f"Milestone {milestone_id} cannot be placed before day 0",
+            })
+        if days_count is not None and end >= days_count:
+            violations.append({
+                "type": "out_of_range", "milestone_id": milestone_id, "end_index": end, "days_count": days_count,
+                "detail": f"Milestone {milestone_id} would end after the last project day",
+            })
+        if NO_DEADLINE < deadlines[i] < end:
+            violations.append({
+                "type": "hard_deadline", "milestone_id": milestone_id, "end_index": end, "hard_deadline": deadlines[i],
+                "detail": f"Milestone {milestone_id} would exceed its task hard deadline",
+            })
+        edges.extend(range(graph.out_offsets[i], graph.out_offsets[i + 1]))
+        # incoming edges from a moved source are already among its outgoing ones
+        edges.extend(k for k in graph.in_edges[graph.in_offsets[i]:graph.in_offsets[i + 1]] if not moved[sources[k]])
+
+    for k in edges:
+        source, target = sources[k], targets[k]
+        if weights[k] in SOFT_WEIGHTS or start[source] + durations[source] - 1 < start[target]:
+            continue
+        source_id, target_id = graph.ids[source], graph.ids[target]
+        violations.append({
+            "type": "dependency", "milestone_id": target_id, "source": source_id, "target": target_id, "weight": weights[k],
+            "detail": f"Milestone {target_id} would start before milestone {source_id} finishes",
+        })
+    return violations
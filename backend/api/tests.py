@@ -11,25 +11,88 @@ Structure:
     7. Notification Tests   – List, read, delete
     8. Demo Date Tests      – Get/set demo date
     9. User Teams/Tasks     – Aggregated views
+   10. IdeaBin Queries      – Query counts stay flat as the IdeaBin grows
+   11. Done State           – Annotated is_done / is_done_effective
+   12. Task Legend Types    – Batched legend_types serialization
+   13. Project Access       – Access resolver, decorator, caching
+   14. Snapshots            – Capture / bulk transactional restore, compressed storage, diff
+   15. IdeaBin Export       – Streaming export, encodings, query counts
+   16. IdeaBin Import       – Validation, bulk insert pipeline, id remapping, streaming
+   17. Project Revision     – Revision bumps on writes, ETag / If-None-Match
+   18. Change Feed          – Changes since a revision, reset / compaction, 410
+   19. Live Events          – SSE stream, Last-Event-ID replay, heartbeat, backpressure
+   20. Project Bootstrap    – One-request planning model, include=, query counts
+   21. Virtual Days         – Computed calendar, override rows, O(overrides) resync
+   22. Date Range Checks    – Set-based out-of-range milestone validation
+   23. Dependency Graph     – Cycle detection, lineage, topological order, cache
+   24. Critical Path        – Forward / backward pass, slack, hard deadlines
+   25. Cascade Moves        – Pushing dependent milestones along in one bulk update
+   26. Move Validation      – Whole-move-set constraint checks, dry run
+   27. Dependency Import    – Layered bulk import in one transaction
+   28. Phases               – Interval index overlap checks, bulk phase update
+   29. Team Workload        – Team x day load matrix, blocked days
+   30. Resource Leveling    – Capacity-bounded list scheduling, dry run / apply
+   31. Schedule Risk        – Monte Carlo finish percentiles, criticality indices
 """
 
+import gzip
 import json
+import tempfile
 from datetime import date, timedelta
 
 from django.contrib.auth.models import User
-from django.db import IntegrityError
-from django.test import TestCase
+from django.core.cache import cache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from io import StringIO
+from unittest import mock
+
+from api import graph as dependency_graph
+from api.phase_index import PhaseIndex
+from api.workload import load_matrix
+from api.events import ChangeLogBackend, ProjectEventBroker, change_event, get_broker
+from api.views.serializers import DaySerializer
+from api.views.snapshots import _capture_snapshot_data as api_snapshot_data
+from api.views.helpers import accessible_project_ids, get_accessible_project, user_has_project_access
 from api.models import (
+    AcceptanceCriterion,
+    Category,
+    CategoryContextPlacement,
+    Context,
+    Day,
     DemoDate,
+    Formation,
+    Dependency,
+    Idea,
+    IdeaComment,
+    IdeaContextPlacement,
+    IdeaLegendType,
+    IdeaPlacement,
+    IdeaUpvote,
     Legend,
+    LegendContextPlacement,
     LegendType,
+    Milestone,
+    MilestoneTodo,
     Notification,
+    Phase,
     Project,
+    ProjectChange,
+    ProjectSnapshot,
     Task,
+    TaskLegend,
+    TaskLegendAssignment,
+    TaskLegendType,
     Team,
+    UserCategoryAdoption,
+    UserContextAdoption,
 )
 
 
@@ -526,4 +589,1877 @@ class UserTeamsTasksTest(APITestBase):
 
     def test_user_tasks(self):
         response = self.client.get("/api/user/tasks/")
-        self.assertEqual(response.status_code, 200)
\ No newline at end of file
+        self.assertEqual(response.status_code, 200)
+
+
+# ═══════════════════════════════════════════════
+#  10. IDEABIN QUERY COUNTS
+# ═══════════════════════════════════════════════
+
+
+class GetAllIdeasQueryCountTest(APITestBase):
+    def _populate(self, n):
+        """Give the user n owned categories, n adopted categories and n contexts,
+        each with a couple of ideas."""
+        legend = Legend.objects.create(name="L", owner=self.user)
+        lt = LegendType.objects.create(legend=legend, name="T")
+        for i in range(n):
+            own_cat = Category.objects.create(name=f"own{i}", owner=self.user)
+            shared_cat = Category.objects.create(name=f"shared{i}", owner=self.other_user, is_public=True)
+            UserCategoryAdoption.objects.create(user=self.user, category=shared_cat)
+            ctx = Context.objects.create(name=f"ctx{i}", owner=self.other_user)
+            UserContextAdoption.objects.create(user=self.user, context=ctx)
+            ctx_cat = Category.objects.create(name=f"ctxcat{i}", owner=self.other_user)
+            CategoryContextPlacement.objects.create(category=ctx_cat, context=ctx)
+            for cat, owner in ((own_cat, self.user), (shared_cat, self.other_user), (ctx_cat, self.other_user)):
+                idea = Idea.objects.create(title=f"{cat.name}-idea", owner=owner)
+                IdeaPlacement.objects.create(idea=idea, category=cat)
+                IdeaLegendType.objects.create(idea=idea, legend=legend, legend_type=lt)
+                IdeaUpvote.objects.create(user=self.user, idea=idea)
+            loose = Idea.objects.create(title=f"loose{i}", owner=self.other_user)
+            IdeaPlacement.objects.create(idea=loose, category=None)
+            IdeaContextPlacement.objects.create(idea=loose, context=ctx)
+            mine = Idea.objects.create(title=f"mine{i}", owner=self.user)
+            IdeaPlacement.objects.create(idea=mine, category=None, order_index=i)
+
+    def _count_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/user/ideas/all/")
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response.data
+
+    def test_query_count_independent_of_category_count(self):
+        self._populate(1)
+        small, _ = self._count_queries()
+        self._populate(6)
+        large, data = self._count_queries()
+        self.assertEqual(small, large)
+        self.assertEqual(len(data["category_orders"]), 21)
+        self.assertEqual(len(data["context_idea_orders"]), 7)
+
+    def test_orders_and_payload(self):
+        self._populate(2)
+        _, data = self._count_queries()
+        mine = list(
+            IdeaPlacement.objects.filter(idea__owner=self.user, category__isnull=True)
+            .order_by("order_index").values_list("id", flat=True)
+        )
+        self.assertEqual(data["order"], mine)
+        own_cat = Category.objects.get(name="own0")
+        self.assertEqual(
+            data["category_orders"][own_cat.id],
+            list(IdeaPlacement.objects.filter(category=own_cat).values_list("id", flat=True)),
+        )
+        loose = IdeaPlacement.objects.get(idea__title="loose0")
+        row = next(p for p in data["data"] if p["id"] == loose.id)
+        self.assertEqual(row["idea"]["placement_count"], 1)
+        shared = next(p for p in data["data"] if p["idea"]["title"] == "shared0-idea")
+        self.assertEqual(shared["idea"]["upvote_count"], 1)
+        self.assertTrue(shared["idea"]["user_has_upvoted"])
+        self.assertEqual(len(shared["idea"]["legend_types"]), 1)
+
+
+# ═══════════════════════════════════════════════
+#  11. DONE STATE
+# ═══════════════════════════════════════════════
+
+
+class DoneStateTest(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(name="Done", owner=self.user)
+        self.team = Team.objects.create(name="T", project=self.project)
+
+    def _add_task(self, criteria_done):
+        task = Task.objects.create(name="Task", project=self.project, team=self.team)
+        for i, done in enumerate(criteria_done):
+            AcceptanceCriterion.objects.create(task=task, title=f"c{i}", done=done, order=i)
+        return task
+
+    def _add_milestone(self, task, todos_done):
+        ms = Milestone.objects.create(name="M", project=self.project, task=task)
+        for i, done in enumerate(todos_done):
+            MilestoneTodo.objects.create(milestone=ms, title=f"t{i}", done=done, order=i)
+        return ms
+
+    def test_annotations(self):
+        open_task = self._add_task([True, False])
+        done_task = self._add_task([True])
+        empty_task = self._add_task([])
+        ms_done = self._add_milestone(open_task, [True, True])
+        ms_open = self._add_milestone(open_task, [True, False])
+        ms_inherited = self._add_milestone(done_task, [False])
+        ms_empty = self._add_milestone(empty_task, [])
+
+        tasks = {t.id: t.is_done for t in Task.objects.with_done_state()}
+        self.assertEqual(tasks, {open_task.id: False, done_task.id: True, empty_task.id: False})
+
+        ms = {m.id: (m.is_done, m.is_done_effective) for m in Milestone.objects.with_done_state()}
+        self.assertEqual(ms[ms_done.id], (True, True))
+        self.assertEqual(ms[ms_open.id], (False, False))
+        self.assertEqual(ms[ms_inherited.id], (False, True))
+        self.assertEqual(ms[ms_empty.id], (False, False))
+
+    def test_get_all_milestones_query_count_is_flat(self):
+        def count():
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.client.get(f"/api/projects/{self.project.id}/get_all_milestones/")
+            self.assertEqual(resp.status_code, 200)
+            return len(ctx.captured_queries), resp.data["milestones"]
+
+        task = self._add_task([True])
+        self._add_milestone(task, [False])
+        small, _ = count()
+        for _ in range(10):
+            self._add_milestone(self._add_task([False]), [True])
+        large, milestones = count()
+        self.assertEqual(small, large)
+        self.assertEqual(len(milestones), 11)
+        self.assertTrue(all(m["is_done_effective"] for m in milestones))
+
+    def test_project_teams_expanded_query_count_is_flat(self):
+        def count():
+            with CaptureQueriesContext(connection) as ctx:
+                resp = self.client.get(f"/api/projects/{self.project.id}/project_teams_expanded/")
+            self.assertEqual(resp.status_code, 200)
+            return len(ctx.captured_queries), resp.data["teams"]
+
+        self._add_task([True])
+        small, _ = count()
+        for _ in range(5):
+            self._add_task([True, False])
+        large, teams = count()
+        self.assertEqual(small, large)
+        self.assertEqual([t["is_done"] for t in teams[0]["tasks"]].count(True), 1)
+
+
+# ═══════════════════════════════════════════════
+#  12. TASK LEGEND TYPES
+# ═══════════════════════════════════════════════
+
+
+class TaskLegendTypesQueryTest(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(name="Legends", owner=self.user)
+        self.team = Team.objects.create(name="T", project=self.project)
+        self.legend = TaskLegend.objects.create(project=self.project, owner=self.user, name="Risk")
+        self.high = TaskLegendType.objects.create(legend=self.legend, name="High", color="#f00")
+
+    def _add_tasks(self, n):
+        for i in range(n):
+            task = Task.objects.create(name=f"t{i}", project=self.project, team=self.team)
+            TaskLegendAssignment.objects.create(task=task, legend=self.legend, legend_type=self.high)
+            Milestone.objects.create(name=f"m{i}", project=self.project, task=task)
+
+    def _count(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        return len(ctx.captured_queries), resp.data
+
+    def test_fetch_project_tasks_is_bounded(self):
+        url = f"/api/projects/{self.project.id}/fetch_project_tasks/"
+        self._add_tasks(1)
+        small, _ = self._count(url)
+        self._add_tasks(8)
+        large, data = self._count(url)
+        self.assertEqual(small, large)
+        task = next(iter(data["tasks"].values()))
+        self.assertEqual(task["legend_types"][str(self.legend.id)]["name"], "High")
+
+    def test_project_tasks_batches_without_prefetch(self):
+        url = f"/api/projects/{self.project.id}/tasks/"
+        self._add_tasks(1)
+        small, _ = self._count(url)
+        self._add_tasks(8)
+        large, data = self._count(url)
+        self.assertEqual(small, large)
+        self.assertTrue(all(t["legend_types"] for t in data["tasks"]))
+
+
+# ═══════════════════════════════════════════════
+#  13. PROJECT ACCESS
+# ═══════════════════════════════════════════════
+
+
+class ProjectAccessTest(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.owned = Project.objects.create(name="Owned", owner=self.user)
+        self.shared = Project.objects.create(name="Shared", owner=self.other_user)
+        self.shared.members.add(self.user)
+        self.private = Project.objects.create(name="Private", owner=self.other_user)
+
+    def test_accessible_project_ids(self):
+        ids = [self.owned.id, self.shared.id, self.private.id]
+        with self.assertNumQueries(1):
+            visible = accessible_project_ids(self.user, ids)
+        self.assertEqual(visible, {self.owned.id, self.shared.id})
+
+    def test_user_has_project_access_is_memoised(self):
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(1):
+            self.assertTrue(user_has_project_access(user, self.shared))
+            self.assertTrue(user_has_project_access(user, self.shared))
+            self.assertTrue(user_has_project_access(user, self.owned))
+        self.assertFalse(user_has_project_access(user, self.private))
+
+    def test_decorated_view_statuses(self):
+        self.assertEqual(self.client.get(f"/api/projects/{self.shared.id}/get_all_milestones/").status_code, 200)
+        self.assertEqual(self.client.get(f"/api/projects/{self.private.id}/get_all_milestones/").status_code, 403)
+        self.assertEqual(self.client.get("/api/projects/99999/get_all_milestones/").status_code, 404)
+
+    def test_get_accessible_project_is_one_query(self):
+        with self.assertNumQueries(1):
+            project, has_access = get_accessible_project(self.user, self.shared.id)
+        self.assertEqual(project, self.shared)
+        self.assertTrue(has_access)
+        with self.assertNumQueries(0):
+            self.assertTrue(user_has_project_access(self.user, project))
+
+    def test_cache_invalidated_on_join_and_leave(self):
+        with tempfile.TemporaryDirectory() as location, override_settings(
+            PROJECT_ACCESS_CACHE_TIMEOUT=60,
+            CACHES={"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": location}},
+        ):
+            # a second cache instance on the same store stands in for another worker process
+            other_worker = FileBasedCache(location, {})
+            key = f"project_access:{self.other_user.id}"
+            other = self._get_other_client()
+            url = f"/api/projects/{self.owned.id}/get_all_milestones/"
+            self.assertEqual(other.get(url).status_code, 403)
+            self.assertNotIn(self.owned.id, other_worker.get(key))
+            other.post(f"/api/projects/{self.owned.id}/join/")
+            self.assertIsNone(other_worker.get(key))
+            self.assertEqual(other.get(url).status_code, 200)
+            self.assertIn(self.owned.id, other_worker.get(key))
+            other.post(f"/api/projects/{self.owned.id}/leave/")
+            self.assertIsNone(other_worker.get(key))
+            self.assertEqual(other.get(url).status_code, 403)
+
+    @override_settings(PROJECT_ACCESS_CACHE_TIMEOUT=60)
+    def test_process_local_cache_is_not_used(self):
+        self.assertEqual(self.client.get(f"/api/projects/{self.shared.id}/get_all_milestones/").status_code, 200)
+        self.assertIsNone(cache.get(f"project_access:{self.user.id}"))
+
+
+# ═══════════════════════════════════════════════
+#  14. SNAPSHOTS
+# ═══════════════════════════════════════════════
+
+
+class SnapshotRestoreTest(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(
+            name="Snap", owner=self.user,
+            start_date=date(2025, 1, 1), end_date=date(2025, 1, 10),
+        )
+        Day.objects.create(project=self.project, date=date(2025, 1, 4), day_index=3, is_blocked=True, purpose="Holiday")
+        team = Team.objects.create(name="Core", project=self.project)
+        task = Task.objects.create(name="Build", project=self.project, team=team, needs_approval=True)
+        AcceptanceCriterion.objects.create(task=task, title="Tested", done=True)
+        first = Milestone.objects.create(name="M1", project=self.project, task=task, duration=2)
+        second = Milestone.objects.create(name="M2", project=self.project, task=task, start_index=4)
+        MilestoneTodo.objects.create(milestone=first, title="Review")
+        Dependency.objects.create(source=first, target=second, weight="weak")
+        Phase.objects.create(project=self.project, team=team, name="Alpha", duration=5)
+
+        res = self.client.post(f"/api/projects/{self.project.id}/snapshots/create/", {"name": "v1"}, format="json")
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.snapshot_id = res.data["snapshot"]["id"]
+        self.url = f"/api/projects/{self.project.id}/snapshots/{self.snapshot_id}/restore/"
+
+    def test_restore_round_trip(self):
+        Task.objects.filter(project=self.project).delete()
+        Team.objects.create(name="Stray", project=self.project)
+        Day.objects.filter(project=self.project).update(is_blocked=False)
+
+        res = self.client.post(self.url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["timings"]["milestones"]["rows"], 2)
+        self.assertEqual(res.data["timings"]["days"]["rows"], 1)
+
+        self.assertEqual(list(Team.objects.filter(project=self.project).values_list("name", flat=True)), ["Core"])
+        task = Task.objects.get(project=self.project)
+        self.assertTrue(task.needs_approval)
+        self.assertEqual(task.team.name, "Core")
+        self.assertEqual(task.acceptance_criteria.get().title, "Tested")
+        dep = Dependency.objects.get(source__project=self.project)
+        self.assertEqual((dep.source.name, dep.target.name, dep.weight), ("M1", "M2", "weak"))
+        self.assertEqual(dep.source.todos.get().title, "Review")
+        self.assertEqual(Phase.objects.get(project=self.project).team, task.team)
+        day = Day.objects.get(project=self.project, day_index=3)
+        self.assertEqual((day.is_blocked, day.purpose, day.date), (True, "Holiday", date(2025, 1, 4)))
+
+    @override_settings(SNAPSHOT_KEYFRAME_INTERVAL=1)
+    def test_restore_query_count_is_flat(self):
+        def restore_queries(snapshot_id):
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.post(f"/api/projects/{self.project.id}/snapshots/{snapshot_id}/restore/")
+            return len(ctx)
+
+        small = restore_queries(self.snapshot_id)
+        data = ProjectSnapshot.objects.get(pk=self.snapshot_id).load_data()
+        task_id = data["tasks"][0]["id"]
+        data["milestones"] += [
+            {"id": 10_000 + i, "name": f"X{i}", "description": None, "task_id": task_id,
+             "start_index": i % 10, "duration": 1}
+            for i in range(20)
+        ]
+        large = ProjectSnapshot.store(self.project, data, name="large")
+        self.assertEqual(restore_queries(large.id), small)
+
+    def test_failed_restore_rolls_back(self):
+        with mock.patch("api.views.snapshots.Phase.objects.bulk_create", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.client.post(self.url)
+        self.assertEqual(Milestone.objects.filter(project=self.project).count(), 2)
+        self.assertEqual(Day.objects.filter(project=self.project).count(), 1)
+
+
+@override_settings(SNAPSHOT_KEYFRAME_INTERVAL=3)
+class SnapshotStorageTest(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(
+            name="Store", owner=self.user,
+            start_date=date(2025, 1, 1), end_date=date(2025, 3, 31),
+        )
+        team = Team.objects.create(name="Core", project=self.project)
+        self.tasks = [Task.objects.create(name=f"T{i}", project=self.project, team=team) for i in range(20)]
+
+    def _snapshot(self, name):
+        res = self.client.post(f"/api/projects/{self.project.id}/snapshots/create/", {"name": name}, format="json")
+        return ProjectSnapshot.objects.get(pk=res.data["snapshot"]["id"])
+
+    def _fetch(self, snapshot):
+        return self.client.get(f"/api/projects/{self.project.id}/snapshots/{snapshot.id}/").data["data"]
+
+    def test_keyframes_and_deltas_round_trip(self):
+        snapshots, expected = [], []
+        for i in range(5):
+            Task.objects.filter(pk=self.tasks[i].pk).update(name=f"Renamed {i}")
+            Task.objects.create(name=f"New {i}", project=self.project)
+            snapshots.append(self._snapshot(f"v{i}"))
+            expected.append(api_snapshot_data(self.project))
+
+        self.assertEqual([s.base_id is None for s in snapshots], [True, False, False, True, False])
+        self.assertEqual(snapshots[1].base_id, snapshots[0].id)
+        self.assertLess(snapshots[1].stored_size, snapshots[0].stored_size)
+        self.assertEqual(snapshots[0].data, {})
+        for snapshot, data in zip(snapshots, expected):
+            self.assertEqual(self._fetch(snapshot), data)
+
+    def test_deleting_keyframe_promotes_delta(self):
+        first = self._snapshot("v1")
+        Task.objects.filter(pk=self.tasks[0].pk).delete()
+        second_data = api_snapshot_data(self.project)
+        second = self._snapshot("v2")
+        Task.objects.create(name="Late", project=self.project)
+        third_data = api_snapshot_data(self.project)
+        third = self._snapshot("v3")
+
+        self.client.delete(f"/api/projects/{self.project.id}/snapshots/{first.id}/delete/")
+        second.refresh_from_db()
+        third.refresh_from_db()
+        self.assertIsNone(second.base_id)
+        self.assertEqual(third.base_id, second.id)
+        self.assertEqual(self._fetch(second), second_data)
+        self.assertEqual(self._fetch(third), third_data)
+
+    def test_queryset_delete_of_keyframe_promotes_delta(self):
+        first = self._snapshot("v1")
+        Task.objects.filter(pk=self.tasks[0].pk).delete()
+        second_data = api_snapshot_data(self.project)
+        second = self._snapshot("v2")
+        Task.objects.create(name="Late", project=self.project)
+        third_data = api_snapshot_data(self.project)
+        third = self._snapshot("v3")
+        self.assertEqual((second.base_id, third.base_id), (first.id, first.id))
+
+        ProjectSnapshot.objects.filter(pk=first.pk).delete()
+        second.refresh_from_db()
+        third.refresh_from_db()
+        self.assertIsNone(second.base_id)
+        self.assertEqual(third.base_id, second.id)
+        self.assertEqual(self._fetch(second), second_data)
+        self.assertEqual(self._fetch(third), third_data)
+
+        # deleting a keyframe together with its deltas, or the whole project, needs no promotion
+        ProjectSnapshot.objects.filter(project=self.project).delete()
+        self.assertFalse(ProjectSnapshot.objects.exists())
+        self._snapshot("v4")
+        self._snapshot("v5")
+        self.project.delete()
+        self.assertFalse(ProjectSnapshot.objects.exists())
+
+    def test_restore_from_delta(self):
+        self._snapshot("v1")
+        Task.objects.create(name="Extra", project=self.project)
+        delta = self._snapshot("v2")
+        Task.objects.filter(project=self.project).delete()
+        self.client.post(f"/api/projects/{self.project.id}/snapshots/{delta.id}/restore/")
+        self.assertEqual(Task.objects.filter(project=self.project).count(), 21)
+
+    def test_storage_command_repacks_legacy_rows(self):
+        data = api_snapshot_data(self.project)
+        legacy = ProjectSnapshot.objects.create(project=self.project, name="old", data=data)
+        out = StringIO()
+        call_command("snapshot_storage", "--repack", stdout=out)
+        legacy.refresh_from_db()
+        self.assertFalse(legacy.is_legacy)
+        self.assertEqual(legacy.load_data(), data)
+        self.assertIn("1 keyframes, 0 deltas, 0 legacy", out.getvalue())
+        self.assertIn("saved", out.getvalue())
+
+
+class SnapshotDiffTest(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(name="Diff", owner=self.user)
+        self.team = Team.objects.create(name="Core", project=self.project)
+        self.task = Task.objects.create(name="Build", project=self.project, team=self.team)
+        self.m1 = Milestone.objects.create(name="M1", project=self.project, task=self.task)
+        self.m2 = Milestone.objects.create(name="M2", project=self.project, task=self.task, start_index=3)
+        Dependency.objects.create(source=self.m1, target=self.m2)
+        self.base = self._snapshot("base")
+
+    def _snapshot(self, name):
+        res = self.client.post(f"/api/projects/{self.project.id}/snapshots/create/", {"name": name}, format="json")
+        return res.data["snapshot"]["id"]
+
+    def _diff(self, snapshot_id, against=None):
+        url = f"/api/projects/{self.project.id}/snapshots/{snapshot_id}/diff/"
+        return self.client.get(url, {"against": against} if against else {}).data
+
+    def test_diff_against_live(self):
+        Milestone.objects.filter(pk=self.m2.pk).update(start_index=5)
+        Task.objects.create(name="Extra", project=self.project)
+        Dependency.objects.all().delete()
+
+        diff = self._diff(self.base)
+        self.assertEqual(diff["from"], "live")
+        self.assertEqual(diff["tasks"]["removed"], [{"id": Task.objects.get(name="Extra").id, "name": "Extra"}])
+        self.assertEqual(diff["milestones"]["changed"][0]["changes"], {"start_index": [5, 3]})
+        self.assertEqual(diff["summary"]["dependencies"], {"added": 1, "removed": 0, "changed": 0})
+        self.assertEqual(diff["summary"]["teams"], {"added": 0, "removed": 0, "changed": 0})
+
+    def test_restored_project_matches_by_name(self):
+        self.client.post(f"/api/projects/{self.project.id}/snapshots/{self.base}/restore/")
+        self.assertNotEqual(Task.objects.get(project=self.project).id, self.task.id)
+        diff = self._diff(self.base)
+        for section in ("teams", "tasks", "milestones", "dependencies", "phases"):
+            self.assertEqual(diff["summary"][section], {"added": 0, "removed": 0, "changed": 0}, section)
+
+    def test_diff_between_snapshots(self):
+        Team.objects.create(name="Ops", project=self.project)
+        later = self._snapshot("later")
+        diff = self._diff(later, against=self.base)
+        self.assertEqual((diff["from"], diff["to"]), (self.base, later))
+        self.assertEqual([t["name"] for t in diff["teams"]["added"]], ["Ops"])
+        self.assertEqual(self._diff(later, against=99999).get("error"), "Snapshot to compare against not found")
+
+
+# ═══════════════════════════════════════════════
+#  15. IDEABIN EXPORT
+# ═══════════════════════════════════════════════
+
+
+class IdeaBinTestBase(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.context = Context.objects.create(name="Ctx", owner=self.user)
+        self.category = Category.objects.create(name="Cat", owner=self.user)
+        CategoryContextPlacement.objects.create(category=self.category, context=self.context)
+        self.legend = Legend.objects.create(name="L", owner=self.user)
+        LegendContextPlacement.objects.create(legend=self.legend, context=self.context)
+        self.legend_type = LegendType.objects.create(legend=self.legend, name="T")
+        LegendType.objects.create(legend=self.legend, name="U")
+
+    def _add_ideas(self, n):
+        for i in range(n):
+            idea = Idea.objects.create(title=f"Idea ü {i}", description="line\nbreak", owner=self.user)
+            IdeaPlacement.objects.create(idea=idea, category=self.category if i % 2 else None)
+            IdeaLegendType.objects.create(idea=idea, legend=self.legend, legend_type=self.legend_type)
+            IdeaUpvote.objects.create(user=self.other_user, idea=idea)
+            IdeaComment.objects.create(user=self.other_user, idea=idea, text="ok")
+
+    def _export(self, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/ideabin/export/", params)
+            body = b"".join(response.streaming_content)
+        return response, body, len(ctx)
+
+
+class IdeaBinExportTest(IdeaBinTestBase):
+    def test_indented_output_matches_json_dumps(self):
+        self._add_ideas(3)
+        response, body, _ = self._export()
+        self.assertEqual(response["Content-Type"], "application/json")
+        data = json.loads(body)
+        self.assertEqual(body.decode(), json.dumps(data, indent=2))
+        self.assertEqual(len(data["ideas"]), 3)
+        idea = data["ideas"][0]
+        self.assertEqual((len(idea["placements"]), len(idea["upvotes"]), len(idea["comments"])), (1, 1, 1))
+        self.assertEqual(len(data["legends"][0]["types"]), 2)
+        self.assertEqual(data["adoptions"]["contexts"], [])
+
+    def test_query_count_independent_of_idea_count(self):
+        self._add_ideas(2)
+        _, _, small = self._export(encoding="compact")
+        self._add_ideas(30)
+        _, body, large = self._export(encoding="compact")
+        self.assertEqual(small, large)
+        self.assertEqual(len(json.loads(body)["ideas"]), 32)
+
+    def test_compact_and_gzip_encodings(self):
+        self._add_ideas(4)
+        _, indented, _ = self._export()
+        _, compact, _ = self._export(encoding="compact")
+        response, zipped, _ = self._export(encoding="gzip")
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertNotIn(b"\n", compact)
+        expected = json.loads(indented)
+        for body in (compact, gzip.decompress(zipped)):
+            data = json.loads(body)
+            data["exported_at"] = expected["exported_at"]
+            self.assertEqual(data, expected)
+        self.assertEqual(self.client.get("/api/ideabin/export/", {"encoding": "xml"}).status_code, 400)
+
+    def test_context_export(self):
+        self._add_ideas(4)
+        Idea.objects.create(title="Elsewhere", owner=self.other_user)
+        _, body, _ = self._export(context_id=self.context.id)
+        data = json.loads(body)
+        self.assertEqual(data["context"]["id"], self.context.id)
+        self.assertEqual(len(data["ideas"]), 4)
+        self.assertEqual([c["id"] for c in data["categories"]], [self.category.id])
+        self.assertEqual(data["legend_context_placements"][0]["legend_id"], self.legend.id)
+
+
+# ═══════════════════════════════════════════════
+#  16. IDEABIN IMPORT
+# ═══════════════════════════════════════════════
+
+
+class IdeaBinImportTest(IdeaBinTestBase):
+    def _backup(self, **params):
+        _, body, _ = self._export(encoding="compact", **params)
+        return json.loads(body)
+
+    def _import(self, data, **params):
+        url = "/api/ideabin/import/"
+        if params:
+            url += "?" + "&".join(f"{k}={v}" for k, v in params.items())
+        with CaptureQueriesContext(connection) as ctx:
+            raw = data if isinstance(data, bytes) else json.dumps(data).encode()
+            upload = SimpleUploadedFile("backup.json", raw, "application/json")
+            response = self.client.post(url, {"file": upload}, format="multipart")
+        return response, len(ctx)
+
+    def test_global_round_trip_remaps_ids(self):
+        self._add_ideas(3)
+        IdeaUpvote.objects.create(user=self.user, idea=Idea.objects.first())
+        Formation.objects.create(owner=self.user, context=self.context, name="F", state={
+            "category_positions": {str(self.category.id): {"x": 1}},
+            "active_legend_id": self.legend.id,
+        })
+        backup = self._backup()
+
+        response, _ = self._import(backup)
+        self.assertEqual(response.status_code, 200, response.content)
+        stats = response.json()["stats"]
+        self.assertEqual(stats["entities"]["ideas"], 3)
+        self.assertEqual(stats["entities"]["legend_types"], 2)
+        self.assertEqual(stats["entities"]["upvotes"], 1)
+        self.assertGreater(stats["rows_per_second"], 0)
+
+        category = Category.objects.get(owner=self.user)
+        legend = Legend.objects.get(owner=self.user)
+        self.assertNotEqual(category.id, self.category.id)
+        self.assertEqual(IdeaPlacement.objects.filter(category=category).count(), 1)
+        self.assertEqual(IdeaLegendType.objects.filter(legend=legend, legend_type__legend=legend).count(), 3)
+        state = Formation.objects.get(owner=self.user).state
+        self.assertEqual(state["category_positions"], {str(category.id): {"x": 1}})
+        self.assertEqual(state["active_legend_id"], legend.id)
+        self.assertEqual(CategoryContextPlacement.objects.get(category=category).context.owner, self.user)
+
+    def test_query_count_independent_of_backup_size(self):
+        def import_twice(backup):
+            # the second run replaces data of the same shape as it inserts
+            self._import(backup)
+            return self._import(backup)[1]
+
+        self._add_ideas(2)
+        small_backup = self._backup()
+        self._add_ideas(25)
+        large_backup = self._backup()
+        self.assertEqual(import_twice(small_backup), import_twice(large_backup))
+        self.assertEqual(Idea.objects.filter(owner=self.user).count(), 27)
+
+    def test_context_import_creates_new_context(self):
+        self._add_ideas(2)
+        backup = self._backup(context_id=self.context.id)
+        response, _ = self._import(backup)
+        self.assertEqual(response.status_code, 200, response.content)
+        new_ctx = Context.objects.get(id=response.json()["context_id"])
+        self.assertEqual(new_ctx.legends.count(), 1)
+        self.assertEqual(CategoryContextPlacement.objects.filter(context=new_ctx).count(), 1)
+
+    def test_malformed_rows_rejected_before_writing(self):
+        self._add_ideas(2)
+        backup = self._backup()
+        backup["ideas"][1]["placements"] = [{"order_index": 0}]
+        response, _ = self._import(backup)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("placements", response.json()["error"])
+        self.assertEqual(Idea.objects.filter(owner=self.user).count(), 2)
+
+    def test_stream_import_matches_regular_import(self):
+        self._add_ideas(5)
+        backup = self._backup()
+        regular, _ = self._import(backup)
+        streamed, _ = self._import(backup, stream=1)
+        self.assertEqual(streamed.status_code, 200, streamed.content)
+        self.assertEqual(streamed.json()["stats"]["entities"], regular.json()["stats"]["entities"])
+        self.assertEqual(IdeaPlacement.objects.filter(category__owner=self.user).count(), 2)
+        self.assertEqual(CategoryContextPlacement.objects.filter(context__owner=self.user).count(), 1)
+
+        context_backup = self._backup(context_id=Context.objects.get(owner=self.user).id)
+        response, _ = self._import(context_backup, stream=1)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(Context.objects.get(id=response.json()["context_id"]).legends.count(), 1)
+
+    def test_stream_import_rejects_bad_input_and_rolls_back(self):
+        self._add_ideas(3)
+        raw = json.dumps(self._backup()).encode()
+        truncated = raw[: raw.index(b'"formations"') - 40]
+        response, _ = self._import(truncated, stream=1)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Invalid JSON file", response.json()["error"])
+        self.assertEqual(Idea.objects.filter(owner=self.user).count(), 3)
+
+        backup = self._backup()
+        reordered = {k: backup[k] for k in backup if k != "legends"}
+        reordered["legends"] = backup["legends"]
+        response, _ = self._import(reordered, stream=1)
+        self.assertIn("must come after", response.json()["error"])
+
+    @override_settings(IDEABIN_IMPORT_MAX_BUFFER_BYTES=256)
+    def test_stream_import_memory_ceiling(self):
+        self._add_ideas(1)
+        Idea.objects.update(description="x" * 1000)
+        response, _ = self._import(self._backup(), stream=1)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("memory ceiling", response.json()["error"])
+        self.assertTrue(Idea.objects.filter(owner=self.user).exists())
+
+    def test_stream_import_ceiling_covers_held_sections(self):
+        backup = self._backup()
+        placement = backup["category_context_placements"][0]
+        backup["category_context_placements"] = [placement] * 200
+        row_size = len(json.dumps(placement, separators=(",", ":")))
+        with override_settings(IDEABIN_IMPORT_MAX_BUFFER_BYTES=row_size * 100):
+            response, _ = self._import(backup, stream=1)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("placement sections exceed", response.json()["error"])
+        self.assertTrue(Category.objects.filter(pk=self.category.pk).exists())
+
+
+# ═══════════════════════════════════════════════
+#  17. PROJECT REVISION / CONDITIONAL GET
+# ═══════════════════════════════════════════════
+
+
+class ProjectRevisionTest(APITestBase):
+    ENDPOINTS = ("get_all_milestones", "get_all_dependencies", "fetch_project_tasks", "days", "phases")
+
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(
+            name="Rev", owner=self.user, start_date=date(2025, 1, 1), end_date=date(2025, 1, 5),
+        )
+        self.team = Team.objects.create(name="Core", project=self.project)
+        self.task = Task.objects.create(name="Build", project=self.project, team=self.team)
+
+    def _revision(self):
+        self.project.refresh_from_db()
+        return self.project.revision
+
+    def _url(self, endpoint):
+        return f"/api/projects/{self.project.id}/{endpoint}/"
+
+    def test_get_endpoints_answer_304_without_serializing(self):
+        for endpoint in self.ENDPOINTS:
+            response = self.client.get(self._url(endpoint))
+            self.assertEqual(response.status_code, 200, endpoint)
+            etag = response["ETag"]
+            with self.assertNumQueries(1):
+                cached = self.client.get(self._url(endpoint), HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(cached.status_code, 304, endpoint)
+            self.assertEqual(cached["ETag"], etag)
+
+    def test_writes_bump_revision(self):
+        etag = self.client.get(self._url("get_all_milestones"))["ETag"]
+        start = self._revision()
+
+        self.client.post(self._url("add_milestone"), {"task_id": self.task.id}, format="json")
+        self.assertEqual(self._revision(), start + 1)
+        self.client.patch(f"/api/projects/{self.project.id}/tasks/{self.task.id}/detail/", {"name": "X"}, format="json")
+        self.assertEqual(self._revision(), start + 2)
+
+        fresh = self.client.get(self._url("get_all_milestones"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(fresh.status_code, 200)
+        self.assertNotEqual(fresh["ETag"], etag)
+
+    def test_rejected_writes_and_reads_leave_revision_alone(self):
+        start = self._revision()
+        self.client.get(self._url("get_all_milestones"))
+        self._get_other_client().post(self._url("add_milestone"), {"task_id": self.task.id}, format="json")
+        self.assertEqual(self._revision(), start)
+
+    def test_read_only_and_failed_posts_leave_revision_alone(self):
+        milestone = Milestone.objects.create(name="M", project=self.project, task=self.task, start_index=0)
+        start = self._revision()
+        requests = [
+            ("schedule_risk", {"samples": 10, "seed": 1}, 200),
+            ("validate_dates", {"start_date": "2025-01-01", "end_date": "2025-01-03"}, 200),
+            ("bulk_update_start_index", {"moves": [{"milestone_id": milestone.id, "index": 2}], "dry_run": True}, 200),
+            ("bulk_update_start_index", {"moves": [{"milestone_id": milestone.id, "index": 99}]}, 400),
+            ("add_milestone", {}, 400),
+        ]
+        for endpoint, body, expected in requests:
+            method = self.client.patch if endpoint == "bulk_update_start_index" else self.client.post
+            self.assertEqual(method(self._url(endpoint), body, format="json").status_code, expected, endpoint)
+        self.assertEqual(self._revision(), start)
+
+    def test_untracked_writes_still_bump_revision(self):
+        start = self._revision()
+        self.client.patch(f"/api/projects/{self.project.id}/update/", {"name": "Renamed"}, format="json")
+        self.assertEqual(self._revision(), start + 1)
+        self.client.post(self._url("views/set-default"), {"view_id": None}, format="json")
+        self.assertEqual(self._revision(), start + 2)
+
+
+# ═══════════════════════════════════════════════════════
+#  18. CHANGE FEED
+# ═══════════════════════════════════════════════════════
+
+class ProjectChangesTest(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(
+            name="Feed", owner=self.user, start_date=date(2025, 1, 1), end_date=date(2025, 1, 10),
+        )
+        self.team = Team.objects.create(name="Core", project=self.project)
+        self.task = Task.objects.create(name="Build", project=self.project, team=self.team)
+        self.milestone = Milestone.objects.create(name="M1", project=self.project, task=self.task)
+        self.base = f"/api/projects/{self.project.id}"
+
+    def _revision(self):
+        self.project.refresh_from_db()
+        return self.project.revision
+
+    def _changes(self, since, **extra):
+        return self.client.get(f"{self.base}/changes/", {"since": since}, **extra)
+
+    def test_reports_created_updated_and_deleted_rows(self):
+        since = self._revision()
+        created = self.client.post(f"{self.base}/add_milestone/", {"task_id": self.task.id}, format="json")
+        new_id = created.data["added_milestone"]["id"]
+        self.client.patch(f"{self.base}/update_start_index/", {"milestone_id": self.milestone.id, "index": 3}, format="json")
+        doomed = Milestone.objects.create(name="Gone", project=self.project, task=self.task)
+        self.client.delete(f"{self.base}/delete_milestones/", {"id": doomed.id}, format="json")
+
+        response = self._changes(since)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["revision"], since + 3)
+        milestones = response.data["changes"]["milestones"]
+        self.assertEqual([m["id"] for m in milestones["created"]], [new_id])
+        self.assertEqual([m["id"] for m in milestones["updated"]], [self.milestone.id])
+        self.assertEqual(milestones["updated"][0]["start_index"], 3)
+        self.assertEqual(milestones["deleted"], [doomed.id])
+
+        listed = self.client.get(f"{self.base}/get_all_milestones/").data["milestones"]
+        self.assertIn(milestones["created"][0], listed)
+
+    def test_only_changes_after_since_are_returned(self):
+        self.client.patch(f"{self.base}/update_start_index/", {"milestone_id": self.milestone.id, "index": 2}, format="json")
+        since = self._revision()
+        self.client.patch(f"{self.base}/reorder_team_tasks/", {
+            "task_id": self.task.id, "target_team_id": self.team.id, "order": [self.task.id],
+        }, format="json")
+
+        changes = self._changes(since).data["changes"]
+        self.assertNotIn("milestones", changes)
+        self.assertEqual([t["id"] for t in changes["tasks"]["updated"]], [self.task.id])
+
+        self.assertEqual(self._changes(self._revision()).data["changes"], {})
+
+    def test_created_then_deleted_row_is_omitted(self):
+        since = self._revision()
+        created = self.client.post(f"{self.base}/add_milestone/", {"task_id": self.task.id}, format="json")
+        self.client.delete(f"{self.base}/delete_milestones/", {"id": created.data["added_milestone"]["id"]}, format="json")
+
+        milestones = self._changes(since).data["changes"].get("milestones", {})
+        self.assertEqual(milestones.get("created", []), [])
+        self.assertEqual(milestones.get("deleted", []), [])
+
+    def test_toggling_todos_reports_the_milestone(self):
+        MilestoneTodo.objects.create(milestone=self.milestone, title="t", done=True)
+        since = self._revision()
+        self.client.patch(f"{self.base}/toggle_milestone_done/", {"milestone_id": self.milestone.id}, format="json")
+        updated = self._changes(since).data["changes"]["milestones"]["updated"]
+        self.assertEqual([m["id"] for m in updated], [self.milestone.id])
+        self.assertFalse(updated[0]["is_done"])
+
+    def test_invalid_since_is_rejected(self):
+        for since in ("", "abc", "-1", str(self._revision() + 5)):
+            self.assertEqual(self._changes(since).status_code, 400, since)
+
+    def test_restore_resets_the_log(self):
+        snapshot_id = self.client.post(f"{self.base}/snapshots/create/", {"name": "v1"}, format="json").data["snapshot"]["id"]
+        since = self._revision()
+        self.client.post(f"{self.base}/snapshots/{snapshot_id}/restore/")
+
+        gone = self._changes(since)
+        self.assertEqual(gone.status_code, 410)
+        self.assertEqual(gone.data["revision"], self._revision())
+        self.assertEqual(self._changes(self._revision()).status_code, 200)
+
+    @override_settings(PROJECT_CHANGE_LOG_COMPACT_EVERY=0)
+    def test_compaction_keeps_latest_entry_and_raises_floor(self):
+        since = self._revision()
+        for index in range(1, 6):
+            self.client.patch(f"{self.base}/update_start_index/", {"milestone_id": self.milestone.id, "index": index}, format="json")
+        self.assertEqual(ProjectChange.objects.filter(project=self.project).count(), 5)
+
+        out = StringIO()
+        call_command("compact_project_changes", "--project", str(self.project.id), "--keep", "2", stdout=out)
+        self.assertIn("removed 4 entries", out.getvalue())
+        self.assertEqual(ProjectChange.objects.filter(project=self.project).count(), 1)
+
+        self.assertEqual(self._changes(since).status_code, 410)
+        recent = self._changes(self._revision() - 2)
+        self.assertEqual(recent.status_code, 200)
+        self.assertEqual(recent.data["changes"]["milestones"]["updated"][0]["start_index"], 5)
+
+    def test_compaction_preserves_every_since_answer(self):
+        since = self._revision()
+        created = self.client.post(f"{self.base}/add_milestone/", {"task_id": self.task.id}, format="json")
+        new_id = created.data["added_milestone"]["id"]
+        doomed = self.client.post(f"{self.base}/add_milestone/", {"task_id": self.task.id}, format="json")
+        doomed_id = doomed.data["added_milestone"]["id"]
+        for index in range(1, 4):
+            for milestone_id in (new_id, doomed_id, self.milestone.id):
+                self.client.patch(
+                    f"{self.base}/update_start_index/", {"milestone_id": milestone_id, "index": index}, format="json",
+                )
+        self.client.delete(f"{self.base}/delete_milestones/", {"id": doomed_id}, format="json")
+        revisions = range(since, self._revision() + 1)
+
+        before = [self._changes(revision).data["changes"] for revision in revisions]
+        ProjectChange.compact(self.project.id, keep_revisions=1000)
+        self.assertLess(ProjectChange.objects.filter(project=self.project).count(), 13)
+        after = [self._changes(revision).data["changes"] for revision in revisions]
+        self.assertEqual(after, before)
+        self.assertEqual([m["id"] for m in after[0]["milestones"]["created"]], [new_id])
+
+    def test_requires_project_access(self):
+        response = self._get_other_client().get(f"{self.base}/changes/", {"since": 0})
+        self.assertEqual(response.status_code, 403)
+
+
+# ═══════════════════════════════════════════════════════
+#  19. LIVE EVENTS
+# ═══════════════════════════════════════════════════════
+
+@override_settings(
+    PROJECT_EVENTS_BACKEND="api.events.LocalBackend",
+    PROJECT_EVENTS_HEARTBEAT_SECONDS=0.01,
+    PROJECT_EVENTS_STREAM_SECONDS=5,
+    PROJECT_EVENTS_MAX_PENDING=3,
+)
+class ProjectEventsTest(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(name="Live", owner=self.user)
+        self.team = Team.objects.create(name="Core", project=self.project)
+        self.task = Task.objects.create(name="Build", project=self.project, team=self.team)
+        self.milestone = Milestone.objects.create(name="M1", project=self.project, task=self.task)
+        self.base = f"/api/projects/{self.project.id}"
+
+    def _revision(self):
+        self.project.refresh_from_db()
+        return self.project.revision
+
+    def _open(self, **extra):
+        response = self.client.get(f"{self.base}/events/", HTTP_ACCEPT="text/event-stream", **extra)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = iter(response.streaming_content)
+        self.assertTrue(next(stream).startswith(b"retry:"))
+        self.addCleanup(response.close)
+        return stream
+
+    def _next_event(self, stream):
+        for chunk in stream:
+            if not chunk.startswith(b":"):
+                lines = dict(line.split(": ", 1) for line in chunk.decode().strip().split("\n"))
+                return lines.get("id"), lines["event"], json.loads(lines["data"])
+
+    def _move(self, index):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                f"{self.base}/update_start_index/", {"milestone_id": self.milestone.id, "index": index}, format="json",
+            )
+
+    def test_pushes_committed_writes(self):
+        stream = self._open()
+        self._move(4)
+        event_id, kind, data = self._next_event(stream)
+        self.assertEqual((event_id, kind), (str(self._revision()), "change"))
+        self.assertEqual(data["changes"], {"milestones": {"updated": [self.milestone.id]}})
+
+    def test_reconnect_replays_missed_revisions(self):
+        since = self._revision()
+        self._move(1)
+        self._move(2)
+        stream = self._open(HTTP_LAST_EVENT_ID=str(since))
+        self.assertEqual(self._next_event(stream)[0], str(since + 1))
+        self.assertEqual(self._next_event(stream)[0], str(since + 2))
+
+        # live events already covered by the replay are not sent twice
+        self._move(3)
+        self.assertEqual(self._next_event(stream)[0], str(since + 3))
+
+    def test_reconnect_past_the_log_gets_reset(self):
+        self._move(1)
+        ProjectChange.reset(self.project.id, self._revision())
+        stream = self._open(HTTP_LAST_EVENT_ID="0")
+        self.assertEqual(self._next_event(stream)[1], "reset")
+
+    def test_idle_stream_sends_heartbeats(self):
+        stream = self._open()
+        self.assertEqual(next(stream), b": heartbeat\n\n")
+
+    def test_slow_client_is_told_to_resync(self):
+        stream = self._open()
+        broker = get_broker()
+        for revision in range(1, 6):
+            broker.deliver(self.project.id, change_event(revision, {("milestones", 1): "updated"}))
+        event_id, kind, data = self._next_event(stream)
+        self.assertEqual(kind, "resync")
+        self.assertEqual(data["since"], 0)
+
+    def test_closing_the_stream_unsubscribes(self):
+        response = self.client.get(f"{self.base}/events/", HTTP_ACCEPT="text/event-stream")
+        next(iter(response.streaming_content))
+        self.assertIn(self.project.id, get_broker()._subscriptions)
+        response.close()
+        self.assertNotIn(self.project.id, get_broker()._subscriptions)
+
+    def test_rejects_bad_last_event_id_and_outsiders(self):
+        response = self.client.get(f"{self.base}/events/", HTTP_ACCEPT="text/event-stream", HTTP_LAST_EVENT_ID="x")
+        self.assertEqual(response.status_code, 400)
+        response = self._get_other_client().get(f"{self.base}/events/", HTTP_ACCEPT="text/event-stream")
+        self.assertEqual(response.status_code, 403)
+
+    def test_change_log_backend_delivers_writes_from_other_processes(self):
+        with mock.patch.object(ChangeLogBackend, "_start"):
+            backend = ChangeLogBackend()
+            broker = ProjectEventBroker(backend, max_pending=10)
+            subscription = broker.subscribe(self.project.id, self._revision())
+        self._move(2)
+        backend.poll()
+        event = subscription.get(timeout=0)
+        self.assertEqual(event["id"], self._revision())
+        self.assertEqual(event["data"]["changes"], {"milestones": {"updated": [self.milestone.id]}})
+        backend.poll()
+        self.assertIsNone(subscription.get(timeout=0))
+
+
+# ═══════════════════════════════════════════════════════
+#  20. PROJECT BOOTSTRAP
+# ═══════════════════════════════════════════════════════
+
+class ProjectBootstrapTest(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(
+            name="Boot", owner=self.user, start_date=date(2025, 1, 3), end_date=date(2025, 1, 12),
+        )
+        self.project.members.add(self.other_user)
+        Day.objects.create(
+            project=self.project, date=date(2025, 1, 5), day_index=2, purpose="Holiday", is_blocked=True, purpose_teams=[1],
+        )
+        self.base = f"/api/projects/{self.project.id}"
+        self._populate(3)
+
+    def _populate(self, count):
+        legend = TaskLegend.objects.create(project=self.project, owner=self.user, name="Risk")
+        legend_type = TaskLegendType.objects.create(legend=legend, name="High", color="#f00")
+        for n in range(count):
+            team = Team.objects.create(name=f"T{n}", project=self.project, order_index=n)
+            team.members.add(self.user)
+            task = Task.objects.create(name=f"Task{n}", project=self.project, team=team, order_index=n)
+            task.assigned_members.add(self.user)
+            AcceptanceCriterion.objects.create(task=task, title="c", done=True)
+            TaskLegendAssignment.objects.create(task=task, legend=legend, legend_type=legend_type)
+            first = Milestone.objects.create(name=f"A{n}", project=self.project, task=task, start_index=n)
+            second = Milestone.objects.create(name=f"B{n}", project=self.project, task=task, start_index=n + 1)
+            MilestoneTodo.objects.create(milestone=first, title="todo")
+            Dependency.objects.create(source=first, target=second)
+            Phase.objects.create(project=self.project, name=f"P{n}", start_index=n * 3, duration=2)
+        self.client.post(f"{self.base}/views/create/", {"name": f"V{count}", "state": {"zoom": 1}}, format="json")
+
+    def _get(self, path, **params):
+        response = self.client.get(f"{self.base}/{path}/", params)
+        self.assertEqual(response.status_code, 200, path)
+        return json.loads(response.content)
+
+    def test_sections_match_the_individual_endpoints(self):
+        boot = self._get("bootstrap")
+        self.assertEqual(boot["project"], self._get("get_project_details")["project"])
+        self.assertEqual(boot["teams"], self._get("fetch_project_teams")["teams"])
+        tasks = self._get("fetch_project_tasks")
+        self.assertEqual(boot["tasks"], tasks["tasks"])
+        self.assertEqual(boot["taskOrder"], tasks["taskOrder"])
+        self.assertEqual(boot["milestones"], self._get("get_all_milestones")["milestones"])
+        self.assertEqual(boot["dependencies"], self._get("get_all_dependencies")["dependencies"])
+        self.assertEqual(boot["days"], self._get("days")["days_list"])
+        self.assertEqual(boot["phases"], self._get("phases")["phases"])
+        self.assertEqual(boot["views"], self._get("views")["views"])
+        self.project.refresh_from_db()
+        self.assertEqual(boot["revision"], self.project.revision)
+
+    def test_include_limits_sections(self):
+        boot = self._get("bootstrap", include="tasks,phases")
+        self.assertEqual(set(boot), {"revision", "tasks", "taskOrder", "phases"})
+        response = self.client.get(f"{self.base}/bootstrap/", {"include": "tasks,nope"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_query_count_is_flat(self):
+        with CaptureQueriesContext(connection) as small:
+            self._get("bootstrap")
+        self._populate(10)
+        with CaptureQueriesContext(connection) as large:
+            self._get("bootstrap")
+        self.assertEqual(len(small), len(large))
+
+    def test_requires_project_access(self):
+        outsider = User.objects.create_user(username="outsider", password="x")
+        client = APIClient()
+        client.force_authenticate(user=outsider)
+        self.assertEqual(client.get(f"{self.base}/bootstrap/").status_code, 403)
+
+
+# ═══════════════════════════════════════════════════════
+#  21. VIRTUAL DAYS
+# ═══════════════════════════════════════════════════════
+
+class VirtualDaysTest(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(
+            name="Cal", owner=self.user, start_date=date(2025, 1, 1), end_date=date(2025, 1, 31),
+        )
+        self.base = f"/api/projects/{self.project.id}"
+
+    def test_listing_days_writes_nothing(self):
+        Day.objects.create(project=self.project, date=date(2025, 1, 5), day_index=4, purpose="Sprint", color="#0f0")
+        with self.assertNumQueries(2):  # access check + overrides
+            response = self.client.get(f"{self.base}/days/")
+        self.assertEqual(Day.objects.filter(project=self.project).count(), 1)
+        self.assertEqual(response.data["total_days"], 31)
+
+        days = response.data["days_list"]
+        self.assertEqual([d["day_index"] for d in days], list(range(31)))
+        self.assertEqual((days[4]["purpose"], days[4]["color"]), ("Sprint", "#0f0"))
+        self.assertEqual([d["id"] for d in days], list(range(31)))
+        self.assertEqual(days[5]["date"], "2025-01-06")
+        self.assertEqual(days[5]["project"], self.project.id)
+
+    def test_computed_day_serializes_like_a_stored_one(self):
+        computed = self.project.get_day(10)
+        stored = Day.objects.create(project=self.project, date=date(2025, 1, 11), day_index=10)
+        self.assertEqual(dict(DaySerializer(computed).data), dict(DaySerializer(stored).data))
+        self.assertEqual(DaySerializer(computed).data["id"], 10)
+
+    def test_edits_store_and_clear_overrides(self):
+        response = self.client.patch(f"{self.base}/days/6/", {"is_blocked": True}, format="json")
+        self.assertTrue(response.data["day"]["is_blocked"])
+        day = Day.objects.get(project=self.project)
+        self.assertEqual((day.day_index, day.date), (6, date(2025, 1, 7)))
+
+        self.client.post(f"{self.base}/days/set_purpose/", {"day_index": 6, "purpose": "Offsite"}, format="json")
+        self.client.patch(f"{self.base}/days/6/", {"is_blocked": False}, format="json")
+        self.assertEqual(Day.objects.get(project=self.project).purpose, "Offsite")
+
+        self.client.post(f"{self.base}/days/set_purpose/", {"day_index": 6, "purpose": ""}, format="json")
+        self.assertFalse(Day.objects.filter(project=self.project).exists())
+        self.assertEqual(self.client.patch(f"{self.base}/days/31/", {"is_blocked": True}, format="json").status_code, 404)
+
+    def test_date_change_costs_overrides_not_days(self):
+        for day in (2, 10, 28):
+            Day.objects.create(project=self.project, date=date(2025, 1, day), day_index=day - 1, is_blocked=True)
+        Project.objects.filter(pk=self.project.pk).update(start_date=date(2025, 1, 5), end_date=date(2030, 1, 1))
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(f"{self.base}/sync_days/")
+        self.assertLess(len(ctx), 20)  # ~1800 days: nothing per day
+        self.assertEqual(response.data["deleted"], 1)
+        self.assertEqual(
+            sorted(Day.objects.filter(project=self.project).values_list("day_index", flat=True)), [5, 23],
+        )
+        days = self.client.get(f"{self.base}/days/").data["days_list"]
+        self.assertTrue(days[5]["is_blocked"] and days[23]["is_blocked"])
+        self.assertEqual(len(days), (date(2030, 1, 1) - date(2025, 1, 5)).days + 1)
+
+
+# ═══════════════════════════════════════════════════════
+#  22. DATE RANGE CHECKS
+# ═══════════════════════════════════════════════════════
+
+class DateRangeValidationTest(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(
+            name="Range", owner=self.user, start_date=date(2025, 1, 1), end_date=date(2025, 1, 31),
+        )
+        self.task = Task.objects.create(name="Build", project=self.project)
+        self.fits = Milestone.objects.create(name="Fits", project=self.project, task=self.task, start_index=0, duration=10)
+        self.overruns = Milestone.objects.create(name="Overruns", project=self.project, task=self.task, start_index=8, duration=5)
+        self.starts_after = Milestone.objects.create(name="Late", project=self.project, task=self.task, start_index=20)
+        self.url = f"/api/projects/{self.project.id}/validate_dates/"
+
+    def test_reports_out_of_range_milestones_in_one_query(self):
+        for n in range(30):
+            Milestone.objects.create(name=f"X{n}", project=self.project, task=Task.objects.create(name=f"T{n}", project=self.project))
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(self.url, {"start_date": "2025-01-01", "end_date": "2025-01-10"}, format="json")
+        self.assertEqual(sum('"api_milestone"' in q["sql"] for q in ctx.captured_queries), 1)
+        self.assertFalse(response.data["valid"])
+        self.assertEqual(response.data["new_days_count"], 10)
+        self.assertEqual(response.data["milestones_out_of_range"], [
+            {"id": self.overruns.id, "name": "Overruns", "task_name": "Build", "start_index": 8,
+             "duration": 5, "end_index": 12, "required_days": 13},
+            {"id": self.starts_after.id, "name": "Late", "task_name": "Build", "start_index": 20,
+             "duration": 1, "end_index": 20, "required_days": 21},
+        ])
+
+    def test_valid_range(self):
+        response = self.client.post(self.url, {"start_date": "2025-01-01", "end_date": "2025-01-21"}, format="json")
+        self.assertTrue(response.data["valid"])
+
+    def test_date_change_uses_the_same_check(self):
+        Day.objects.create(project=self.project, date=date(2025, 1, 30), day_index=29, is_blocked=True)
+        result = self.project.update_days_on_date_change(
+            self.project.start_date, self.project.end_date, date(2025, 1, 1), date(2025, 1, 13),
+        )
+        self.assertFalse(result["success"])
+        self.assertEqual([m["id"] for m in result["milestones_out_of_range"]], [self.starts_after.id])
+
+        self.starts_after.delete()
+        result = self.project.update_days_on_date_change(
+            self.project.start_date, self.project.end_date, date(2025, 1, 1), date(2025, 1, 15),
+        )
+        self.assertTrue(result["success"])
+        self.assertEqual(result["deleted"], 1)
+
+
+# ═══════════════════════════════════════════════════════
+#  23. DEPENDENCY GRAPH
+# ═══════════════════════════════════════════════════════
+
+class DependencyGraphTest(APITestBase):
+    def setUp(self):
+        super().setUp()
+        dependency_graph._cache.clear()
+        self.addCleanup(dependency_graph._cache.clear)
+        self.project = Project.objects.create(name="Graph", owner=self.user)
+        task = Task.objects.create(name="Plan", project=self.project)
+        self.a, self.b, self.c, self.d = (
+            Milestone.objects.create(name=name, project=self.project, task=task, start_index=i * 2)
+            for i, name in enumerate("ABCD")
+        )
+        Dependency.objects.create(source=self.a, target=self.b)
+        Dependency.objects.create(source=self.b, target=self.c)
+        self.base = f"/api/projects/{self.project.id}"
+
+    def test_longer_cycle_is_rejected_with_its_path(self):
+        response = self.client.post(
+            f"{self.base}/create_dependency/",
+            {"source": self.c.id, "target": self.a.id, "weight": "suggestion"}, format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["cycle"], [self.c.id, self.a.id, self.b.id, self.c.id])
+        self.assertFalse(Dependency.objects.filter(source=self.c, target=self.a).exists())
+
+        response = self.client.post(f"{self.base}/create_dependency/", {"source": self.c.id, "target": self.d.id}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_lineage(self):
+        Dependency.objects.create(source=self.c, target=self.d)
+        response = self.client.get(f"{self.base}/milestones/{self.b.id}/lineage/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            "milestone": self.b.id, "ancestors": [self.a.id], "descendants": [self.c.id, self.d.id],
+        })
+
+        elsewhere = Project.objects.create(name="X", owner=self.user)
+        other = Milestone.objects.create(name="Elsewhere", project=elsewhere, task=Task.objects.create(name="T", project=elsewhere))
+        response = self.client.get(f"{self.base}/milestones/{other.id}/lineage/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_topological_order(self):
+        graph = dependency_graph.DependencyGraph([1, 2, 3, 4], [(3, 1, "strong"), (1, 2, "strong"), (4, 2, "weak")])
+        order = graph.topological_order()
+        for source, target in [(3, 1), (1, 2), (4, 2)]:
+            self.assertLess(order.index(source), order.index(target))
+
+        cyclic = dependency_graph.DependencyGraph([1, 2, 3, 4], [(1, 2, "strong"), (2, 3, "strong"), (3, 2, "strong")])
+        with self.assertRaises(dependency_graph.DependencyCycleError) as raised:
+            cyclic.topological_order()
+        self.assertEqual(raised.exception.milestone_ids, [2, 3])
+
+    def test_graph_is_cached_per_revision_and_invalidated_on_writes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first = dependency_graph.get_dependency_graph(self.project)
+        with self.assertNumQueries(0):
+            self.assertIs(dependency_graph.get_dependency_graph(self.project), first)
+
+        Dependency.objects.create(source=self.c, target=self.d)
+        with self.captureOnCommitCallbacks(execute=True):
+            second = dependency_graph.get_dependency_graph(self.project)
+        self.assertIsNot(second, first)
+        self.assertEqual(second.descendants(self.a.id), [self.b.id, self.c.id, self.d.id])
+
+        # another worker's write shows up as a new revision
+        self.project.revision += 1
+        self.assertIsNot(dependency_graph.get_dependency_graph(self.project), second)
+
+
+# ═══════════════════════════════════════════════════════
+#  24. CRITICAL PATH
+# ═══════════════════════════════════════════════════════
+
+class CriticalPathTest(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(name="CPM", owner=self.user)
+        self.task = Task.objects.create(name="Build", project=self.project)
+        self.deadline_task = Task.objects.create(name="Fixed", project=self.project)
+
+        def milestone(name, start_index, duration, task=self.task):
+            return Milestone.objects.create(name=name, project=self.project, task=task, start_index=start_index, duration=duration)
+
+        self.a = milestone("A", 0, 2)
+        self.b = milestone("B", 2, 3)
+        self.c = milestone("C", 2, 1, self.deadline_task)
+        self.d = milestone("D", 5, 1)
+        self.e = milestone("E", 0, 1)
+        for source, target, weight in [(self.a, self.b, "strong"), (self.a, self.c, "weak"), (self.b, self.d, "strong"),
+                                       (self.c, self.d, "strong"), (self.e, self.a, "suggestion")]:
+            Dependency.objects.create(source=source, target=target, weight=weight)
+        self.url = f"/api/projects/{self.project.id}/critical_path/"
+
+    def _rows(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data, {row["id"]: row for row in response.data["milestones"]}
+
+    def test_forward_and_backward_pass(self):
+        data, rows = self._rows()
+        self.assertEqual(data["finish"], 5)
+        self.assertEqual(data["critical_path"], [self.a.id, self.b.id, self.d.id])
+        self.assertEqual(rows[self.d.id], {
+            "id": self.d.id, "start_index": 5, "earliest_start": 5, "earliest_finish": 5, "latest_start": 5,
+            "latest_finish": 5, "slack": 0, "critical": True, "driving_predecessor": self.b.id,
+        })
+        self.assertEqual((rows[self.c.id]["earliest_start"], rows[self.c.id]["latest_start"]), (2, 4))
+        self.assertEqual(rows[self.c.id]["slack"], 2)
+        # the suggestion edge E -> A doesn't hold A back or pull E forward
+        self.assertEqual(rows[self.a.id]["driving_predecessor"], None)
+        self.assertEqual(rows[self.e.id]["slack"], 5)
+
+    def test_planned_starts_are_respected(self):
+        Milestone.objects.filter(pk=self.b.pk).update(start_index=5)
+        data, rows = self._rows()
+        self.assertEqual(data["finish"], 8)
+        self.assertEqual(data["critical_path"], [self.b.id, self.d.id])
+        self.assertEqual((rows[self.b.id]["earliest_start"], rows[self.b.id]["driving_predecessor"]), (5, None))
+        self.assertEqual((rows[self.d.id]["earliest_start"], rows[self.d.id]["driving_predecessor"]), (8, self.b.id))
+        self.assertEqual((rows[self.a.id]["latest_start"], rows[self.a.id]["slack"]), (3, 3))
+        self.assertEqual(rows[self.c.id]["slack"], 5)
+
+    def test_late_plan_shifts_the_whole_chain(self):
+        Milestone.objects.filter(pk=self.a.pk).update(start_index=10)
+        Milestone.objects.filter(pk=self.b.pk).update(start_index=20)
+        data, rows = self._rows()
+        self.assertEqual((rows[self.a.id]["earliest_start"], rows[self.b.id]["earliest_start"]), (10, 20))
+        self.assertEqual((rows[self.c.id]["earliest_start"], rows[self.d.id]["earliest_start"]), (12, 23))
+        self.assertEqual(data["finish"], 23)
+
+    def test_hard_deadline_caps_latest_finish(self):
+        self.deadline_task.hard_deadline = 1
+        self.deadline_task.save()
+        data, rows = self._rows()
+        self.assertEqual(rows[self.c.id]["latest_finish"], 1)
+        self.assertEqual(rows[self.c.id]["slack"], -1)
+        self.assertEqual(rows[self.a.id]["slack"], -1)
+        self.assertEqual(data["critical_path"], [self.a.id, self.c.id])
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command("benchmark_schedule", milestones=500, repeat=1, stdout=out)
+        self.assertIn("500 milestones", out.getvalue())
+
+
+# ═══════════════════════════════════════════════════════
+#  25. CASCADE MOVES
+# ═══════════════════════════════════════════════════════
+
+class CascadeMoveTest(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(
+            name="Cascade", owner=self.user, start_date=date(2025, 1, 1), end_date=date(2025, 1, 31),
+        )
+        self.task = Task.objects.create(name="Build", project=self.project)
+        self.a = Milestone.objects.create(name="A", project=self.project, task=self.task, start_index=0, duration=2)
+        self.b = Milestone.objects.create(name="B", project=self.project, task=self.task, start_index=2, duration=2)
+        self.c = Milestone.objects.create(name="C", project=self.project, task=self.task, start_index=4)
+        self.d = Milestone.objects.create(name="D", project=self.project, task=self.task, start_index=4)
+        self.e = Milestone.objects.create(name="E", project=self.project, task=self.task, start_index=0)
+        Dependency.objects.create(source=self.a, target=self.b)
+        Dependency.objects.create(source=self.b, target=self.c, weight="weak")
+        Dependency.objects.create(source=self.b, target=self.d, weight="suggestion")
+        self.base = f"/api/projects/{self.project.id}"
+
+    def _starts(self):
+        return dict(Milestone.objects.filter(project=self.project).values_list("name", "start_index"))
+
+    def test_single_move_pushes_dependents_in_one_update(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.patch(
+                f"{self.base}/update_start_index/",
+                {"milestone_id": self.a.id, "index": 1, "cascade": True}, format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["moves"], [
+            {"milestone_id": self.a.id, "index": 1, "previous_index": 0},
+            {"milestone_id": self.b.id, "index": 3, "previous_index": 2},
+            {"milestone_id": self.c.id, "index": 5, "previous_index": 4},
+        ])
+        self.assertEqual(self._starts(), {"A": 1, "B": 3, "C": 5, "D": 4, "E": 0})
+        updates = [q for q in ctx.captured_queries if q["sql"].startswith('UPDATE "api_milestone"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(
+            set(ProjectChange.objects.filter(project=self.project, entity="milestones").values_list("entity_id", flat=True)),
+            {self.a.id, self.b.id, self.c.id},
+        )
+
+    def test_without_cascade_only_the_dragged_milestone_moves(self):
+        self.client.patch(f"{self.base}/update_start_index/", {"milestone_id": self.a.id, "index": 1}, format="json")
+        self.assertEqual(self._starts(), {"A": 1, "B": 2, "C": 4, "D": 4, "E": 0})
+
+    def test_cascade_flag_is_parsed_strictly(self):
+        move = {"milestone_id": self.a.id, "index": 1}
+        self.client.patch(f"{self.base}/update_start_index/", {**move, "cascade": "false"}, format="json")
+        self.assertEqual(self._starts(), {"A": 1, "B": 2, "C": 4, "D": 4, "E": 0})
+        response = self.client.patch(
+            f"{self.base}/bulk_update_start_index/", {"moves": [{**move, "index": 2}], "cascade": "0"}, format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.patch(
+            f"{self.base}/bulk_update_start_index/", {"moves": [{**move, "index": 2}], "cascade": "1"}, format="json",
+        )
+        self.assertEqual(self._starts(), {"A": 2, "B": 4, "C": 6, "D": 4, "E": 0})
+        self.client.patch(f"{self.base}/update_start_index/", {**move, "index": 3, "cascade": 1}, format="json")
+        self.assertEqual(self._starts(), {"A": 3, "B": 5, "C": 7, "D": 4, "E": 0})
+
+        for value in ("yes", 2):
+            response = self.client.patch(f"{self.base}/update_start_index/", {**move, "cascade": value}, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, value)
+            self.assertEqual(response.data["detail"], "cascade must be true or false")
+        self.assertEqual(self._starts()["A"], 3)
+
+    def test_bulk_cascade_skips_blocked_days(self):
+        Day.objects.create(project=self.project, date=date(2025, 1, 6), day_index=5, is_blocked=True)
+        response = self.client.patch(f"{self.base}/bulk_update_start_index/", {
+            "moves": [{"milestone_id": self.a.id, "index": 1}, {"milestone_id": self.e.id, "index": 3}],
+            "cascade": True,
+        }, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["updated"], 4)
+        self.assertEqual(self._starts(), {"A": 1, "B": 3, "C": 6, "D": 4, "E": 3})
+
+    def test_hard_deadline_blocks_the_whole_cascade(self):
+        deadline_task = Task.objects.create(name="Fixed", project=self.project, hard_deadline=4)
+        Milestone.objects.filter(pk=self.c.pk).update(task=deadline_task)
+        response = self.client.patch(
+            f"{self.base}/update_start_index/",
+            {"milestone_id": self.a.id, "index": 1, "cascade": True}, format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            [(v["type"], v["milestone_id"]) for v in response.data["violations"]], [("hard_deadline", self.c.id)],
+        )
+        self.assertEqual(self._starts(), {"A": 0, "B": 2, "C": 4, "D": 4, "E": 0})
+
+
+# ═══════════════════════════════════════════════════════
+#  26. MOVE VALIDATION
+# ═══════════════════════════════════════════════════════
+
+class MoveValidationTest(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(
+            name="Moves", owner=self.user, start_date=date(2025, 1, 1), end_date=date(2025, 1, 10),
+        )
+        self.task = Task.objects.create(name="Build", project=self.project)
+        self.a = Milestone.objects.create(name="A", project=self.project, task=self.task, start_index=0, duration=2)
+        self.b = Milestone.objects.create(name="B", project=self.project, task=self.task, start_index=3, duration=2)
+        self.c = Milestone.objects.create(name="C", project=self.project, task=self.task, start_index=6)
+        Dependency.objects.create(source=self.a, target=self.b)
+        Dependency.objects.create(source=self.b, target=self.c, weight="weak")
+        self.url = f"/api/projects/{self.project.id}/bulk_update_start_index/"
+
+    def _move(self, moves, **flags):
+        return self.client.patch(
+            self.url, {"moves": [{"milestone_id": m.id, "index": i} for m, i in moves], **flags}, format="json",
+        )
+
+    def _starts(self):
+        return dict(Milestone.objects.filter(project=self.project).values_list("name", "start_index"))
+
+    def test_moves_are_checked_together(self):
+        # moved one at a time, A -> 2 would collide with B; together they're fine
+        response = self._move([(self.a, 2), (self.b, 4)])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["updated"], 2)
+        self.assertEqual(self._starts(), {"A": 2, "B": 4, "C": 6})
+
+    def test_every_violation_is_reported(self):
+        deadline_task = Task.objects.create(name="Fixed", project=self.project, hard_deadline=5)
+        Milestone.objects.filter(pk=self.b.pk).update(task=deadline_task)
+        response = self._move([(self.a, 2), (self.b, 5), (self.c, 5)])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            sorted((v["type"], v["milestone_id"]) for v in response.data["violations"]),
+            [("dependency", self.c.id), ("hard_deadline", self.b.id)],
+        )
+
+        response = self._move([(self.c, 9), (self.a, -1)])
+        self.assertEqual(
+            sorted(v["type"] for v in response.data["violations"]), ["before_start"],
+        )
+        response = self._move([(self.c, 10)])
+        self.assertEqual([v["type"] for v in response.data["violations"]], ["out_of_range"])
+        self.assertEqual(self._starts(), {"A": 0, "B": 3, "C": 6})
+
+    def test_suggestion_edges_do_not_block(self):
+        Dependency.objects.filter(target=self.c).update(weight="suggestion")
+        self.assertEqual(self._move([(self.c, 3)]).status_code, status.HTTP_200_OK)
+
+    def test_dry_run_previews_without_writing(self):
+        response = self._move([(self.a, 2)], dry_run=True, cascade=True)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["valid"])
+        self.assertEqual(
+            [(m["milestone_id"], m["index"]) for m in response.data["moves"]],
+            [(self.a.id, 2), (self.b.id, 4)],
+        )
+        response = self._move([(self.a, 2)], dry_run=True)
+        self.assertFalse(response.data["valid"])
+        self.assertEqual(response.data["violations"][0]["source"], self.a.id)
+        self.assertEqual(self._starts(), {"A": 0, "B": 3, "C": 6})
+
+    def test_dry_run_flag_is_parsed_strictly(self):
+        self.assertTrue(self._move([(self.a, 1)], dry_run="1").data["valid"])
+        self.assertTrue(self._move([(self.a, 1)], dry_run=1).data["valid"])
+        self.assertEqual(self._starts()["A"], 0)
+        for value in ("yes", 2, {}):
+            response = self._move([(self.a, 1)], dry_run=value)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, value)
+            self.assertEqual(response.data["detail"], "dry_run must be true or false")
+        self.assertEqual(self._starts()["A"], 0)
+        self.assertEqual(self._move([(self.a, 1)], dry_run="false").data["updated"], 1)
+        self.assertEqual(self._starts()["A"], 1)
+
+    def test_unknown_milestone(self):
+        other = Project.objects.create(name="Other", owner=self.user)
+        stranger = Milestone.objects.create(name="X", project=other, task=Task.objects.create(name="T", project=other))
+        self.assertEqual(self._move([(stranger, 1)]).status_code, status.HTTP_404_NOT_FOUND)
+
+
+# ═══════════════════════════════════════════════════════
+#  27. DEPENDENCY IMPORT
+# ═══════════════════════════════════════════════════════
+
+class BulkImportDependenciesTest(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(name="Import", owner=self.user)
+        self.tasks = [Task.objects.create(name=f"T{i}", project=self.project) for i in range(40)]
+        self.url = f"/api/projects/{self.project.id}/bulk_import_dependencies/"
+
+    def _import(self, entries):
+        return self.client.post(self.url, {"dependencies": entries}, format="json")
+
+    def test_layers_todos_and_edges(self):
+        t = self.tasks
+        response = self._import([
+            {"task_id": t[0].id, "depends_on": [t[1].id, t[2].id], "descriptions": {str(t[1].id): "needs auth"}},
+            {"task_id": t[2].id, "depends_on": [t[1].id]},
+            {"task_id": t[3].id, "depends_on": []},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["count"], {"milestones": 4, "todos": 4, "dependencies": 3, "layers": 3})
+        self.assertEqual(set(response.data["timings_ms"]), {"validate", "layers", "insert", "serialize", "total"})
+        starts = dict(Milestone.objects.filter(project=self.project).values_list("task_id", "start_index"))
+        self.assertEqual(starts, {t[1].id: 0, t[2].id: 1, t[0].id: 2, t[3].id: 0})
+        self.assertEqual(MilestoneTodo.objects.filter(milestone__project=self.project, title="Milestone finished").count(), 4)
+        self.assertEqual(
+            Dependency.objects.get(source__task=t[1], target__task=t[0]).description, "needs auth",
+        )
+        self.assertTrue(all(not m["is_done"] and len(m["todos"]) == 1 for m in response.data["milestones"]))
+
+    def test_insert_count_does_not_grow_with_the_plan(self):
+        t = self.tasks
+        entries = [{"task_id": t[i].id, "depends_on": [t[i - 1].id] if i else []} for i in range(len(t))]
+        with CaptureQueriesContext(connection) as ctx:
+            response = self._import(entries)
+        self.assertEqual(response.data["count"]["layers"], 40)
+        inserts = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("INSERT")]
+        self.assertEqual(
+            sum(sql.startswith(f'INSERT INTO "api_{table}"') for sql in inserts for table in ("milestone", "milestonetodo", "dependency")),
+            3,
+        )
+
+    def test_cycle_and_unknown_tasks_create_nothing(self):
+        t = self.tasks
+        response = self._import([{"task_id": t[0].id, "depends_on": [t[1].id]}, {"task_id": t[1].id, "depends_on": [t[0].id]}])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self._import([{"task_id": t[0].id, "depends_on": [999999]}])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Milestone.objects.filter(project=self.project).exists())
+
+    def test_failure_rolls_back_the_whole_import(self):
+        t = self.tasks
+        with mock.patch.object(Dependency.objects, "bulk_create", side_effect=IntegrityError("boom")):
+            with self.assertRaises(IntegrityError):
+                self._import([{"task_id": t[0].id, "depends_on": [t[1].id]}])
+        self.assertFalse(Milestone.objects.filter(project=self.project).exists())
+        self.assertFalse(MilestoneTodo.objects.filter(milestone__project=self.project).exists())
+
+    def test_dependency_graph_sees_the_import(self):
+        t = self.tasks
+        graph = dependency_graph.get_dependency_graph(self.project)
+        self.assertEqual(len(graph), 0)
+        self._import([{"task_id": t[0].id, "depends_on": [t[1].id]}])
+        self.project.refresh_from_db()
+        self.assertEqual(dependency_graph.get_dependency_graph(self.project).edge_count, 1)
+
+
+# ═══════════════════════════════════════════════════════
+#  28. PHASES
+# ═══════════════════════════════════════════════════════
+
+class PhaseIndexTest(TestCase):
+    def test_overlap_queries(self):
+        index = PhaseIndex([
+            (1, None, 0, 5, "Kickoff"),
+            (2, None, 10, 5, "Build"),
+            (3, 7, 3, 4, "Team sprint"),
+            (4, None, 2, 20, "Legacy overlap"),
+        ])
+        self.assertEqual(index.overlapping(None, 5, 5), [(4, "Legacy overlap")])
+        self.assertEqual(index.overlapping(None, 4, 7), [(1, "Kickoff"), (4, "Legacy overlap"), (2, "Build")])
+        self.assertEqual(index.overlapping(None, 22, 3), [])
+        self.assertEqual(index.overlapping(7, 0, 3), [])
+        self.assertEqual(index.overlapping(7, 6, 1, exclude_id=3), [])
+        self.assertEqual(index.overlapping(8, 0, 100), [])
+
+
+class BulkPhaseUpdateTest(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(name="Phases", owner=self.user)
+        self.team = Team.objects.create(name="Core", project=self.project)
+        self.p1 = Phase.objects.create(project=self.project, name="Design", start_index=0, duration=5)
+        self.p2 = Phase.objects.create(project=self.project, name="Build", start_index=5, duration=5)
+        self.p3 = Phase.objects.create(project=self.project, name="Ship", start_index=10, duration=2)
+        self.team_phase = Phase.objects.create(project=self.project, team=self.team, name="Sprint", start_index=0, duration=4)
+        self.url = f"/api/projects/{self.project.id}/phases/bulk_update/"
+
+    def _spans(self):
+        return dict(Phase.objects.filter(project=self.project).values_list("name", "start_index"))
+
+    def test_index_loads_only_the_checked_scopes(self):
+        team_only = PhaseIndex.load(self.project, [self.team.id])
+        self.assertEqual(team_only.overlapping(None, 0, 100), [])
+        self.assertEqual(team_only.overlapping(self.team.id, 0, 100), [(self.team_phase.id, "Sprint")])
+        global_only = PhaseIndex.load(self.project, [None], exclude=[self.p2.id])
+        self.assertEqual([name for _, name in global_only.overlapping(None, 0, 100)], ["Design", "Ship"])
+        self.assertEqual(global_only.overlapping(self.team.id, 0, 100), [])
+
+    def test_shifting_a_chain_of_phases_at_once(self):
+        # one at a time, Design -> 5 would collide with Build
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.patch(self.url, {"phases": [
+                {"id": self.p1.id, "start_index": 5},
+                {"id": self.p2.id, "start_index": 10, "duration": 4},
+                {"id": self.p3.id, "start_index": 14, "color": "#000000"},
+            ]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([p["start_index"] for p in response.data["phases"]], [5, 10, 14])
+        self.assertEqual(self._spans(), {"Design": 5, "Build": 10, "Ship": 14, "Sprint": 0})
+        self.assertEqual(Phase.objects.get(pk=self.p3.pk).color, "#000000")
+        self.assertEqual(sum(q["sql"].startswith('UPDATE "api_phase"') for q in ctx.captured_queries), 1)
+
+    def test_conflicts_reject_the_whole_batch(self):
+        review = Phase.objects.create(project=self.project, name="Review", start_index=30, duration=2)
+        response = self.client.patch(self.url, {"phases": [
+            {"id": self.p1.id, "start_index": 11},                # lands on untouched Ship
+            {"id": self.p2.id, "start_index": 20},
+            {"id": review.id, "start_index": 21},                 # collides with moved Build
+            {"id": self.team_phase.id, "start_index": 2},         # team phases may overlap global ones
+        ]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["conflicts"], [
+            {"id": self.p1.id, "overlapping_phases": ["Ship"]},
+            {"id": self.p2.id, "overlapping_phases": ["Review"]},
+            {"id": review.id, "overlapping_phases": ["Build"]},
+        ])
+        self.assertEqual(self._spans(), {"Design": 0, "Build": 5, "Ship": 10, "Sprint": 0, "Review": 30})
+
+    def test_unknown_phase_or_team(self):
+        other = Phase.objects.create(project=Project.objects.create(name="X", owner=self.user), name="Other")
+        response = self.client.patch(self.url, {"phases": [{"id": other.id, "start_index": 30}]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.patch(self.url, {"phases": [{"id": self.p1.id, "team": 999999}]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_single_update_still_checks_overlap(self):
+        response = self.client.patch(
+            f"/api/projects/{self.project.id}/phases/{self.p1.id}/", {"start_index": 3}, format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["overlapping_phases"], ["Build"])
+
+
+# ═══════════════════════════════════════════════════════
+#  29. TEAM WORKLOAD
+# ═══════════════════════════════════════════════════════
+
+class TeamWorkloadTest(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(
+            name="Load", owner=self.user, start_date=date(2025, 1, 1), end_date=date(2025, 1, 6),
+        )
+        self.core = Team.objects.create(name="Core", project=self.project, order_index=0)
+        self.ops = Team.objects.create(name="Ops", project=self.project, order_index=1)
+        core_task = Task.objects.create(name="Build", project=self.project, team=self.core)
+        ops_task = Task.objects.create(name="Run", project=self.project, team=self.ops)
+        loose_task = Task.objects.create(name="Loose", project=self.project)
+        for task, start, duration in [(core_task, 0, 3), (core_task, 2, 2), (ops_task, 4, 5), (loose_task, 1, 1)]:
+            Milestone.objects.create(name="M", project=self.project, task=task, start_index=start, duration=duration)
+        Day.objects.create(project=self.project, date=date(2025, 1, 4), day_index=3, is_blocked=True)
+
+    def test_load_per_team_and_day(self):
+        response = self.client.get(f"/api/projects/{self.project.id}/workload/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            "days": 6,
+            "teams": [{"id": self.core.id, "name": "Core"}, {"id": self.ops.id, "name": "Ops"}, {"id": None, "name": None}],
+            "blocked_days": [3],
+            "load": [
+                [1, 1, 2, 0, 0, 0],
+                [0, 0, 0, 0, 1, 1],  # runs past the project end: clipped
+                [0, 1, 0, 0, 0, 0],
+            ],
+            "peak": [2, 1, 1],
+        })
+
+    def test_blocked_days_follow_a_date_change(self):
+        # moving the start without syncing the overrides leaves the stored day_index stale
+        self.client.patch(f"/api/projects/{self.project.id}/update/", {"start_date": "2024-12-31"}, format="json")
+        self.assertEqual(Day.objects.get(project=self.project).day_index, 3)
+        response = self.client.get(f"/api/projects/{self.project.id}/workload/")
+        self.assertEqual(response.data["blocked_days"], [4])
+        self.assertEqual(response.data["load"][0][3:5], [1, 0])
+
+    def test_load_matrix_clips_spans(self):
+        load = load_matrix([0, 0, 1], [-2, 3, 9], [4, 10, 1], team_count=2, days=5)
+        self.assertEqual(load.tolist(), [[1, 1, 0, 1, 1], [0, 0, 0, 0, 0]])
+
+
+# ═══════════════════════════════════════════════════════
+#  30. RESOURCE LEVELING
+# ═══════════════════════════════════════════════════════
+
+class ResourceLevelingTest(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(
+            name="Level", owner=self.user, start_date=date(2025, 1, 1), end_date=date(2025, 1, 20),
+        )
+        self.core = Team.objects.create(name="Core", project=self.project)
+        self.ops = Team.objects.create(name="Ops", project=self.project)
+        self.core_task = Task.objects.create(name="Build", project=self.project, team=self.core)
+        ops_task = Task.objects.create(name="Run", project=self.project, team=self.ops)
+
+        def milestone(name, start_index, duration=1, task=self.core_task):
+            return Milestone.objects.create(name=name, project=self.project, task=task, start_index=start_index, duration=duration)
+
+        self.a = milestone("A", 0, 2)
+        self.b = milestone("B", 0, 2)
+        self.c = milestone("C", 1)
+        self.e = milestone("E", 2, task=ops_task)
+        self.f = milestone("F", 2, task=ops_task)
+        Dependency.objects.create(source=self.b, target=self.e)
+        Dependency.objects.create(source=self.a, target=self.f)
+        self.url = f"/api/projects/{self.project.id}/level_resources/"
+
+    def _level(self, **body):
+        return self.client.post(self.url, {"capacity": {str(self.core.id): 1}, **body}, format="json")
+
+    def _starts(self):
+        return dict(Milestone.objects.filter(project=self.project).values_list("name", "start_index"))
+
+    def test_dry_run_proposes_delays_within_capacity(self):
+        response = self._level()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data["applied"])
+        self.assertEqual(response.data["moves"], [
+            {"milestone_id": self.b.id, "index": 2, "previous_index": 0},
+            {"milestone_id": self.c.id, "index": 4, "previous_index": 1},
+            {"milestone_id": self.e.id, "index": 4, "previous_index": 2},  # pushed by B
+        ])
+        self.assertEqual(response.data["total_delay"], 7)
+        self.assertEqual(response.data["overloads_before"], 2)
+        self.assertEqual(response.data["overloads"], [])
+        self.assertEqual(self._starts(), {"A": 0, "B": 0, "C": 1, "E": 2, "F": 2})
+
+    def test_apply_flag_is_parsed_strictly(self):
+        for value in ("false", "0", "", False, 0, None):
+            self.assertFalse(self._level(apply=value).data["applied"], value)
+        for value in ("no", 2, [True]):
+            self.assertEqual(self._level(apply=value).status_code, status.HTTP_400_BAD_REQUEST, value)
+        self.assertEqual(self._starts(), {"A": 0, "B": 0, "C": 1, "E": 2, "F": 2})
+        self.assertTrue(self._level(apply="true").data["applied"])
+        self.assertEqual(self._starts()["B"], 2)
+
+    def test_apply_writes_the_plan(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self._level(apply=True)
+        self.assertTrue(response.data["applied"])
+        self.assertEqual(self._starts(), {"A": 0, "B": 2, "C": 4, "E": 4, "F": 2})
+        self.assertEqual(sum(q["sql"].startswith('UPDATE "api_milestone"') for q in ctx.captured_queries), 1)
+
+    def test_hard_deadline_is_never_crossed(self):
+        fixed = Task.objects.create(name="Fixed", project=self.project, team=self.core, hard_deadline=2)
+        Milestone.objects.filter(pk=self.c.pk).update(task=fixed)
+        response = self._level()
+        moved = {m["milestone_id"]: m["index"] for m in response.data["moves"]}
+        self.assertNotIn(self.c.id, moved)
+        self.assertEqual(
+            response.data["overloads"], [{"team": self.core.id, "day": 1, "load": 2, "capacity": 1}],
+        )
+
+    def test_blocked_days_are_skipped(self):
+        Day.objects.create(project=self.project, date=date(2025, 1, 3), day_index=2, is_blocked=True)
+        response = self._level()
+        moved = {m["milestone_id"]: m["index"] for m in response.data["moves"]}
+        self.assertEqual((moved[self.b.id], moved[self.c.id]), (3, 5))
+
+    def test_pushed_uncapped_milestone_skips_blocked_days(self):
+        Day.objects.create(project=self.project, date=date(2025, 1, 5), day_index=4, is_blocked=True)
+        response = self._level()
+        moved = {m["milestone_id"]: m["index"] for m in response.data["moves"]}
+        self.assertEqual(moved[self.b.id], 2)
+        self.assertEqual(moved[self.e.id], 5)  # B finishes on blocked day 4
+
+    def test_invalid_capacity(self):
+        self.assertEqual(self.client.post(self.url, {"capacity": 0}, format="json").status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(self.url, {"capacity": {"999999": 1}}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+# ═══════════════════════════════════════════════════════
+#  31. SCHEDULE RISK
+# ═══════════════════════════════════════════════════════
+
+class ScheduleRiskTest(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.project = Project.objects.create(
+            name="Risk", owner=self.user, start_date=date(2025, 1, 1), end_date=date(2025, 1, 10),
+        )
+        self.task = Task.objects.create(name="Build", project=self.project)
+        self.a = Milestone.objects.create(name="A", project=self.project, task=self.task, start_index=0, duration=2)
+        self.b = Milestone.objects.create(name="B", project=self.project, task=self.task, start_index=2, duration=3)
+        self.c = Milestone.objects.create(name="C", project=self.project, task=self.task, start_index=0, duration=1)
+        Dependency.objects.create(source=self.a, target=self.b)
+        self.url = f"/api/projects/{self.project.id}/schedule_risk/"
+
+    def _simulate(self, **body):
+        return self.client.post(self.url, {"samples": 500, "seed": 7, **body}, format="json")
+
+    def _criticality(self, response):
+        return {m["id"]: m["criticality"] for m in response.data["milestones"]}
+
+    def test_fixed_durations_reproduce_the_plan(self):
+        fixed = {str(m.id): [m.duration] * 3 for m in (self.a, self.b, self.c)}
+        response = self._simulate(ranges=fixed)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["planned_finish"], 4)
+        self.assertEqual(set(response.data["percentiles"].values()), {4})
+        self.assertEqual(response.data["percentile_dates"]["p50"], date(2025, 1, 5))
+        self.assertEqual(response.data["on_time_probability"], 1.0)
+        self.assertEqual(self._criticality(response), {self.a.id: 1.0, self.b.id: 1.0, self.c.id: 0.0})
+
+    def test_seeded_runs_are_reproducible(self):
+        first, second = self._simulate(), self._simulate()
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(first.data["samples"], 500)
+        p = first.data["percentiles"]
+        self.assertTrue(4 <= p["p10"] <= p["p50"] <= p["p90"] <= p["p95"])
+
+    def test_harder_tasks_widen_the_spread(self):
+        Task.objects.filter(pk=self.task.pk).update(difficulty="easy")
+        easy = self._simulate().data["percentiles"]
+        Task.objects.filter(pk=self.task.pk).update(difficulty="Hard")
+        hard = self._simulate().data["percentiles"]
+        self.assertGreater(hard["p95"], easy["p95"])
+
+    def test_slip_past_target_lowers_on_time_probability(self):
+        response = self._simulate(ranges={str(self.b.id): [3, 4, 8]}, target_day=6)
+        self.assertEqual(response.data["target_day"], 6)
+        self.assertLess(response.data["on_time_probability"], 1.0)
+        self.assertGreater(response.data["on_time_probability"], 0.0)
+
+    @override_settings(SCHEDULE_RISK_MAX_WORKERS=2)
+    def test_sharded_over_workers(self):
+        response = self._simulate(workers=2)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["samples"], 500)
+        self.assertEqual(self._criticality(response)[self.a.id], 1.0)
+
+    def test_invalid_input(self):
+        for body in (
+            {"samples": 0},
+            {"samples": "many"},
+            {"ranges": {"999999": [1, 2, 3]}},
+            {"ranges": {str(self.a.id): [3, 2, 1]}},
+            {"ranges": [1, 2, 3]},
+        ):
+            self.assertEqual(self._simulate(**body).status_code, status.HTTP_400_BAD_REQUEST, body)
+        with override_settings(SCHEDULE_RISK_MAX_SAMPLES=100):
+            self.assertEqual(self._simulate().status_code, status.HTTP_400_BAD_REQUEST)
@@ -145,6 +145,7 @@ urlpatterns = [
     path("projects/<int:project_id>/create_dependency/", views.create_dependency),
     path("projects/<int:project_id>/delete_dependency/", views.delete_dependency),
     path("projects/<int:project_id>/update_dependency/", views.update_dependency),
+    path("projects/<int:project_id>/milestones/<int:milestone_id>/lineage/", views.get_milestone_lineage),
     
     # Days
     path("projects/<int:project_id>/days/", views.get_project_days),
@@ -156,6 +157,7 @@ urlpatterns = [
     # Phases
     path("projects/<int:project_id>/phases/", views.get_all_phases),
     path("projects/<int:project_id>/phases/create/", views.create_phase),
+    path("projects/<int:project_id>/phases/bulk_update/", views.bulk_update_phases),
     path("projects/<int:project_id>/phases/<int:phase_id>/", views.update_phase),
     path("projects/<int:project_id>/phases/<int:phase_id>/delete/", views.delete_phase),
 
@@ -166,10 +168,24 @@ urlpatterns = [
     path("projects/<int:project_id>/views/<int:view_id>/delete/", views.delete_view),
     path("projects/<int:project_id>/views/set-default/", views.set_default_view),
 
+    # Whole planning model in one round trip
+    path("projects/<int:project_id>/bootstrap/", views.project_bootstrap),
+
+    # Change feed (delta sync since a project revision) and live events
+    path("projects/<int:project_id>/changes/", views.project_changes),
+    path("projects/<int:project_id>/events/", views.project_events),
+
+    # Schedule analysis
+    path("projects/<int:project_id>/critical_path/", views.get_critical_path),
+    path("projects/<int:project_id>/workload/", views.get_team_workload),
+    path("projects/<int:project_id>/level_resources/", views.level_project_resources),
+    path("projects/<int:project_id>/schedule_risk/", views.simulate_schedule_risk),
+
     # Project Snapshots
     path("projects/<int:project_id>/snapshots/", views.list_snapshots),
     path("projects/<int:project_id>/snapshots/create/", views.create_snapshot),
     path("projects/<int:project_id>/snapshots/<int:snapshot_id>/", views.get_snapshot),
+    path("projects/<int:project_id>/snapshots/<int:snapshot_id>/diff/", views.diff_snapshot),
     path("projects/<int:project_id>/snapshots/<int:snapshot_id>/restore/", views.restore_snapshot),
     path("projects/<int:project_id>/snapshots/<int:snapshot_id>/delete/", views.delete_snapshot),
     path("projects/<int:project_id>/snapshots/<int:snapshot_id>/rename/", views.rename_snapshot),
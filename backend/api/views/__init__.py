@@ -21,7 +21,15 @@ from .serializers import (
     TaskLegendTypeSerializer,
 )
 
-from .helpers import user_has_project_access
+from .helpers import (
+    user_has_project_access,
+    accessible_project_ids,
+    get_accessible_project,
+    invalidate_project_access,
+    project_access_required,
+    project_etag,
+    revision_etag,
+)
 
 from .auth import (
     check_auth,
@@ -88,6 +96,7 @@ from .dependencies import (
     create_dependency,
     delete_dependency,
     update_dependency,
+    get_milestone_lineage,
 )
 
 from .days import (
@@ -102,6 +111,7 @@ from .phases import (
     get_all_phases,
     create_phase,
     update_phase,
+    bulk_update_phases,
     delete_phase,
 )
 
@@ -113,10 +123,30 @@ from .dependency_views import (
     set_default_view,
 )
 
+from .bootstrap import (
+    project_bootstrap,
+)
+
+from .changes import (
+    project_changes,
+)
+
+from .events import (
+    project_events,
+)
+
+from .schedule import (
+    get_critical_path,
+    get_team_workload,
+    level_project_resources,
+    simulate_schedule_risk,
+)
+
 from .snapshots import (
     list_snapshots,
     create_snapshot,
     get_snapshot,
+    diff_snapshot,
     restore_snapshot,
     delete_snapshot,
     rename_snapshot,
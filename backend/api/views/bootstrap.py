@@ -0,0 +1,233 @@
+"""
+Project bootstrap: the whole planning model of a project in one response.
+
+GET /api/projects/<id>/bootstrap/
+GET /api/projects/<id>/bootstrap/?include=tasks,milestones,dependencies
+
+Each section has the same shape as the endpoint the frontend used to call
+for it (get_project_details, fetch_project_teams, fetch_project_tasks,
+get_all_milestones, get_all_dependencies, get_project_days, get_all_phases,
+get_all_views). Rows are read with values() and assembled in Python, so the
+response costs a fixed number of queries however large the project is.
+"""
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from ..models import (
+    AcceptanceCriterion,
+    Dependency,
+    DependencyView,
+    Milestone,
+    MilestoneTodo,
+    Phase,
+    Task,
+    TaskLegendAssignment,
+    Team,
+)
+from .serializers import (
+    AcceptanceCriterionSerializer,
+    DaySerializer,
+    DependencySerializer_Deps,
+    DependencyViewSerializer,
+    MilestoneSerializer_Deps,
+    MilestoneTodoSerializer,
+    PhaseSerializer,
+    ProjectSerializer_Deps,
+    TaskSerializer_Deps,
+    TeamSerializer_Deps,
+)
+from .helpers import project_access_required, revision_etag
+
+SECTIONS = ("project", "teams", "tasks", "milestones", "dependencies", "days", "phases", "views")
+
+
+# ═══════════════════════════════════════════════════════
+#  values() ROWS
+# ═══════════════════════════════════════════════════════
+
+def _columns(serializer_class):
+    """
+    The model columns a ModelSerializer exposes: (plain columns, m2m fields,
+    {column: formatter}). Fields that aren't columns (method fields, nested
+    serializers, properties) are left to the caller.
+    """
+    model = serializer_class.Meta.model
+    columns, m2m, formatters = [], [], {}
+    for name, field in serializer_class().fields.items():
+        try:
+            model_field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if model_field.many_to_many:
+            m2m.append(name)
+        elif model_field.concrete:
+            columns.append(name)
+            if isinstance(field, (serializers.DateTimeField, serializers.DateField)):
+                formatters[name] = field.to_representation
+    return columns, m2m, formatters
+
+
+def _m2m_ids(queryset, name):
+    """{row id: [related ids]} for the m2m field ``name`` of every row in ``queryset``."""
+    field = queryset.model._meta.get_field(name)
+    source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+    related = {}
+    pairs = (
+        field.remote_field.through.objects
+        .filter(**{f"{source}__in": queryset.values("id")})
+        .order_by("id")
+        .values_list(f"{source}_id", f"{target}_id")
+    )
+    for row_id, related_id in pairs:
+        related.setdefault(row_id, []).append(related_id)
+    return related
+
+
+def _rows(queryset, serializer_class, *extra):
+    """Serialize ``queryset`` like ``serializer_class`` would, from values()."""
+    columns, m2m, formatters = _columns(serializer_class)
+    rows = list(queryset.values(*columns, *extra))
+    for row in rows:
+        for name, formatter in formatters.items():
+            if row[name] is not None:
+                row[name] = formatter(row[name])
+    for name in m2m:
+        related = _m2m_ids(queryset, name)
+        for row in rows:
+            row[name] = related.get(row["id"], [])
+    return rows
+
+
+def _grouped(rows, key):
+    groups = {}
+    for row in rows:
+        groups.setdefault(row.pop(key), []).append(row)
+    return groups
+
+
+# ═══════════════════════════════════════════════════════
+#  SECTIONS
+# ═══════════════════════════════════════════════════════
+
+def _project(project):
+    columns, m2m, formatters = _columns(ProjectSerializer_Deps)
+    row = {}
+    for name in columns:
+        value = getattr(project, project._meta.get_field(name).attname)
+        row[name] = formatters[name](value) if name in formatters and value is not None else value
+    for name in m2m:
+        row[name] = _m2m_ids(type(project).objects.filter(pk=project.pk), name).get(project.id, [])
+    return row
+
+
+def _milestones(project):
+    milestones = _rows(
+        Milestone.objects.filter(project=project).with_done_state().order_by("id"),
+        MilestoneSerializer_Deps,
+        "is_done",
+        "is_done_effective",
+    )
+    todos = _grouped(
+        _rows(MilestoneTodo.objects.filter(milestone__project=project), MilestoneTodoSerializer, "milestone_id"),
+        "milestone_id",
+    )
+    for milestone in milestones:
+        milestone["todos"] = todos.get(milestone["id"], [])
+    return milestones
+
+
+def _tasks(project, milestones):
+    tasks = _rows(
+        Task.objects.filter(project=project).with_done_state().order_by("team_id", "order_index"),
+        TaskSerializer_Deps,
+        "is_done",
+    )
+    criteria = _grouped(
+        _rows(AcceptanceCriterion.objects.filter(task__project=project), AcceptanceCriterionSerializer, "task_id"),
+        "task_id",
+    )
+    legend_types = {}
+    assignments = (
+        TaskLegendAssignment.objects
+        .filter(task__project=project)
+        .order_by("id")
+        .values_list("task_id", "legend_id", "legend_type_id", "legend_type__name", "legend_type__color", "legend_type__icon")
+    )
+    for task_id, legend_id, legend_type_id, name, color, icon in assignments:
+        legend_types.setdefault(task_id, {})[str(legend_id)] = {
+            "legend_type_id": legend_type_id,
+            "name": name,
+            "color": color,
+            "icon": icon,
+        }
+    milestones_by_task = {}
+    for milestone in milestones:
+        milestones_by_task.setdefault(milestone["task"], []).append(milestone)
+
+    tasks_by_id, order_per_team = {}, {}
+    for task in tasks:
+        task["milestones"] = milestones_by_task.get(task["id"], [])
+        task["acceptance_criteria"] = criteria.get(task["id"], [])
+        task["legend_types"] = legend_types.get(task["id"], {})
+        tasks_by_id[task["id"]] = task
+        order_per_team.setdefault(task["team"], []).append(task["id"])
+    return tasks_by_id, order_per_team
+
+
+def _days(project):
+    # days are computed from the project dates plus one query for overrides
+    return DaySerializer(project.get_days(), many=True).data
+
+
+def _views(project):
+    views = _rows(DependencyView.objects.filter(project=project), DependencyViewSerializer, "created_by__username")
+    for view in views:
+        view["created_by_name"] = view.pop("created_by__username")
+    return views
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@project_access_required
+@revision_etag
+def project_bootstrap(request, project):
+    """
+    Everything needed to open a project, in one round trip.
+    ``?include=`` limits the response to a comma-separated list of sections.
+    """
+    include = request.query_params.get("include")
+    if include:
+        sections = {name.strip() for name in include.split(",") if name.strip()}
+        unknown = sections - set(SECTIONS)
+        if unknown:
+            return Response(
+                {"detail": f"Unknown sections: {', '.join(sorted(unknown))}", "sections": SECTIONS},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+    else:
+        sections = set(SECTIONS)
+
+    data = {"revision": project.revision}
+    if "project" in sections:
+        data["project"] = _project(project)
+    if "teams" in sections:
+        data["teams"] = _rows(Team.objects.filter(project=project).order_by("order_index"), TeamSerializer_Deps)
+    if sections & {"tasks", "milestones"}:
+        milestones = _milestones(project)
+        if "milestones" in sections:
+            data["milestones"] = milestones
+        if "tasks" in sections:
+            data["tasks"], data["taskOrder"] = _tasks(project, milestones)
+    if "dependencies" in sections:
+        data["dependencies"] = _rows(Dependency.objects.filter(source__project=project), DependencySerializer_Deps)
+    if "days" in sections:
+        data["days"] = _days(project)
+    if "phases" in sections:
+        data["phases"] = _rows(Phase.objects.filter(project=project), PhaseSerializer)
+    if "views" in sections:
+        data["views"] = _views(project)
+    return Response(data)
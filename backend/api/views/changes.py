@@ -0,0 +1,106 @@
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from ..models import Dependency, Milestone, Phase, ProjectChange, Team
+from .serializers import (
+    DaySerializer,
+    DependencySerializer_Deps,
+    MilestoneSerializer_Deps,
+    PhaseSerializer,
+    TaskSerializer_Deps,
+    TeamSerializer_Deps,
+)
+from .helpers import project_access_required, revision_etag
+from .tasks import project_tasks_queryset
+
+
+# Per entity: (project rows queryset, serializer) — the same the list endpoints use.
+_ENTITY_SOURCES = {
+    "teams": (lambda project: Team.objects.filter(project=project), TeamSerializer_Deps),
+    "tasks": (project_tasks_queryset, TaskSerializer_Deps),
+    "milestones": (
+        lambda project: Milestone.objects.filter(project=project).with_done_state().prefetch_related("todos"),
+        MilestoneSerializer_Deps,
+    ),
+    "dependencies": (lambda project: Dependency.objects.filter(source__project=project), DependencySerializer_Deps),
+    "phases": (lambda project: Phase.objects.filter(project=project), PhaseSerializer),
+}
+
+
+def _live_rows(entity, project, ids):
+    """(key field, serialized rows) for the ``ids`` of ``entity`` that still exist."""
+    if entity == "days":
+        # days are logged by day_index; any index inside the timespan exists
+        days = project.get_days()
+        return "day_index", DaySerializer([days[i] for i in sorted(ids) if 0 <= i < len(days)], many=True).data
+    queryset, serializer = _ENTITY_SOURCES[entity]
+    return "id", serializer(queryset(project).filter(id__in=ids), many=True).data
+
+
+def _net_changes(project, since):
+    """
+    Fold the log after ``since`` into one action per row: {entity: {id: action}}.
+    A row created and deleted within the window is dropped entirely.
+    """
+    net = {}
+    entries = (
+        ProjectChange.objects
+        .filter(project=project, revision__gt=since)
+        .order_by("id")
+        .values_list("entity", "entity_id", "action")
+    )
+    for entity, entity_id, action in entries.iterator():
+        rows = net.setdefault(entity, {})
+        previous = rows.get(entity_id)
+        if previous == "created" and action == "deleted":
+            del rows[entity_id]
+        elif previous != "created" or action == "deleted":
+            rows[entity_id] = action
+    return net
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@project_access_required
+@revision_etag
+def project_changes(request, project):
+    """
+    Everything that changed in the project after revision ``?since=N``, so a
+    client holding revision N can catch up without refetching every list.
+
+    Created and updated rows are serialized exactly like the list endpoints;
+    deleted rows are listed by id. Answers 410 when ``since`` predates the
+    retained change log — the client must then refetch in full.
+    """
+    try:
+        since = int(request.query_params.get("since", ""))
+    except ValueError:
+        since = -1
+    if since < 0:
+        return Response({"detail": "since must be a non-negative revision number"}, status=status.HTTP_400_BAD_REQUEST)
+    if since > project.revision:
+        return Response({"detail": "since is ahead of the project's revision"}, status=status.HTTP_400_BAD_REQUEST)
+    if since < project.change_log_floor:
+        return Response(
+            {"detail": "Change log no longer reaches this revision; refetch the project.", "revision": project.revision},
+            status=status.HTTP_410_GONE,
+        )
+
+    changes = {}
+    for entity, rows in _net_changes(project, since).items():
+        if not rows or (entity not in _ENTITY_SOURCES and entity != "days"):
+            continue
+        live_ids = [entity_id for entity_id, action in rows.items() if action != "deleted"]
+        key, live = _live_rows(entity, project, live_ids) if live_ids else ("id", [])
+        found = {row[key] for row in live}
+
+        changes[entity] = {
+            "created": [row for row in live if rows[row[key]] == "created"],
+            "updated": [row for row in live if rows[row[key]] == "updated"],
+            # rows gone since (or moved out of the project) count as deleted
+            "deleted": sorted(entity_id for entity_id in rows if entity_id not in found),
+        }
+
+    return Response({"revision": project.revision, "since": since, "changes": changes})
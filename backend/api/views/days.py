@@ -6,34 +6,20 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.db import transaction
 
-from ..models import Project, Day, Milestone
 from .serializers import DaySerializer
-from .helpers import user_has_project_access
+from .helpers import project_access_required, revision_etag
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
-def get_project_days(request, project_id):
+@project_access_required
+@revision_etag
+def get_project_days(request, project):
     """
-    Get all days for a project. Creates them if they don't exist.
+    Get all days for a project. Days are computed from the project dates;
+    only overridden days come from the database (one query, no writes).
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
-    # Ensure days exist
-    if project.start_date and project.end_date:
-        existing_days_count = Day.objects.filter(project=project).count()
-        expected_days_count = (project.end_date - project.start_date).days + 1
-        
-        if existing_days_count != expected_days_count:
-            project.create_days()
-
-    days = Day.objects.filter(project=project).order_by("day_index")
+    days = project.get_days()
     serialized = DaySerializer(days, many=True)
     
     # Convert to dict by day_index for easier frontend access
@@ -50,21 +36,13 @@ def get_project_days(request, project_id):
 
 @api_view(["PATCH"])
 @permission_classes([IsAuthenticated])
-def update_day(request, project_id, day_index):
+@project_access_required
+def update_day(request, project, day_index):
     """
     Update a specific day's properties (purpose, description, is_blocked, color).
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
-    try:
-        day = Day.objects.get(project=project, day_index=day_index)
-    except Day.DoesNotExist:
+    day = project.get_day(day_index)
+    if day is None:
         return Response({"detail": "Day not found"}, status=status.HTTP_404_NOT_FOUND)
 
     data = request.data
@@ -81,7 +59,7 @@ def update_day(request, project_id, day_index):
     if "color" in data:
         day.color = data["color"] if data["color"] else None
 
-    day.save()
+    day.save_override()
 
     serializer = DaySerializer(day)
     return Response({"success": True, "day": serializer.data})
@@ -89,19 +67,12 @@ def update_day(request, project_id, day_index):
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
-def set_day_purpose(request, project_id):
+@project_access_required
+def set_day_purpose(request, project):
     """
     Quick endpoint to set or clear a day's purpose.
     Body: { "day_index": 0, "purpose": "Meeting" }
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     day_index = request.data.get("day_index")
     purpose = request.data.get("purpose")
     purpose_teams = request.data.get("purpose_teams", None)  # null = all, list of IDs = specific
@@ -110,8 +81,10 @@ def set_day_purpose(request, project_id):
         return Response({"detail": "day_index is required"}, status=status.HTTP_400_BAD_REQUEST)
 
     try:
-        day = Day.objects.get(project=project, day_index=day_index)
-    except Day.DoesNotExist:
+        day = project.get_day(int(day_index))
+    except (TypeError, ValueError):
+        day = None
+    if day is None:
         return Response({"detail": "Day not found"}, status=status.HTTP_404_NOT_FOUND)
 
     day.purpose = purpose.strip() if purpose else None
@@ -120,7 +93,7 @@ def set_day_purpose(request, project_id):
         day.purpose_teams = None
     else:
         day.purpose_teams = purpose_teams  # null means all teams
-    day.save()
+    day.save_override()
 
     serializer = DaySerializer(day)
     return Response({"success": True, "day": serializer.data})
@@ -128,20 +101,13 @@ def set_day_purpose(request, project_id):
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
-def validate_project_dates(request, project_id):
+@project_access_required
+def validate_project_dates(request, project):
     """
     Validate if new project dates would cause issues with existing milestones.
     Body: { "start_date": "YYYY-MM-DD", "end_date": "YYYY-MM-DD" }
     Returns validation result without making changes.
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     new_start = request.data.get("start_date")
     new_end = request.data.get("end_date")
 
@@ -162,23 +128,7 @@ def validate_project_dates(request, project_id):
         })
 
     new_days_count = (new_end_date - new_start_date).days + 1
-    
-    # Find milestones that would be out of range
-    milestones_out_of_range = []
-    all_milestones = Milestone.objects.filter(project=project)
-    
-    for ms in all_milestones:
-        end_index = ms.start_index + ms.duration - 1
-        if ms.start_index >= new_days_count or end_index >= new_days_count:
-            milestones_out_of_range.append({
-                'id': ms.id,
-                'name': ms.name,
-                'task_name': ms.task.name if ms.task else 'Unknown',
-                'start_index': ms.start_index,
-                'duration': ms.duration,
-                'end_index': end_index,
-                'required_days': end_index + 1
-            })
+    milestones_out_of_range = project.milestones_out_of_range(new_days_count)
 
     if milestones_out_of_range:
         return Response({
@@ -197,34 +147,21 @@ def validate_project_dates(request, project_id):
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
-def sync_project_days(request, project_id):
+@project_access_required
+def sync_project_days(request, project):
     """
-    Synchronize days for a project after date changes.
-    This creates missing days and removes days outside the range.
+    Synchronize day overrides for a project after date changes.
+    Removes overrides outside the range and re-indexes the rest; the days
+    themselves are computed from the dates.
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     if not project.start_date or not project.end_date:
         return Response({"detail": "Project must have start and end dates"}, status=status.HTTP_400_BAD_REQUEST)
 
     with transaction.atomic():
-        # Delete days outside range
-        deleted_count, _ = Day.objects.filter(project=project).exclude(
-            date__gte=project.start_date,
-            date__lte=project.end_date
-        ).delete()
-
-        # Create/update days
-        created_days = project.create_days()
+        deleted_count = project.sync_day_overrides()
 
     return Response({
         "success": True,
         "deleted": deleted_count,
-        "total_days": len(created_days)
+        "total_days": project.get_days_count()
     })
\ No newline at end of file
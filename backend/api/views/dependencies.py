@@ -3,25 +3,20 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from ..models import Project, Milestone, Dependency
+from ..models import Milestone, Dependency
 from .serializers import DependencySerializer_Deps
-from .helpers import user_has_project_access
+from .helpers import project_access_required, revision_etag
+from ..graph import get_dependency_graph
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
-def get_all_dependencies(request, project_id):
+@project_access_required
+@revision_etag
+def get_all_dependencies(request, project):
     """
     Get all dependencies (connections between milestones) for a project.
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     dependencies = Dependency.objects.filter(source__project=project)
     serialized = DependencySerializer_Deps(dependencies, many=True)
     return Response({"dependencies": serialized.data})
@@ -29,19 +24,12 @@ def get_all_dependencies(request, project_id):
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
-def create_dependency(request, project_id):
+@project_access_required
+def create_dependency(request, project):
     """
     Create a dependency between two milestones.
     Body: { "source": <milestone_id>, "target": <milestone_id> }
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     source_id = request.data.get("source")
     target_id = request.data.get("target")
 
@@ -55,12 +43,16 @@ def create_dependency(request, project_id):
         return Response({"detail": "Milestone not found in this project"}, status=status.HTTP_404_NOT_FOUND)
 
     # Prevent self-dependency
-    if source_id == target_id:
+    if source.id == target.id:
         return Response({"detail": "A milestone cannot depend on itself"}, status=status.HTTP_400_BAD_REQUEST)
 
-    # Prevent reverse/circular dependency
-    if Dependency.objects.filter(source=target, target=source).exists():
-        return Response({"detail": "Reverse dependency already exists — would create a cycle"}, status=status.HTTP_400_BAD_REQUEST)
+    # Prevent cycles of any length (target must not already lead back to source)
+    cycle = get_dependency_graph(project).cycle_path(source.id, target.id)
+    if cycle:
+        return Response(
+            {"detail": "Dependency would create a cycle", "cycle": cycle},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
 
     # Validate scheduling: source must finish before target starts
     # Skip this check for suggestion-weight dependencies (they don't enforce ordering)
@@ -100,19 +92,12 @@ def create_dependency(request, project_id):
 
 @api_view(["DELETE"])
 @permission_classes([IsAuthenticated])
-def delete_dependency(request, project_id):
+@project_access_required
+def delete_dependency(request, project):
     """
     Delete a dependency between two milestones.
     Body: { "source": <milestone_id>, "target": <milestone_id> }
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     source_id = request.data.get("source")
     target_id = request.data.get("target")
 
@@ -134,19 +119,12 @@ def delete_dependency(request, project_id):
 
 @api_view(["PATCH"])
 @permission_classes([IsAuthenticated])
-def update_dependency(request, project_id):
+@project_access_required
+def update_dependency(request, project):
     """
     Update a dependency's weight and/or reason.
     Body: { "source": <id>, "target": <id>, "weight"?: str, "reason"?: str|null, "description"?: str|null }
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     source_id = request.data.get("source")
     target_id = request.data.get("target")
 
@@ -181,3 +159,23 @@ def update_dependency(request, project_id):
 
     serialized = DependencySerializer_Deps(dependency)
     return Response({"dependency": serialized.data}, status=status.HTTP_200_OK)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@project_access_required
+@revision_etag
+def get_milestone_lineage(request, project, milestone_id):
+    """
+    All milestones a milestone transitively depends on (ancestors) and all
+    that transitively depend on it (descendants), for highlight-on-hover.
+    Answered from the cached dependency graph.
+    """
+    graph = get_dependency_graph(project)
+    if milestone_id not in graph.index:
+        return Response({"detail": "Milestone not found"}, status=status.HTTP_404_NOT_FOUND)
+    return Response({
+        "milestone": milestone_id,
+        "ancestors": graph.ancestors(milestone_id),
+        "descendants": graph.descendants(milestone_id),
+    })
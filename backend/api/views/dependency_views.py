@@ -3,23 +3,17 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from ..models import Project, DependencyView
+from ..changes import record_untracked_write
+from ..models import DependencyView
 from .serializers import DependencyViewSerializer
-from .helpers import user_has_project_access
+from .helpers import project_access_required
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
-def get_all_views(request, project_id):
+@project_access_required
+def get_all_views(request, project):
     """Get all saved dependency views for a project."""
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     views = DependencyView.objects.filter(project=project)
     serialized = DependencyViewSerializer(views, many=True)
     return Response({"views": serialized.data})
@@ -27,19 +21,12 @@ def get_all_views(request, project_id):
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
-def create_view(request, project_id):
+@project_access_required
+def create_view(request, project):
     """
     Create a new dependency view.
     Body: { "name": str, "state": {...} }
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     name = str(request.data.get("name", "")).strip()
     if not name:
         return Response({"detail": "Name is required"}, status=status.HTTP_400_BAD_REQUEST)
@@ -63,19 +50,12 @@ def create_view(request, project_id):
 
 @api_view(["PATCH"])
 @permission_classes([IsAuthenticated])
-def update_view(request, project_id, view_id):
+@project_access_required
+def update_view(request, project, view_id):
     """
     Update a view's name and/or state.
     Body: any of { "name", "state" }
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     try:
         view = DependencyView.objects.get(pk=view_id, project=project)
     except DependencyView.DoesNotExist:
@@ -100,16 +80,9 @@ def update_view(request, project_id, view_id):
 
 @api_view(["DELETE"])
 @permission_classes([IsAuthenticated])
-def delete_view(request, project_id, view_id):
+@project_access_required
+def delete_view(request, project, view_id):
     """Delete a dependency view."""
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     try:
         view = DependencyView.objects.get(pk=view_id, project=project)
     except DependencyView.DoesNotExist:
@@ -121,24 +94,18 @@ def delete_view(request, project_id, view_id):
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
-def set_default_view(request, project_id):
+@project_access_required
+def set_default_view(request, project):
     """
     Set a view as the project default, or clear the default.
     Body: { "view_id": <int|null> }
     If view_id is null, clears the default.
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     view_id = request.data.get("view_id")
 
     # Clear all defaults for this project
     DependencyView.objects.filter(project=project, is_default=True).update(is_default=False)
+    record_untracked_write()  # update() sends no signals
 
     if view_id:
         try:
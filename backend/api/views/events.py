@@ -0,0 +1,100 @@
+"""
+Live project updates as server-sent events.
+
+GET /api/projects/<id>/events/   (Accept: text/event-stream)
+
+Each event is one committed revision:
+
+    id: 42
+    event: change
+    data: {"revision": 42, "changes": {"milestones": {"updated": [7]}}}
+
+Clients apply the ids they care about or fetch the rows through
+GET /changes/?since=<previous id>. A reconnect sends the last id back as the
+Last-Event-ID header (or ?last_event_id=) and is replayed what it missed.
+"reset" means refetch everything; "resync" means the stream fell behind and
+the client should fetch /changes/?since=<data.since>. Comment lines are sent
+as heartbeats, and the stream ends after PROJECT_EVENTS_STREAM_SECONDS so
+worker threads are recycled; clients simply reconnect.
+"""
+
+import json
+import time
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.response import Response
+
+from ..events import RESYNC, events_since, get_broker, resync_event
+from .helpers import project_access_required
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets DRF accept ``Accept: text/event-stream``; only error bodies go through it."""
+    media_type = "text/event-stream"
+    format = "event-stream"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data).encode() if data is not None else b""
+
+
+def _format(event):
+    lines = []
+    if event["id"] is not None:
+        lines.append(f"id: {event['id']}")
+    lines.append(f"event: {event['type']}")
+    lines.append(f"data: {json.dumps(event['data'], separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _stream(project, since):
+    broker = get_broker()
+    # Subscribe before reading the log so nothing committed in between is lost.
+    subscription = broker.subscribe(project.id, project.revision)
+    heartbeat = settings.PROJECT_EVENTS_HEARTBEAT_SECONDS
+    deadline = time.monotonic() + settings.PROJECT_EVENTS_STREAM_SECONDS
+    last_id = since
+    try:
+        yield f"retry: {settings.PROJECT_EVENTS_RETRY_MS}\n\n"
+        for event in events_since(project.id, since):
+            yield _format(event)
+            last_id = event["id"] or last_id
+
+        while (remaining := deadline - time.monotonic()) > 0:
+            event = subscription.get(min(heartbeat, remaining))
+            if event is None:
+                yield ": heartbeat\n\n"
+            elif event is RESYNC:
+                yield _format(resync_event(last_id))
+            elif event["id"] is None or event["id"] > last_id:
+                # skip what the replay already covered
+                yield _format(event)
+                last_id = event["id"] or last_id
+    finally:
+        broker.unsubscribe(subscription)
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@renderer_classes([JSONRenderer, EventStreamRenderer])
+@project_access_required
+def project_events(request, project):
+    last_event_id = request.headers.get("Last-Event-ID", request.query_params.get("last_event_id"))
+    if last_event_id in (None, ""):
+        since = project.revision
+    else:
+        try:
+            since = int(last_event_id)
+        except ValueError:
+            since = -1
+        if since < 0:
+            return Response({"detail": "Last-Event-ID must be a revision number"}, status=status.HTTP_400_BAD_REQUEST)
+
+    response = StreamingHttpResponse(_stream(project, since), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # don't let a proxy buffer the stream
+    return response
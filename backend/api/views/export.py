@@ -3,12 +3,19 @@ IdeaBin JSON backup export.
 
 GET /api/ideabin/export/           → global export (all user data)
 GET /api/ideabin/export/?context_id=<id>  → context-scoped export
+
+Optional ?encoding=indent (default) | compact | gzip.
+The response is streamed: rows are read in chunks with grouped prefetches
+and written as they are serialised, so memory stays flat for large exports.
 """
 
 import json
+import zlib
 from datetime import datetime
 
-from django.http import JsonResponse
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import JsonResponse, StreamingHttpResponse
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 
@@ -18,13 +25,9 @@ from ..models import (
     Context,
     Formation,
     Idea,
-    IdeaComment,
-    IdeaLegendType,
     IdeaPlacement,
-    IdeaUpvote,
     Legend,
     LegendContextPlacement,
-    LegendType,
     UserCategoryAdoption,
     UserContextAdoption,
     UserLegendAdoption,
@@ -45,25 +48,18 @@ def _ser_legend_type(lt):
     }
 
 
-def _ser_legend(legend, types_qs=None):
-    types = types_qs if types_qs is not None else legend.types.all()
+def _ser_legend(legend):
     return {
         "id": legend.id,
         "owner_id": legend.owner_id,
         "context_id": legend.context_id,
         "name": legend.name,
         "created_at": legend.created_at.isoformat(),
-        "types": [_ser_legend_type(t) for t in types],
+        "types": [_ser_legend_type(t) for t in legend.types.all()],
     }
 
 
-def _ser_idea(idea, placements_qs=None, legend_types_qs=None,
-              upvotes_qs=None, comments_qs=None):
-    placements = placements_qs if placements_qs is not None else idea.placements.all()
-    legend_types = legend_types_qs if legend_types_qs is not None else idea.legend_types.all()
-    upvotes = upvotes_qs if upvotes_qs is not None else idea.upvotes.all()
-    comments = comments_qs if comments_qs is not None else idea.comments.all()
-
+def _ser_idea(idea):
     return {
         "id": idea.id,
         "owner_id": idea.owner_id,
@@ -77,7 +73,7 @@ def _ser_idea(idea, placements_qs=None, legend_types_qs=None,
                 "category_id": p.category_id,
                 "order_index": p.order_index,
             }
-            for p in placements
+            for p in idea.placements.all()
         ],
         "legend_type_assignments": [
             {
@@ -85,7 +81,7 @@ def _ser_idea(idea, placements_qs=None, legend_types_qs=None,
                 "legend_id": lt.legend_id,
                 "legend_type_id": lt.legend_type_id,
             }
-            for lt in legend_types
+            for lt in idea.legend_types.all()
         ],
         "upvotes": [
             {
@@ -93,7 +89,7 @@ def _ser_idea(idea, placements_qs=None, legend_types_qs=None,
                 "user_id": uv.user_id,
                 "created_at": uv.created_at.isoformat(),
             }
-            for uv in upvotes
+            for uv in idea.upvotes.all()
         ],
         "comments": [
             {
@@ -102,7 +98,7 @@ def _ser_idea(idea, placements_qs=None, legend_types_qs=None,
                 "text": c.text,
                 "created_at": c.created_at.isoformat(),
             }
-            for c in comments
+            for c in idea.comments.all()
         ],
     }
 
@@ -154,6 +150,117 @@ def _ser_formation(f):
     }
 
 
+# ─── streaming JSON writer ───────────────────────────────
+
+EXPORT_CHUNK_SIZE = 2000       # rows fetched (and prefetched) per query
+EXPORT_FLUSH_BYTES = 64 * 1024  # text buffered before a chunk is sent
+EXPORT_ENCODINGS = ("indent", "compact", "gzip")
+
+_END = object()
+
+
+class _Rows:
+    """A JSON array whose items are produced lazily, one row at a time."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+
+def _dump(value, indent, level):
+    if indent:
+        text = json.dumps(value, cls=DjangoJSONEncoder, indent=indent)
+        return text.replace("\n", "\n" + " " * (indent * level)) if level else text
+    return json.dumps(value, cls=DjangoJSONEncoder, separators=(",", ":"))
+
+
+def _iter_json(value, indent, level=0):
+    """
+    Yield the JSON text of ``value`` piece by piece. Dicts are walked and
+    _Rows are written item by item; everything else is dumped whole.
+    With ``indent`` the output is identical to json.dumps(..., indent=indent).
+    """
+    if not isinstance(value, (dict, _Rows)):
+        yield _dump(value, indent, level)
+        return
+
+    is_dict = isinstance(value, dict)
+    entries = iter(value.items() if is_dict else value.rows)
+    entry = next(entries, _END)
+    if entry is _END:
+        yield "{}" if is_dict else "[]"
+        return
+
+    pad = "\n" + " " * (indent * (level + 1)) if indent else ""
+    yield ("{" if is_dict else "[") + pad
+    key_sep = ": " if indent else ":"
+    while entry is not _END:
+        if is_dict:
+            key, item = entry
+            yield json.dumps(key) + key_sep
+            yield from _iter_json(item, indent, level + 1)
+        else:
+            yield _dump(entry, indent, level + 1)
+        entry = next(entries, _END)
+        if entry is not _END:
+            yield "," + pad
+    yield ("\n" + " " * (indent * level) if indent else "") + ("}" if is_dict else "]")
+
+
+def _buffered(pieces):
+    buf, size = [], 0
+    for piece in pieces:
+        buf.append(piece)
+        size += len(piece)
+        if size >= EXPORT_FLUSH_BYTES:
+            yield "".join(buf).encode()
+            buf, size = [], 0
+    if buf:
+        yield "".join(buf).encode()
+
+
+def _gzipped(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def _stream_response(document, encoding, filename):
+    chunks = _buffered(_iter_json(document, 2 if encoding == "indent" else None))
+    if encoding == "gzip":
+        response = StreamingHttpResponse(_gzipped(chunks), content_type="application/gzip")
+        response["Content-Disposition"] = f'attachment; filename="{filename}.json.gz"'
+        return response
+    return StreamingHttpResponse(chunks, content_type="application/json")
+
+
+def _chunked(queryset):
+    return queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def _idea_rows(ideas):
+    ideas = ideas.prefetch_related("placements", "legend_types", "upvotes", "comments")
+    return _Rows(_ser_idea(i) for i in _chunked(ideas))
+
+
+def _legend_rows(legends):
+    return _Rows(_ser_legend(l) for l in _chunked(legends.prefetch_related("types")))
+
+
+def _placement_rows(placements, target):
+    return _Rows(
+        {
+            "id": p.id,
+            f"{target}_id": getattr(p, f"{target}_id"),
+            "context_id": p.context_id,
+            "order_index": p.order_index,
+        }
+        for p in _chunked(placements)
+    )
+
+
 # ─── main export view ────────────────────────────────────
 
 @api_view(["GET"])
@@ -161,16 +268,21 @@ def _ser_formation(f):
 def export_ideabin(request):
     user = request.user
     context_id = request.query_params.get("context_id")
+    encoding = request.query_params.get("encoding", "indent")
+    if encoding not in EXPORT_ENCODINGS:
+        return JsonResponse(
+            {"error": f"encoding must be one of: {', '.join(EXPORT_ENCODINGS)}"}, status=400
+        )
 
     if context_id:
-        return _export_context(user, int(context_id))
+        return _export_context(user, int(context_id), encoding)
     else:
-        return _export_global(user)
+        return _export_global(user, encoding)
 
 
 # ─── context-scoped export ───────────────────────────────
 
-def _export_context(user, context_id):
+def _export_context(user, context_id, encoding="indent"):
     try:
         ctx = Context.objects.get(id=context_id, owner=user)
     except Context.DoesNotExist:
@@ -178,38 +290,24 @@ def _export_context(user, context_id):
 
     # categories linked to this context
     cat_placements = CategoryContextPlacement.objects.filter(context=ctx)
-    category_ids = list(cat_placements.values_list("category_id", flat=True))
+    category_ids = cat_placements.values("category_id")
     categories = Category.objects.filter(id__in=category_ids)
 
     # legends linked to this context
     leg_placements = LegendContextPlacement.objects.filter(context=ctx)
-    legend_ids = list(leg_placements.values_list("legend_id", flat=True))
-    legends = Legend.objects.filter(id__in=legend_ids)
-    legend_types = LegendType.objects.filter(legend_id__in=legend_ids)
-
-    # idea placements inside those categories (+ unassigned owned by user)
-    idea_placements = IdeaPlacement.objects.filter(category_id__in=category_ids)
-    idea_ids_from_cats = set(idea_placements.values_list("idea_id", flat=True))
+    legends = Legend.objects.filter(id__in=leg_placements.values("legend_id"))
 
-    # also include unassigned ideas (placement with category=null) owned by user
-    unassigned_placements = IdeaPlacement.objects.filter(
-        idea__owner=user, category__isnull=True
+    # ideas placed inside those categories (+ unassigned ideas owned by user)
+    ideas = Idea.objects.filter(
+        Q(id__in=IdeaPlacement.objects.filter(category_id__in=category_ids).values("idea_id"))
+        | Q(id__in=IdeaPlacement.objects.filter(idea__owner=user, category__isnull=True).values("idea_id"))
     )
-    idea_ids_unassigned = set(unassigned_placements.values_list("idea_id", flat=True))
-
-    all_idea_ids = idea_ids_from_cats | idea_ids_unassigned
-    ideas = Idea.objects.filter(id__in=all_idea_ids)
-
-    # legend type assignments for those ideas
-    idea_legend_types = IdeaLegendType.objects.filter(idea_id__in=all_idea_ids)
-    upvotes = IdeaUpvote.objects.filter(idea_id__in=all_idea_ids)
-    comments = IdeaComment.objects.filter(idea_id__in=all_idea_ids)
 
     # formations for this context
     formations = Formation.objects.filter(owner=user, context=ctx)
 
     # build export
-    data = {
+    document = {
         "schema_version": 1,
         "export_type": "context",
         "exported_at": datetime.utcnow().isoformat() + "Z",
@@ -218,51 +316,32 @@ def _export_context(user, context_id):
 
         "context": _ser_context(ctx),
 
-        "category_context_placements": [
-            {
-                "id": cp.id,
-                "category_id": cp.category_id,
-                "context_id": cp.context_id,
-                "order_index": cp.order_index,
-            }
-            for cp in cat_placements
-        ],
+        "category_context_placements": _placement_rows(cat_placements, "category"),
 
-        "categories": [_ser_category(c) for c in categories],
+        "categories": _Rows(_ser_category(c) for c in _chunked(categories)),
 
-        "legend_context_placements": [
-            {
-                "id": lp.id,
-                "legend_id": lp.legend_id,
-                "context_id": lp.context_id,
-                "order_index": lp.order_index,
-            }
-            for lp in leg_placements
-        ],
+        "legend_context_placements": _placement_rows(leg_placements, "legend"),
 
-        "legends": [_ser_legend(l, legend_types.filter(legend=l)) for l in legends],
+        "legends": _legend_rows(legends),
 
-        "ideas": [_ser_idea(i) for i in ideas],
+        "ideas": _idea_rows(ideas),
 
-        "formations": [_ser_formation(f) for f in formations],
+        "formations": _Rows(_ser_formation(f) for f in _chunked(formations)),
     }
 
-    return JsonResponse(data, json_dumps_params={"indent": 2})
+    return _stream_response(document, encoding, f"ideabin-context-{ctx.id}")
 
 
 # ─── global export ───────────────────────────────────────
 
-def _export_global(user):
+def _export_global(user, encoding="indent"):
     # all contexts owned by user
     contexts = Context.objects.filter(owner=user)
 
     # all categories owned (or adopted) by user
-    owned_cat_ids = set(Category.objects.filter(owner=user).values_list("id", flat=True))
-    adopted_cat_ids = set(
-        UserCategoryAdoption.objects.filter(user=user).values_list("category_id", flat=True)
+    categories = Category.objects.filter(
+        Q(owner=user) | Q(id__in=UserCategoryAdoption.objects.filter(user=user).values("category_id"))
     )
-    all_cat_ids = owned_cat_ids | adopted_cat_ids
-    categories = Category.objects.filter(id__in=all_cat_ids)
 
     # all category-context placements for user's contexts
     cat_ctx_placements = CategoryContextPlacement.objects.filter(
@@ -270,13 +349,9 @@ def _export_global(user):
     )
 
     # all legends owned (or adopted) by user
-    owned_legend_ids = set(Legend.objects.filter(owner=user).values_list("id", flat=True))
-    adopted_legend_ids = set(
-        UserLegendAdoption.objects.filter(user=user).values_list("legend_id", flat=True)
+    legends = Legend.objects.filter(
+        Q(owner=user) | Q(id__in=UserLegendAdoption.objects.filter(user=user).values("legend_id"))
     )
-    all_legend_ids = owned_legend_ids | adopted_legend_ids
-    legends = Legend.objects.filter(id__in=all_legend_ids)
-    legend_types = LegendType.objects.filter(legend_id__in=all_legend_ids)
 
     # legend-context placements
     leg_ctx_placements = LegendContextPlacement.objects.filter(
@@ -285,12 +360,6 @@ def _export_global(user):
 
     # all ideas owned by user
     ideas = Idea.objects.filter(owner=user)
-    idea_ids = set(ideas.values_list("id", flat=True))
-
-    # legend type assignments, upvotes, comments
-    idea_legend_types = IdeaLegendType.objects.filter(idea_id__in=idea_ids)
-    upvotes = IdeaUpvote.objects.filter(idea_id__in=idea_ids)
-    comments_qs = IdeaComment.objects.filter(idea_id__in=idea_ids)
 
     # formations
     formations = Formation.objects.filter(owner=user)
@@ -307,59 +376,43 @@ def _export_global(user):
     except UserShortcuts.DoesNotExist:
         shortcuts = {}
 
-    data = {
+    document = {
         "schema_version": 1,
         "export_type": "global",
         "exported_at": datetime.utcnow().isoformat() + "Z",
         "user_id": user.id,
         "username": user.username,
 
-        "contexts": [_ser_context(c) for c in contexts],
+        "contexts": _Rows(_ser_context(c) for c in _chunked(contexts)),
 
-        "category_context_placements": [
-            {
-                "id": cp.id,
-                "category_id": cp.category_id,
-                "context_id": cp.context_id,
-                "order_index": cp.order_index,
-            }
-            for cp in cat_ctx_placements
-        ],
+        "category_context_placements": _placement_rows(cat_ctx_placements, "category"),
 
-        "categories": [_ser_category(c) for c in categories],
+        "categories": _Rows(_ser_category(c) for c in _chunked(categories)),
 
-        "legend_context_placements": [
-            {
-                "id": lp.id,
-                "legend_id": lp.legend_id,
-                "context_id": lp.context_id,
-                "order_index": lp.order_index,
-            }
-            for lp in leg_ctx_placements
-        ],
+        "legend_context_placements": _placement_rows(leg_ctx_placements, "legend"),
 
-        "legends": [_ser_legend(l, legend_types.filter(legend=l)) for l in legends],
+        "legends": _legend_rows(legends),
 
-        "ideas": [_ser_idea(i) for i in ideas],
+        "ideas": _idea_rows(ideas),
 
-        "formations": [_ser_formation(f) for f in formations],
+        "formations": _Rows(_ser_formation(f) for f in _chunked(formations)),
 
         "adoptions": {
-            "categories": [
+            "categories": _Rows(
                 {"id": a.id, "category_id": a.category_id, "adopted_at": a.adopted_at.isoformat()}
-                for a in category_adoptions
-            ],
-            "legends": [
+                for a in _chunked(category_adoptions)
+            ),
+            "legends": _Rows(
                 {"id": a.id, "legend_id": a.legend_id, "adopted_at": a.adopted_at.isoformat()}
-                for a in legend_adoptions
-            ],
-            "contexts": [
+                for a in _chunked(legend_adoptions)
+            ),
+            "contexts": _Rows(
                 {"id": a.id, "context_id": a.context_id, "adopted_at": a.adopted_at.isoformat()}
-                for a in context_adoptions
-            ],
+                for a in _chunked(context_adoptions)
+            ),
         },
 
         "shortcuts": shortcuts,
     }
 
-    return JsonResponse(data, json_dumps_params={"indent": 2})
+    return _stream_response(document, encoding, "ideabin-export")
@@ -1,5 +1,207 @@
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models import BooleanField, Exists, ExpressionWrapper, OuterRef, Q
+from django.utils.http import parse_etags, quote_etag
+
+from rest_framework import status
+from rest_framework.response import Response
+
 from ..models import Project
 
 
+# ═══════════════════════════════════════════════════════
+#  PROJECT ACCESS
+# ═══════════════════════════════════════════════════════
+#
+# A user can access a project when they own it or are one of its members.
+# Membership is answered with an EXISTS on the (project, user) M2M table,
+# which is covered by its unique index, so we never load the member list.
+#
+# Results are memoised on the user object (request.user lives for exactly
+# one request) and, when PROJECT_ACCESS_CACHE_TIMEOUT is set, the user's full
+# set of accessible project ids is cached across requests. Views that change
+# membership must call invalidate_project_access() for the affected user.
+# That invalidation has to reach every worker process, so the cross-request
+# cache is only used when the default cache is shared (not LocMem / dummy).
+
+_MEMO_ATTR = "_project_access_memo"
+
+
+def _access_filter(user_id):
+    """Q object matching projects the given user owns or is a member of."""
+    membership = Project.members.through.objects.filter(project_id=OuterRef("pk"), user_id=user_id)
+    return Q(owner_id=user_id) | Exists(membership)
+
+
+def shared_cache():
+    """Whether the default cache is shared between processes (not LocMem / dummy)."""
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+
+
+def _cache_timeout():
+    timeout = getattr(settings, "PROJECT_ACCESS_CACHE_TIMEOUT", None)
+    return timeout if timeout and shared_cache() else None
+
+
+def _cache_key(user_id):
+    return f"project_access:{user_id}"
+
+
+def _memo(user):
+    memo = getattr(user, _MEMO_ATTR, None)
+    if memo is None:
+        memo = {}
+        setattr(user, _MEMO_ATTR, memo)
+    return memo
+
+
+def _cached_project_ids(user):
+    """The user's accessible project ids from the cross-request cache, or None
+    when caching is disabled."""
+    timeout = _cache_timeout()
+    if not timeout:
+        return None
+    key = _cache_key(user.id)
+    ids = cache.get(key)
+    if ids is None:
+        ids = set(Project.objects.filter(_access_filter(user.id)).values_list("id", flat=True))
+        cache.set(key, ids, timeout)
+    return ids
+
+
+def invalidate_project_access(user):
+    """Drop cached access answers for ``user`` (a User or a user id)."""
+    user_id = getattr(user, "id", user)
+    if hasattr(user, _MEMO_ATTR):
+        delattr(user, _MEMO_ATTR)
+    if _cache_timeout():
+        cache.delete(_cache_key(user_id))
+
+
+def accessible_project_ids(user, project_ids=None):
+    """
+    Return the set of project ids ``user`` can access, in one query.
+    Pass ``project_ids`` to restrict the answer to those candidates.
+    """
+    if not user or not user.is_authenticated:
+        return set()
+    cached = _cached_project_ids(user)
+    if cached is not None:
+        return cached if project_ids is None else cached & set(project_ids)
+    qs = Project.objects.filter(_access_filter(user.id))
+    if project_ids is not None:
+        qs = qs.filter(id__in=project_ids)
+    ids = set(qs.values_list("id", flat=True))
+    if project_ids is not None:
+        _memo(user).update({pid: pid in ids for pid in project_ids})
+    return ids
+
+
 def user_has_project_access(user, project: Project) -> bool:
-    return project.owner == user or user in project.members.all()
\ No newline at end of file
+    if not user or not user.is_authenticated:
+        return False
+    if project.owner_id == user.id:
+        return True
+    memo = _memo(user)
+    if project.id not in memo:
+        cached = _cached_project_ids(user)
+        if cached is not None:
+            memo[project.id] = project.id in cached
+        else:
+            memo[project.id] = project.members.filter(id=user.id).exists()
+    return memo[project.id]
+
+
+def get_accessible_project(user, project_id):
+    """
+    Fetch a project together with the user's access to it in a single query.
+    Returns (project, has_access); project is None when it doesn't exist.
+    """
+    if not user or not user.is_authenticated:
+        return Project.objects.filter(pk=project_id).first(), False
+    cached = _cached_project_ids(user)
+    if cached is not None:
+        project = Project.objects.filter(pk=project_id).first()
+        return project, project is not None and project.id in cached
+    project = (
+        Project.objects
+        .filter(pk=project_id)
+        .annotate(user_has_access=ExpressionWrapper(_access_filter(user.id), output_field=BooleanField()))
+        .first()
+    )
+    if project is None:
+        return None, False
+    _memo(user)[project.id] = project.user_has_access
+    return project, project.user_has_access
+
+
+def project_access_required(view):
+    """
+    Resolve the ``project_id`` URL argument into a Project the requesting user
+    can access and pass it to the view as ``project``.
+    Answers 404 when the project doesn't exist and 403 without access.
+    Apply below @api_view / @permission_classes.
+    """
+    @wraps(view)
+    def wrapper(request, project_id, *args, **kwargs):
+        project, has_access = get_accessible_project(request.user, project_id)
+        if project is None:
+            return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
+        if not has_access:
+            return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+        return view(request, *args, project=project, **kwargs)
+
+    return wrapper
+
+
+_FLAG_VALUES = {True: True, False: False, None: False, "true": True, "false": False, "1": True, "0": False, "": False}
+
+
+def parse_flag(data, key):
+    """
+    The boolean flag ``key`` of request data: true / false, 1 / 0 or the same
+    as strings; a missing flag is false. Anything else raises ValueError
+    rather than quietly counting as false.
+    """
+    value = data.get(key)
+    if isinstance(value, str):
+        value = value.strip().lower()
+    try:
+        return _FLAG_VALUES[value]  # 1 and 0 hash like True and False
+    except (KeyError, TypeError):
+        raise ValueError(f"{key} must be true or false") from None
+
+
+# ═══════════════════════════════════════════════════════
+#  CONDITIONAL GET
+# ═══════════════════════════════════════════════════════
+
+def project_etag(project):
+    return quote_etag(f"project-{project.id}-rev-{project.revision}")
+
+
+def revision_etag(view):
+    """
+    Tag GET responses of a project-scoped view with an ETag derived from
+    Project.revision and answer a matching If-None-Match with 304 before the
+    view (and its serializers) runs. Apply below @project_access_required.
+    """
+    @wraps(view)
+    def wrapper(request, *args, project, **kwargs):
+        if request.method != "GET":
+            return view(request, *args, project=project, **kwargs)
+        etag = project_etag(project)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response = view(request, *args, project=project, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            for name, value in headers.items():
+                response[name] = value
+        return response
+
+    return wrapper
@@ -1,5 +1,5 @@
 from django.db import models as db_models
-from django.db.models import Max
+from django.db.models import Max, Prefetch
 from django.shortcuts import get_object_or_404
 
 from rest_framework import status
@@ -88,6 +88,22 @@ def _get_accessible_placement(user, placement_id):
     return None
 
 
+def _placements_for_serialization(queryset):
+    """Attach everything IdeaPlacementSerializer reads so serialising a whole
+    list costs a fixed number of queries instead of several per idea."""
+    return queryset.select_related('idea', 'idea__owner', 'category').prefetch_related(
+        'idea__legend_types__legend_type',
+        'idea__legend_types__legend',
+        Prefetch('idea__placements', queryset=IdeaPlacement.objects.select_related('category')),
+        Prefetch('idea__upvotes', queryset=IdeaUpvote.objects.only('id', 'idea_id', 'user_id')),
+        Prefetch('idea__comments', queryset=IdeaComment.objects.only('id', 'idea_id')),
+    )
+
+
+def _placement_sort_key(placement):
+    return (placement.order_index, placement.id)
+
+
 # ═══════════════════════════════════════════════════════
 #  IDEA ENDPOINTS  (user-scoped)
 # ═══════════════════════════════════════════════════════
@@ -278,110 +294,88 @@ def assign_idea_to_category(request):
 @permission_classes([IsAuthenticated])
 def get_all_ideas(request):
     """Return all idea placements for the current user, grouped by category.
-    Also includes placements from adopted categories (read-only)."""
-    # Own placements (exclude archived ideas)
-    _select = ('idea', 'idea__owner', 'category')
-    _prefetch = ('idea__legend_types__legend_type', 'idea__legend_types__legend')
-    placements = IdeaPlacement.objects.filter(idea__owner=request.user, idea__archived=False).select_related(*_select).prefetch_related(*_prefetch)
-    ctx = {'request': request}
-    all_placements_serialized = IdeaPlacementSerializer(placements, many=True, context=ctx).data
+    Also includes placements from adopted categories (read-only).
 
-    # Also include other users' ideas placed in categories owned by current user
-    owned_cat_ids = list(Category.objects.filter(owner=request.user).values_list('id', flat=True))
-    if owned_cat_ids:
-        others_in_owned = IdeaPlacement.objects.filter(
-            category_id__in=owned_cat_ids, idea__archived=False
-        ).exclude(idea__owner=request.user).select_related(*_select).prefetch_related(*_prefetch)
-        all_placements_serialized += IdeaPlacementSerializer(others_in_owned, many=True, context=ctx).data
-
-    unassigned_order = list(
-        IdeaPlacement.objects.filter(idea__owner=request.user, idea__archived=False, category__isnull=True)
-        .order_by('order_index')
-        .values_list('id', flat=True)
-    )
-    category_orders = {}
-    for cat_id in owned_cat_ids:
-        category_orders[cat_id] = list(
-            IdeaPlacement.objects.filter(idea__archived=False, category_id=cat_id)
-            .order_by('order_index')
-            .values_list('id', flat=True)
-        )
+    Every visible placement is fetched in a single query and the per-category
+    / per-context orderings are built in memory, so the number of queries
+    does not grow with the number of categories or contexts."""
+    user = request.user
 
-    # Adopted category placements
-    adopted_cat_ids = list(UserCategoryAdoption.objects.filter(user=request.user).values_list('category_id', flat=True))
-    if adopted_cat_ids:
-        adopted_placements = IdeaPlacement.objects.filter(category_id__in=adopted_cat_ids).select_related(*_select).prefetch_related(*_prefetch)
-        adopted_data = IdeaPlacementSerializer(adopted_placements, many=True, context=ctx).data
-        all_placements_serialized += adopted_data
-        for cat_id in adopted_cat_ids:
-            category_orders[cat_id] = list(
-                IdeaPlacement.objects.filter(category_id=cat_id)
-                .order_by('order_index')
-                .values_list('id', flat=True)
-            )
+    # ── Visible category / context ids ──
+    owned_cat_ids = list(Category.objects.filter(owner=user).values_list('id', flat=True))
+    adopted_cat_ids = list(UserCategoryAdoption.objects.filter(user=user).values_list('category_id', flat=True))
+    adopted_ctx_ids = list(UserContextAdoption.objects.filter(user=user).values_list('context_id', flat=True))
+    own_ctx_ids = list(Context.objects.filter(owner=user).values_list('id', flat=True))
+    all_ctx_ids = list(set(adopted_ctx_ids + own_ctx_ids))
 
-    # Categories from adopted contexts + own contexts (other users' categories placed there)
-    adopted_ctx_ids = list(UserContextAdoption.objects.filter(user=request.user).values_list('context_id', flat=True))
-    own_ctx_ids_for_cats = list(Context.objects.filter(owner=request.user).values_list('id', flat=True))
-    all_member_ctx_ids = list(set(adopted_ctx_ids + own_ctx_ids_for_cats))
-    if all_member_ctx_ids:
-        ctx_cat_ids = list(CategoryContextPlacement.objects.filter(context_id__in=all_member_ctx_ids).values_list('category_id', flat=True))
-        already_included = set(owned_cat_ids) | set(adopted_cat_ids)
-        new_ctx_cat_ids = [cid for cid in ctx_cat_ids if cid not in already_included]
-        if new_ctx_cat_ids:
-            ctx_placements = IdeaPlacement.objects.filter(category_id__in=new_ctx_cat_ids).select_related(*_select).prefetch_related(*_prefetch)
-            ctx_data = IdeaPlacementSerializer(ctx_placements, many=True, context=ctx).data
-            all_placements_serialized += ctx_data
-            for cat_id in new_ctx_cat_ids:
-                category_orders[cat_id] = list(
-                    IdeaPlacement.objects.filter(category_id=cat_id)
-                    .order_by('order_index')
-                    .values_list('id', flat=True)
-                )
+    already_included = set(owned_cat_ids) | set(adopted_cat_ids)
+    ctx_cat_ids = []
+    if all_ctx_ids:
+        for cid in CategoryContextPlacement.objects.filter(context_id__in=all_ctx_ids).values_list('category_id', flat=True):
+            if cid not in already_included:
+                already_included.add(cid)
+                ctx_cat_ids.append(cid)
+    shared_cat_ids = adopted_cat_ids + ctx_cat_ids
+
+    # ── All visible placements in one query ──
+    # Own ideas and ideas placed in owned categories hide archived ideas;
+    # adopted / context categories show their full contents (read-only).
+    visible = db_models.Q(idea__owner=user, idea__archived=False)
+    if owned_cat_ids:
+        visible |= db_models.Q(category_id__in=owned_cat_ids, idea__archived=False)
+    if shared_cat_ids:
+        visible |= db_models.Q(category_id__in=shared_cat_ids)
+    placements = list(_placements_for_serialization(IdeaPlacement.objects.filter(visible)))
+
+    unassigned = []
+    category_orders = {cat_id: [] for cat_id in owned_cat_ids + shared_cat_ids}
+    for p in placements:
+        if p.category_id is None:
+            if p.idea.owner_id == user.id:
+                unassigned.append(p)
+        elif p.category_id in category_orders:
+            category_orders[p.category_id].append(p)
+    unassigned_order = [p.id for p in sorted(unassigned, key=_placement_sort_key)]
+    for cat_id, cat_placements in category_orders.items():
+        category_orders[cat_id] = [p.id for p in sorted(cat_placements, key=_placement_sort_key)]
 
     # ── Context-linked ideas ──
     # For all contexts the user owns or has adopted, build context → [idea_ids] mapping
     # and include other users' ideas that are linked to those contexts.
-    own_ctx_ids = list(Context.objects.filter(owner=request.user).values_list('id', flat=True))
-    all_ctx_ids = list(set(own_ctx_ids + adopted_ctx_ids))
     context_idea_orders = {}
     if all_ctx_ids:
-        for ctx_id in all_ctx_ids:
-            idea_ids = list(
-                IdeaContextPlacement.objects.filter(context_id=ctx_id)
-                .order_by('order_index')
-                .values_list('idea_id', flat=True)
-            )
-            if idea_ids:
-                context_idea_orders[ctx_id] = idea_ids
+        rows = (
+            IdeaContextPlacement.objects.filter(context_id__in=all_ctx_ids)
+            .order_by('context_id', 'order_index', 'id')
+            .values_list('context_id', 'idea_id')
+        )
+        for ctx_id, idea_id in rows:
+            context_idea_orders.setdefault(ctx_id, []).append(idea_id)
 
         # Include placements for other users' ideas linked to user's contexts
         # that aren't already in the response
-        already_included_idea_ids = set(p['idea']['id'] for p in all_placements_serialized)
+        already_included_idea_ids = {p.idea_id for p in placements}
         all_context_idea_ids = set()
         for ids in context_idea_orders.values():
             all_context_idea_ids.update(ids)
         missing_idea_ids = all_context_idea_ids - already_included_idea_ids
         if missing_idea_ids:
             # Get an unassigned placement per missing idea so the frontend has idea data
-            extra_placements = (
+            extra_placements = _placements_for_serialization(
                 IdeaPlacement.objects.filter(idea_id__in=missing_idea_ids, idea__archived=False)
-                .select_related('idea', 'idea__owner', 'category')
-                .prefetch_related('idea__legend_types__legend_type', 'idea__legend_types__legend')
                 .order_by('idea_id', 'order_index')
             )
-            # Deduplicate: one placement per idea (prefer unassigned, i.e. category=null)
+            # Deduplicate: one placement per idea
             seen_idea_ids = set()
-            deduped = []
             for ep in extra_placements:
                 if ep.idea_id not in seen_idea_ids:
                     seen_idea_ids.add(ep.idea_id)
-                    deduped.append(ep)
-            extra_data = IdeaPlacementSerializer(deduped, many=True, context=ctx).data
-            all_placements_serialized += extra_data
+                    placements.append(ep)
+
+    data = IdeaPlacementSerializer(placements, many=True, context={'request': request}).data
 
     return Response({
-        "data": all_placements_serialized,
+        "data": data,
         "order": unassigned_order,
         "category_orders": category_orders,
         "context_idea_orders": context_idea_orders,
@@ -3,10 +3,15 @@ IdeaBin JSON backup import / restore.
 
 POST /api/ideabin/import/                  → global restore (all user data)
 POST /api/ideabin/import/?context_id=<id>  → context-scoped restore
+
+Add ?stream=1 to a file upload to read it incrementally, section by section,
+instead of parsing the whole backup into memory first.
 """
 
 import json
+import time
 
+from django.conf import settings
 from django.db import transaction
 from django.http import JsonResponse
 from rest_framework.decorators import api_view, permission_classes
@@ -30,10 +35,14 @@ from ..models import (
     UserLegendAdoption,
     UserShortcuts,
 )
+from .json_stream import JSONStreamError, JSONStreamReader
 
 
 CURRENT_SCHEMA_VERSION = 1
 
+# Rows per INSERT statement when bulk-creating imported entities.
+IMPORT_BATCH_SIZE = 1000
+
 # Top-level keys expected per export_type
 _CONTEXT_REQUIRED_KEYS = {
     "schema_version", "export_type", "exported_at", "user_id", "username",
@@ -45,7 +54,7 @@ _GLOBAL_REQUIRED_KEYS = {
     "schema_version", "export_type", "exported_at", "user_id", "username",
     "contexts", "category_context_placements", "categories",
     "legend_context_placements", "legends", "ideas", "formations",
-    "adoptions", "shortcuts", "filter_presets",
+    "adoptions", "shortcuts",
 }
 
 
@@ -76,6 +85,66 @@ def _validate_keys(data, required_keys, label):
     return None
 
 
+# Fields every row of a section must carry.
+_ROW_FIELDS = {
+    "contexts": ("id", "name"),
+    "legends": ("id", "name"),
+    "legend_context_placements": ("legend_id",),
+    "categories": ("id", "name"),
+    "category_context_placements": ("category_id",),
+    "ideas": ("id",),
+    "formations": ("name",),
+}
+
+
+def _require(rows, label, *fields):
+    for i, row in enumerate(rows):
+        if not isinstance(row, dict):
+            return f"{label}[{i}] must be an object."
+        missing = [f for f in fields if f not in row]
+        if missing:
+            return f"{label}[{i}] is missing {missing}."
+    return None
+
+
+def _validate_section(section, rows):
+    """Check the rows of one section (and their nested rows). Returns error string or None."""
+    err = _require(rows, section, *_ROW_FIELDS[section])
+    if err:
+        return err
+    if section == "legends":
+        for leg in rows:
+            err = _require(leg.get("types", []), f"legend {leg['id']} types", "id", "name")
+            if err:
+                return err
+    elif section == "ideas":
+        for idea in rows:
+            label = f"idea {idea['id']}"
+            err = (
+                _require(idea.get("placements", []), f"{label} placements", "category_id")
+                or _require(idea.get("legend_type_assignments", []), f"{label} legend_type_assignments",
+                            "legend_id", "legend_type_id")
+                or _require(idea.get("upvotes", []), f"{label} upvotes")
+                or _require(idea.get("comments", []), f"{label} comments")
+            )
+            if err:
+                return err
+    return None
+
+
+def _validate_rows(data):
+    """
+    Check every row the import will touch before anything is written, so a
+    malformed backup is rejected up front instead of failing mid-insert.
+    """
+    for section in _ROW_FIELDS:
+        if section in data:
+            err = _validate_section(section, data[section])
+            if err:
+                return err
+    return None
+
+
 def _validate_context_payload(data):
     err = _validate_common(data)
     if err:
@@ -90,7 +159,7 @@ def _validate_context_payload(data):
                     "category_context_placements", "legend_context_placements"):
         if not isinstance(data.get(lst_key), list):
             return f"'{lst_key}' must be a list."
-    return None
+    return _validate_rows(data)
 
 
 def _validate_global_payload(data):
@@ -106,7 +175,7 @@ def _validate_global_payload(data):
             return f"'{lst_key}' must be a list."
     if not isinstance(data.get("adoptions"), dict):
         return "'adoptions' must be an object."
-    return None
+    return _validate_rows(data)
 
 
 # ─── main import view ────────────────────────────────────
@@ -115,6 +184,13 @@ def _validate_global_payload(data):
 @permission_classes([IsAuthenticated])
 def import_ideabin(request):
     user = request.user
+    context_id = request.query_params.get("context_id")
+
+    if request.query_params.get("stream") in ("1", "true"):
+        upload = request.FILES.get("file")
+        if not upload:
+            return JsonResponse({"error": "Streaming import requires a file upload."}, status=400)
+        return _import_stream(user, upload, context_id)
 
     # Accept either multipart file upload or raw JSON body
     if request.FILES.get("file"):
@@ -135,7 +211,6 @@ def import_ideabin(request):
         return JsonResponse({"error": err}, status=400)
 
     export_type = data["export_type"]
-    context_id = request.query_params.get("context_id")
 
     if export_type == "context":
         err = _validate_context_payload(data)
@@ -158,6 +233,274 @@ def import_ideabin(request):
     return JsonResponse({"error": "Unknown export_type."}, status=400)
 
 
+# ─── bulk insert pipeline ────────────────────────────────
+
+class _ImportState:
+    """
+    Id maps and row counts shared by every section of one import.
+    With ``target_ctx`` every context reference points at that context
+    (context-scoped import); otherwise it goes through ``ctx_id_map``.
+    """
+
+    def __init__(self, user, target_ctx=None):
+        self.user = user
+        self.target_ctx = target_ctx
+        self.ctx_id_map = {}
+        self.legend_id_map = {}
+        self.legend_type_id_map = {}
+        self.cat_id_map = {}
+        self.rows = {}
+        self.started = time.perf_counter()
+
+    def ctx_for(self, old_ctx_id):
+        return self.target_ctx.id if self.target_ctx else self.ctx_id_map.get(old_ctx_id)
+
+    def stats(self):
+        seconds = time.perf_counter() - self.started
+        total = sum(self.rows.values())
+        return {
+            "rows": total,
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(total / seconds) if seconds else total,
+            "entities": self.rows,
+        }
+
+
+def _bulk_insert(model, objs, state, label):
+    """bulk_create ``objs`` in chunks; returns them with primary keys set."""
+    created = model.objects.bulk_create(objs, batch_size=IMPORT_BATCH_SIZE)
+    state.rows[label] = state.rows.get(label, 0) + len(created)
+    return created
+
+
+def _bulk_insert_mapped(model, rows, build, state, label):
+    """
+    Build one instance per source row, bulk-insert them and return
+    {old_id: new_id} for the inserted rows.
+    """
+    pairs = [(row["id"], build(row)) for row in rows]
+    created = _bulk_insert(model, [obj for _, obj in pairs], state, label)
+    return {old_id: obj.id for (old_id, _), obj in zip(pairs, created)}
+
+
+def _build_context(user, ctx_data):
+    return Context(
+        owner=user,
+        name=ctx_data["name"],
+        x=ctx_data.get("x", 0),
+        y=ctx_data.get("y", 0),
+        width=ctx_data.get("width", 200),
+        height=ctx_data.get("height", 200),
+        z_index=ctx_data.get("z_index", 0),
+        is_public=ctx_data.get("is_public", False),
+        is_default=ctx_data.get("is_default", False),
+        color=ctx_data.get("color"),
+        filter_state=ctx_data.get("filter_state"),
+    )
+
+
+def _insert_contexts(state, rows):
+    state.ctx_id_map.update(_bulk_insert_mapped(
+        Context, rows, lambda ctx_data: _build_context(state.user, ctx_data), state, "contexts",
+    ))
+
+
+def _insert_legends(state, rows):
+    """Legends + their legend types."""
+    state.legend_id_map.update(_bulk_insert_mapped(
+        Legend, rows,
+        lambda leg: Legend(owner=state.user, context_id=state.ctx_for(leg.get("context_id")), name=leg["name"]),
+        state, "legends",
+    ))
+    type_rows = [
+        (lt, state.legend_id_map[leg["id"]])
+        for leg in rows
+        for lt in leg.get("types", [])
+    ]
+    new_types = _bulk_insert(LegendType, [
+        LegendType(
+            legend_id=legend_id,
+            name=lt["name"],
+            color=lt.get("color", "#ffffff"),
+            icon=lt.get("icon"),
+            order_index=lt.get("order_index", 0),
+        )
+        for lt, legend_id in type_rows
+    ], state, "legend_types")
+    state.legend_type_id_map.update(
+        (lt["id"], obj.id) for (lt, _), obj in zip(type_rows, new_types)
+    )
+
+
+def _insert_legend_context_placements(state, rows):
+    _bulk_insert(LegendContextPlacement, [
+        LegendContextPlacement(
+            legend_id=state.legend_id_map[lcp["legend_id"]],
+            context_id=state.ctx_for(lcp.get("context_id")),
+            order_index=lcp.get("order_index", 0),
+        )
+        for lcp in rows
+        if state.legend_id_map.get(lcp["legend_id"]) and state.ctx_for(lcp.get("context_id"))
+    ], state, "legend_context_placements")
+
+
+def _insert_categories(state, rows):
+    state.cat_id_map.update(_bulk_insert_mapped(
+        Category, rows,
+        lambda cat: Category(
+            owner=state.user,
+            name=cat["name"],
+            x=cat.get("x", 0),
+            y=cat.get("y", 0),
+            width=cat.get("width", 100),
+            height=cat.get("height", 100),
+            z_index=cat.get("z_index", 0),
+            archived=cat.get("archived", False),
+            is_public=cat.get("is_public", False),
+            filter_config=cat.get("filter_config"),
+        ),
+        state, "categories",
+    ))
+
+
+def _insert_category_context_placements(state, rows):
+    _bulk_insert(CategoryContextPlacement, [
+        CategoryContextPlacement(
+            category_id=state.cat_id_map[ccp["category_id"]],
+            context_id=state.ctx_for(ccp.get("context_id")),
+            order_index=ccp.get("order_index", 0),
+        )
+        for ccp in rows
+        if state.cat_id_map.get(ccp["category_id"]) and state.ctx_for(ccp.get("context_id"))
+    ], state, "category_context_placements")
+
+
+def _insert_ideas(state, rows):
+    """Ideas + their placements, legend type assignments, upvotes and comments."""
+    user = state.user
+    idea_id_map = _bulk_insert_mapped(
+        Idea, rows,
+        lambda idea_data: Idea(
+            owner=user,
+            title=idea_data.get("title", ""),
+            description=idea_data.get("description", ""),
+            archived=idea_data.get("archived", False),
+        ),
+        state, "ideas",
+    )
+
+    placements, assignments, upvotes, comments = [], [], [], []
+    for idea_data in rows:
+        idea_id = idea_id_map[idea_data["id"]]
+        for pl in idea_data.get("placements", []):
+            placements.append(IdeaPlacement(
+                idea_id=idea_id,
+                category_id=state.cat_id_map.get(pl["category_id"]) if pl["category_id"] else None,
+                order_index=pl.get("order_index", 0),
+            ))
+        for lta in idea_data.get("legend_type_assignments", []):
+            new_leg_id = state.legend_id_map.get(lta["legend_id"])
+            new_lt_id = state.legend_type_id_map.get(lta["legend_type_id"])
+            if new_leg_id and new_lt_id:
+                assignments.append(IdeaLegendType(
+                    idea_id=idea_id, legend_id=new_leg_id, legend_type_id=new_lt_id,
+                ))
+        # upvotes and comments: only those of the importing user
+        if any(uv.get("user_id") == user.id for uv in idea_data.get("upvotes", [])):
+            upvotes.append(IdeaUpvote(user=user, idea_id=idea_id))
+        for cmt in idea_data.get("comments", []):
+            if cmt.get("user_id") == user.id:
+                comments.append(IdeaComment(user=user, idea_id=idea_id, text=cmt.get("text", "")))
+
+    _bulk_insert(IdeaPlacement, placements, state, "idea_placements")
+    _bulk_insert(IdeaLegendType, assignments, state, "legend_type_assignments")
+    _bulk_insert(IdeaUpvote, upvotes, state, "upvotes")
+    _bulk_insert(IdeaComment, comments, state, "comments")
+
+
+def _insert_formations(state, rows):
+    """Formations, with their state JSON remapped through the same id maps."""
+    _bulk_insert(Formation, [
+        Formation(
+            owner=state.user,
+            context_id=state.ctx_for(fm.get("context_id")),
+            name=fm["name"],
+            state=_remap_formation_state(
+                fm.get("state", {}), state.cat_id_map, state.ctx_id_map,
+                state.legend_id_map, state.legend_type_id_map
+            ),
+            is_default=fm.get("is_default", False),
+        )
+        for fm in rows
+    ], state, "formations")
+
+
+# Sections in insertion order, with the sections each one references.
+_SECTION_INSERTERS = {
+    "contexts": (_insert_contexts, ()),
+    "legends": (_insert_legends, ("contexts",)),
+    "legend_context_placements": (_insert_legend_context_placements, ("contexts", "legends")),
+    "categories": (_insert_categories, ()),
+    "category_context_placements": (_insert_category_context_placements, ("contexts", "categories")),
+    "ideas": (_insert_ideas, ("legends", "categories")),
+    "formations": (_insert_formations, ("contexts", "legends", "categories")),
+}
+
+
+def _import_entities(state, data):
+    """Insert every section present in ``data`` with one bulk_create per entity class."""
+    for section, (insert, _) in _SECTION_INSERTERS.items():
+        if section in data:
+            insert(state, data[section])
+
+
+def _start_context_import(user, ctx_data, context_id):
+    """Replace (or create) the target context; returns the import state for it."""
+    if context_id:
+        try:
+            existing = Context.objects.get(id=int(context_id), owner=user)
+        except Context.DoesNotExist:
+            raise _ImportRejected("Target context not found.", status=404)
+        # Wipe existing context data
+        _delete_context_data(user, existing)
+        existing.delete()
+
+    new_ctx = _build_context(user, ctx_data)
+    new_ctx.save()
+    state = _ImportState(user, target_ctx=new_ctx)
+    state.ctx_id_map[ctx_data["id"]] = new_ctx.id
+    state.rows["contexts"] = 1
+    return state
+
+
+def _finish_global_import(user, shortcuts_data, legacy_presets):
+    # ── Shortcuts ──
+    obj, _ = UserShortcuts.objects.get_or_create(user=user)
+    obj.shortcuts = shortcuts_data
+    obj.save()
+
+    # ── Migrate legacy top-level filter_presets into the default context ──
+    if legacy_presets:
+        # Find the default context (or first context) and inject presets into its filter_state
+        default_ctx = Context.objects.filter(owner=user, is_default=True).first()
+        if not default_ctx:
+            default_ctx = Context.objects.filter(owner=user).first()
+        if default_ctx:
+            fs = default_ctx.filter_state or {}
+            if not fs.get("filter_presets"):
+                fs["filter_presets"] = legacy_presets
+                default_ctx.filter_state = fs
+                default_ctx.save()
+
+
+class _ImportRejected(Exception):
+    """Abort an import (rolling back its transaction) with a client error."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
 # ─── context-scoped import ───────────────────────────────
 
 def _import_context(user, data, context_id):
@@ -165,165 +508,20 @@ def _import_context(user, data, context_id):
     Restore a single context from a context-type export.
     If context_id is given, replace that context. Otherwise create new.
     """
-    ctx_data = data["context"]
-
     try:
         with transaction.atomic():
-            # ── 1. Determine target context ──
-            if context_id:
-                target_ctx_id = int(context_id)
-                try:
-                    existing = Context.objects.get(id=target_ctx_id, owner=user)
-                except Context.DoesNotExist:
-                    return JsonResponse({"error": "Target context not found."}, status=404)
-                # Wipe existing context data
-                _delete_context_data(user, existing)
-                existing.delete()
-
-            # ── 2. Create context (new ID) ──
-            old_ctx_id = ctx_data["id"]
-            new_ctx = Context.objects.create(
-                owner=user,
-                name=ctx_data["name"],
-                x=ctx_data.get("x", 0),
-                y=ctx_data.get("y", 0),
-                width=ctx_data.get("width", 200),
-                height=ctx_data.get("height", 200),
-                z_index=ctx_data.get("z_index", 0),
-                is_public=ctx_data.get("is_public", False),
-                is_default=ctx_data.get("is_default", False),
-                color=ctx_data.get("color"),
-                filter_state=ctx_data.get("filter_state"),
-            )
-            ctx_id_map = {old_ctx_id: new_ctx.id}
-
-            # ── 3. Legends + legend types ──
-            legend_id_map = {}
-            legend_type_id_map = {}
-            for leg in data["legends"]:
-                new_legend = Legend.objects.create(
-                    owner=user,
-                    context=new_ctx,
-                    name=leg["name"],
-                )
-                legend_id_map[leg["id"]] = new_legend.id
-
-                for lt in leg.get("types", []):
-                    new_lt = LegendType.objects.create(
-                        legend=new_legend,
-                        name=lt["name"],
-                        color=lt.get("color", "#ffffff"),
-                        icon=lt.get("icon"),
-                        order_index=lt.get("order_index", 0),
-                    )
-                    legend_type_id_map[lt["id"]] = new_lt.id
-
-            # ── 4. Legend-context placements ──
-            for lcp in data["legend_context_placements"]:
-                new_leg_id = legend_id_map.get(lcp["legend_id"])
-                if new_leg_id:
-                    LegendContextPlacement.objects.create(
-                        legend_id=new_leg_id,
-                        context=new_ctx,
-                        order_index=lcp.get("order_index", 0),
-                    )
-
-            # ── 5. Categories ──
-            cat_id_map = {}
-            for cat in data["categories"]:
-                new_cat = Category.objects.create(
-                    owner=user,
-                    name=cat["name"],
-                    x=cat.get("x", 0),
-                    y=cat.get("y", 0),
-                    width=cat.get("width", 100),
-                    height=cat.get("height", 100),
-                    z_index=cat.get("z_index", 0),
-                    archived=cat.get("archived", False),
-                    is_public=cat.get("is_public", False),
-                    filter_config=cat.get("filter_config"),
-                )
-                cat_id_map[cat["id"]] = new_cat.id
-
-            # ── 6. Category-context placements ──
-            for ccp in data["category_context_placements"]:
-                new_cat_id = cat_id_map.get(ccp["category_id"])
-                if new_cat_id:
-                    CategoryContextPlacement.objects.create(
-                        category_id=new_cat_id,
-                        context=new_ctx,
-                        order_index=ccp.get("order_index", 0),
-                    )
-
-            # ── 7. Ideas + placements + assignments ──
-            idea_id_map = {}
-            for idea_data in data["ideas"]:
-                new_idea = Idea.objects.create(
-                    owner=user,
-                    title=idea_data.get("title", ""),
-                    description=idea_data.get("description", ""),
-                    archived=idea_data.get("archived", False),
-                )
-                idea_id_map[idea_data["id"]] = new_idea.id
-
-                # placements
-                for pl in idea_data.get("placements", []):
-                    new_cat_id = cat_id_map.get(pl["category_id"]) if pl["category_id"] else None
-                    IdeaPlacement.objects.create(
-                        idea=new_idea,
-                        category_id=new_cat_id,
-                        order_index=pl.get("order_index", 0),
-                    )
-
-                # legend type assignments
-                for lta in idea_data.get("legend_type_assignments", []):
-                    new_leg_id = legend_id_map.get(lta["legend_id"])
-                    new_lt_id = legend_type_id_map.get(lta["legend_type_id"])
-                    if new_leg_id and new_lt_id:
-                        IdeaLegendType.objects.create(
-                            idea=new_idea,
-                            legend_id=new_leg_id,
-                            legend_type_id=new_lt_id,
-                        )
-
-                # upvotes (only for the importing user)
-                for uv in idea_data.get("upvotes", []):
-                    if uv.get("user_id") == user.id:
-                        IdeaUpvote.objects.create(
-                            user=user,
-                            idea=new_idea,
-                        )
-
-                # comments (only from the importing user)
-                for cmt in idea_data.get("comments", []):
-                    if cmt.get("user_id") == user.id:
-                        IdeaComment.objects.create(
-                            user=user,
-                            idea=new_idea,
-                            text=cmt.get("text", ""),
-                        )
-
-            # ── 8. Formations ──
-            for fm in data["formations"]:
-                # Remap IDs inside formation state JSON
-                state = _remap_formation_state(
-                    fm.get("state", {}), cat_id_map, ctx_id_map,
-                    legend_id_map, legend_type_id_map
-                )
-                Formation.objects.create(
-                    owner=user,
-                    context=new_ctx,
-                    name=fm["name"],
-                    state=state,
-                    is_default=fm.get("is_default", False),
-                )
+            state = _start_context_import(user, data["context"], context_id)
+            _import_entities(state, data)
 
         return JsonResponse({
             "status": "ok",
             "message": "Context restored successfully.",
-            "context_id": new_ctx.id,
+            "context_id": state.target_ctx.id,
+            "stats": state.stats(),
         })
 
+    except _ImportRejected as exc:
+        return JsonResponse({"error": str(exc)}, status=exc.status)
     except Exception as exc:
         return JsonResponse({"error": f"Import failed: {exc}"}, status=500)
 
@@ -334,178 +532,146 @@ def _import_global(user, data):
     """
     Full restore: delete ALL user IdeaBin data, recreate from JSON.
     """
+    state = _ImportState(user)
+
     try:
         with transaction.atomic():
-            # ── 1. Delete everything ──
             _delete_all_ideabin_data(user)
-
-            # ── 2. Contexts ──
-            ctx_id_map = {}
-            for ctx_data in data["contexts"]:
-                new_ctx = Context.objects.create(
-                    owner=user,
-                    name=ctx_data["name"],
-                    x=ctx_data.get("x", 0),
-                    y=ctx_data.get("y", 0),
-                    width=ctx_data.get("width", 200),
-                    height=ctx_data.get("height", 200),
-                    z_index=ctx_data.get("z_index", 0),
-                    is_public=ctx_data.get("is_public", False),
-                    is_default=ctx_data.get("is_default", False),
-                    color=ctx_data.get("color"),
-                    filter_state=ctx_data.get("filter_state"),
-                )
-                ctx_id_map[ctx_data["id"]] = new_ctx.id
-
-            # ── 3. Legends + legend types ──
-            legend_id_map = {}
-            legend_type_id_map = {}
-            for leg in data["legends"]:
-                # Resolve context FK
-                new_ctx_id = ctx_id_map.get(leg.get("context_id"))
-                new_legend = Legend.objects.create(
-                    owner=user,
-                    context_id=new_ctx_id,
-                    name=leg["name"],
-                )
-                legend_id_map[leg["id"]] = new_legend.id
-
-                for lt in leg.get("types", []):
-                    new_lt = LegendType.objects.create(
-                        legend=new_legend,
-                        name=lt["name"],
-                        color=lt.get("color", "#ffffff"),
-                        icon=lt.get("icon"),
-                        order_index=lt.get("order_index", 0),
-                    )
-                    legend_type_id_map[lt["id"]] = new_lt.id
-
-            # ── 4. Legend-context placements ──
-            for lcp in data["legend_context_placements"]:
-                new_leg_id = legend_id_map.get(lcp["legend_id"])
-                new_ctx_id = ctx_id_map.get(lcp["context_id"])
-                if new_leg_id and new_ctx_id:
-                    LegendContextPlacement.objects.create(
-                        legend_id=new_leg_id,
-                        context_id=new_ctx_id,
-                        order_index=lcp.get("order_index", 0),
-                    )
-
-            # ── 5. Categories ──
-            cat_id_map = {}
-            for cat in data["categories"]:
-                new_cat = Category.objects.create(
-                    owner=user,
-                    name=cat["name"],
-                    x=cat.get("x", 0),
-                    y=cat.get("y", 0),
-                    width=cat.get("width", 100),
-                    height=cat.get("height", 100),
-                    z_index=cat.get("z_index", 0),
-                    archived=cat.get("archived", False),
-                    is_public=cat.get("is_public", False),
-                    filter_config=cat.get("filter_config"),
-                )
-                cat_id_map[cat["id"]] = new_cat.id
-
-            # ── 6. Category-context placements ──
-            for ccp in data["category_context_placements"]:
-                new_cat_id = cat_id_map.get(ccp["category_id"])
-                new_ctx_id = ctx_id_map.get(ccp["context_id"])
-                if new_cat_id and new_ctx_id:
-                    CategoryContextPlacement.objects.create(
-                        category_id=new_cat_id,
-                        context_id=new_ctx_id,
-                        order_index=ccp.get("order_index", 0),
-                    )
-
-            # ── 7. Ideas + placements + assignments ──
-            idea_id_map = {}
-            for idea_data in data["ideas"]:
-                new_idea = Idea.objects.create(
-                    owner=user,
-                    title=idea_data.get("title", ""),
-                    description=idea_data.get("description", ""),
-                    archived=idea_data.get("archived", False),
-                )
-                idea_id_map[idea_data["id"]] = new_idea.id
-
-                # placements
-                for pl in idea_data.get("placements", []):
-                    new_cat_id = cat_id_map.get(pl["category_id"]) if pl["category_id"] else None
-                    IdeaPlacement.objects.create(
-                        idea=new_idea,
-                        category_id=new_cat_id,
-                        order_index=pl.get("order_index", 0),
-                    )
-
-                # legend type assignments
-                for lta in idea_data.get("legend_type_assignments", []):
-                    new_leg_id = legend_id_map.get(lta["legend_id"])
-                    new_lt_id = legend_type_id_map.get(lta["legend_type_id"])
-                    if new_leg_id and new_lt_id:
-                        IdeaLegendType.objects.create(
-                            idea=new_idea,
-                            legend_id=new_leg_id,
-                            legend_type_id=new_lt_id,
-                        )
-
-                # upvotes (only for this user)
-                for uv in idea_data.get("upvotes", []):
-                    if uv.get("user_id") == user.id:
-                        IdeaUpvote.objects.create(user=user, idea=new_idea)
-
-                # comments (only from this user)
-                for cmt in idea_data.get("comments", []):
-                    if cmt.get("user_id") == user.id:
-                        IdeaComment.objects.create(
-                            user=user, idea=new_idea, text=cmt.get("text", ""),
-                        )
-
-            # ── 8. Formations ──
-            for fm in data["formations"]:
-                new_ctx_id = ctx_id_map.get(fm.get("context_id"))
-                state = _remap_formation_state(
-                    fm.get("state", {}), cat_id_map, ctx_id_map,
-                    legend_id_map, legend_type_id_map
-                )
-                Formation.objects.create(
-                    owner=user,
-                    context_id=new_ctx_id,
-                    name=fm["name"],
-                    state=state,
-                    is_default=fm.get("is_default", False),
-                )
-
-            # ── 9. Shortcuts ──
-            shortcuts_data = data.get("shortcuts", {})
-            obj, _ = UserShortcuts.objects.get_or_create(user=user)
-            obj.shortcuts = shortcuts_data
-            obj.save()
-
-            # ── 9b. Migrate legacy top-level filter_presets into the default context ──
-            legacy_presets = data.get("filter_presets", [])
-            if legacy_presets:
-                # Find the default context (or first context) and inject presets into its filter_state
-                default_ctx = Context.objects.filter(owner=user, is_default=True).first()
-                if not default_ctx:
-                    default_ctx = Context.objects.filter(owner=user).first()
-                if default_ctx:
-                    fs = default_ctx.filter_state or {}
-                    if not fs.get("filter_presets"):
-                        fs["filter_presets"] = legacy_presets
-                        default_ctx.filter_state = fs
-                        default_ctx.save()
+            _import_entities(state, data)
+            _finish_global_import(user, data.get("shortcuts", {}), data.get("filter_presets", []))
 
         return JsonResponse({
             "status": "ok",
             "message": "Full IdeaBin restore completed successfully.",
+            "stats": state.stats(),
         })
 
     except Exception as exc:
         return JsonResponse({"error": f"Import failed: {exc}"}, status=500)
 
 
+# ─── streaming import ────────────────────────────────────
+
+def _stream_chunks(items, reader):
+    """Group rows into chunks of IMPORT_BATCH_SIZE rows or the memory ceiling, whichever comes first."""
+    chunk, size = [], 0
+    for row in items:
+        chunk.append(row)
+        size += reader.last_size
+        if len(chunk) >= IMPORT_BATCH_SIZE or size >= settings.IDEABIN_IMPORT_MAX_BUFFER_BYTES:
+            yield chunk
+            chunk, size = [], 0
+    if chunk:
+        yield chunk
+
+
+def _import_stream(user, upload, context_id):
+    """
+    Import a backup file without loading it whole. Header fields must come
+    before the data sections (as in our exports). Every section is validated
+    and bulk-inserted chunk by chunk as it is read; the small placement
+    sections are held back until the rows they point at exist, and together
+    with the header they must fit under the memory ceiling. Any error rolls
+    the whole import back.
+    """
+    reader = JSONStreamReader(upload, settings.IDEABIN_IMPORT_MAX_BUFFER_BYTES)
+    header = {}
+    seen = set()
+    deferred = {}
+    state = None
+    held = 0  # text size of everything kept in header / deferred
+
+    def charge():
+        nonlocal held
+        held += reader.last_size
+        if held > settings.IDEABIN_IMPORT_MAX_BUFFER_BYTES:
+            raise _ImportRejected(
+                "Header and placement sections exceed the import memory ceiling of "
+                f"{settings.IDEABIN_IMPORT_MAX_BUFFER_BYTES} bytes."
+            )
+
+    def hold(value):
+        """Read ``value`` into memory, counting it against the same ceiling as a chunk."""
+        if not hasattr(value, "__next__"):
+            charge()
+            return value
+        rows = []
+        for row in value:
+            rows.append(row)
+            charge()
+        return rows
+
+    def start():
+        err = _validate_common(header)
+        if err:
+            raise _ImportRejected(err)
+        if header["export_type"] == "context":
+            if not isinstance(header.get("context"), dict):
+                raise _ImportRejected("'context' must be an object that precedes the data sections.")
+            return _start_context_import(user, header["context"], context_id)
+        if context_id:
+            raise _ImportRejected(
+                "Cannot use context_id with a global export file. "
+                "Use a context-type export for single-context restore."
+            )
+        _delete_all_ideabin_data(user)
+        return _ImportState(user)
+
+    try:
+        with transaction.atomic():
+            for key, value in reader.members():
+                if key not in _SECTION_INSERTERS:
+                    header[key] = hold(value)
+                    continue
+                if not hasattr(value, "__next__"):
+                    raise _ImportRejected(f"'{key}' must be a list.")
+                if state is None:
+                    state = start()
+                seen.add(key)
+
+                insert, depends_on = _SECTION_INSERTERS[key]
+                if key.endswith("_context_placements"):
+                    deferred[key] = hold(value)
+                    err = _validate_section(key, deferred[key])
+                    if err:
+                        raise _ImportRejected(err)
+                    continue
+                pending = [d for d in depends_on if d not in seen and not (d == "contexts" and state.target_ctx)]
+                if pending:
+                    raise _ImportRejected(f"Section '{key}' must come after {pending} for a streaming import.")
+                insert(state, [])  # registers the section even when it is empty
+                for chunk in _stream_chunks(value, reader):
+                    err = _validate_section(key, chunk)
+                    if err:
+                        raise _ImportRejected(err)
+                    insert(state, chunk)
+
+            if state is None:
+                state = start()
+            required = _CONTEXT_REQUIRED_KEYS if header["export_type"] == "context" else _GLOBAL_REQUIRED_KEYS
+            err = _validate_keys(dict.fromkeys(set(header) | seen), required, header["export_type"])
+            if err:
+                raise _ImportRejected(err)
+            for key, rows in deferred.items():
+                _SECTION_INSERTERS[key][0](state, rows)
+            if state.target_ctx is None:
+                _finish_global_import(user, header.get("shortcuts", {}), header.get("filter_presets", []))
+
+    except JSONStreamError as exc:
+        return JsonResponse({"error": f"Invalid JSON file: {exc}"}, status=400)
+    except _ImportRejected as exc:
+        return JsonResponse({"error": str(exc)}, status=exc.status)
+    except Exception as exc:
+        return JsonResponse({"error": f"Import failed: {exc}"}, status=500)
+
+    response = {"status": "ok", "stats": state.stats()}
+    if state.target_ctx:
+        response.update(message="Context restored successfully.", context_id=state.target_ctx.id)
+    else:
+        response["message"] = "Full IdeaBin restore completed successfully."
+    return JsonResponse(response)
+
+
 # ─── deletion helpers ────────────────────────────────────
 
 def _delete_context_data(user, ctx):
@@ -0,0 +1,180 @@
+"""
+Incremental reader for large JSON uploads.
+
+Reads a top-level JSON object from a binary file in small blocks and yields
+its members one at a time; array members are yielded as lazy iterators over
+their items. Only the item currently being decoded is held in memory, and
+the text buffer never grows beyond ``max_buffer`` characters. Syntax errors
+are raised as soon as the offending value is reached.
+"""
+
+import codecs
+import json
+import re
+
+_WHITESPACE = re.compile(r"\s*")
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+# Strings (complete or just an opening quote) and structural brackets.
+_STRUCTURE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|"|[{}\[\]]', re.DOTALL)
+_SCALAR_END = re.compile(r"[,\]}\s]")
+
+
+class JSONStreamError(ValueError):
+    """Malformed input, or a single value larger than the memory ceiling."""
+
+
+class JSONStreamReader:
+    def __init__(self, fileobj, max_buffer, read_size=64 * 1024):
+        self._file = fileobj
+        self._max_buffer = max_buffer
+        self._read_size = min(read_size, max_buffer)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._offset = 0  # characters dropped from the front of the buffer
+        self._eof = False
+        self.last_size = 0  # text length of the most recently decoded value
+
+    # ── buffer management ──
+
+    def _error(self, message, pos=None):
+        at = self._offset + (self._pos if pos is None else pos)
+        return JSONStreamError(f"{message} (at character {at})")
+
+    def _too_large(self):
+        return self._error(f"A single value exceeds the import memory ceiling of {self._max_buffer} bytes")
+
+    def _fill(self):
+        """Drop consumed text and read another block. Returns False at EOF."""
+        if self._eof:
+            return False
+        if self._pos:
+            self._offset += self._pos
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        if len(self._buf) >= self._max_buffer:
+            raise self._too_large()
+        block = self._file.read(self._read_size)
+        try:
+            self._buf += self._decoder.decode(block, final=not block)
+        except UnicodeDecodeError as exc:
+            raise self._error(f"Invalid UTF-8: {exc}")
+        if not block:
+            self._eof = True
+        return True
+
+    def _peek(self):
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise self._error("Unexpected end of file")
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise self._error(f"Expected {char!r}")
+        self._pos += 1
+
+    # ── values ──
+
+    def _value_end(self):
+        """End index of the value starting at self._pos, reading more input as needed."""
+        first = self._buf[self._pos]
+        scan = self._pos
+        depth = 0
+        while True:
+            if first in "{[":
+                for match in _STRUCTURE.finditer(self._buf, scan):
+                    token = match.group()
+                    if token == '"':
+                        scan = match.start()  # string continues past the buffer
+                        break
+                    if token in "{[":
+                        depth += 1
+                    elif token in "}]":
+                        depth -= 1
+                        if depth == 0:
+                            return match.end()
+                    scan = match.end()
+                else:
+                    scan = len(self._buf)
+            elif first == '"':
+                match = _STRING.match(self._buf, self._pos)
+                if match:
+                    return match.end()
+            else:
+                match = _SCALAR_END.search(self._buf, self._pos)
+                if match:
+                    return match.start()
+                if self._eof:
+                    return len(self._buf)
+
+            relative = scan - self._pos
+            if not self._fill():
+                raise self._error("Unexpected end of file")
+            scan = self._pos + relative
+
+    def _read_value(self):
+        self._peek()
+        end = self._value_end()
+        if end - self._pos > self._max_buffer:
+            raise self._too_large()
+        text = self._buf[self._pos:end]
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError as exc:
+            raise self._error(f"Invalid JSON: {exc.msg}", self._pos + exc.pos)
+        self.last_size = len(text)
+        self._pos = end
+        return value
+
+    def _array_items(self):
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._read_value()
+            separator = self._peek()
+            self._pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise self._error("Expected ',' or ']'", self._pos - 1)
+
+    def members(self):
+        """
+        Yield (key, value) for each member of the top-level object. Array
+        values are yielded as iterators; whatever the caller does not consume
+        is skipped before the next member is read.
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+        else:
+            while True:
+                key = self._read_value()
+                if not isinstance(key, str):
+                    raise self._error("Expected an object key")
+                self._expect(":")
+                if self._peek() == "[":
+                    items = self._array_items()
+                    yield key, items
+                    for _ in items:
+                        pass
+                else:
+                    yield key, self._read_value()
+                separator = self._peek()
+                self._pos += 1
+                if separator == "}":
+                    break
+                if separator != ",":
+                    raise self._error("Expected ',' or '}'", self._pos - 1)
+
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                raise self._error("Unexpected data after the top-level object")
+            if not self._fill():
+                return
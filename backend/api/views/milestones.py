@@ -1,50 +1,40 @@
+import time
+
+from django.db import transaction
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from ..models import Project, Task, Milestone, MilestoneTodo, Dependency
+from ..models import Task, Milestone, MilestoneTodo, Dependency
 from .serializers import MilestoneSerializer_Deps, MilestoneTodoSerializer, DependencySerializer_Deps
-from .helpers import user_has_project_access
+from .helpers import parse_flag, project_access_required, revision_etag
+from ..changes import record_change
+from ..graph import DependencyCycleError, DependencyGraph, get_dependency_graph, invalidate_dependency_graph
+from ..schedule import cascade_shift, schedule_arrays, validate_moves
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
-def get_all_milestones(request, project_id):
+@project_access_required
+@revision_etag
+def get_all_milestones(request, project):
     """
     Get all milestones for a project.
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
-    all_milestones = Milestone.objects.filter(project=project).prefetch_related("todos", "task__acceptance_criteria")
-    if all_milestones.exists():
-        serialized = MilestoneSerializer_Deps(all_milestones, many=True)
-        return Response({"milestones": serialized.data})
-    else: 
-        return Response({"milestones": []})
+    all_milestones = Milestone.objects.filter(project=project).with_done_state().prefetch_related("todos")
+    serialized = MilestoneSerializer_Deps(all_milestones, many=True)
+    return Response({"milestones": serialized.data})
 
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
-def add_milestone(request, project_id):
+@project_access_required
+def add_milestone(request, project):
     """
     Add a new milestone to a task.
     Body: { "task_id": <id>, "name": <optional>, "description": <optional> }
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     task_id = request.data.get("task_id")
     if not task_id:
         return Response({"detail": "task_id is required"}, status=status.HTTP_400_BAD_REQUEST)
@@ -83,19 +73,13 @@ def add_milestone(request, project_id):
 
 @api_view(["PATCH"])
 @permission_classes([IsAuthenticated])
-def update_start_index(request, project_id):
+@project_access_required
+def update_start_index(request, project):
     """
     Update a milestone's start index.
-    Body: { "milestone_id": <id>, "index": <new_index> }
+    Body: { "milestone_id": <id>, "index": <new_index>, "cascade"?: bool }
+    With "cascade", milestones depending on it are pushed along (see _apply_moves).
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     new_index = request.data.get("index")
     milestone_id = request.data.get("milestone_id")
 
@@ -113,13 +97,20 @@ def update_start_index(request, project_id):
 
     # Hard deadline check
     if milestone.task and milestone.task.hard_deadline is not None:
-        new_end = new_index + (milestone.duration or 1) - 1
+        new_end = int(new_index) + (milestone.duration or 1) - 1
         if new_end > milestone.task.hard_deadline:
             return Response(
                 {"detail": "Move blocked: milestone would exceed task hard deadline"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+    try:
+        cascade = parse_flag(request.data, "cascade")
+    except ValueError as exc:
+        return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    if cascade:
+        return _apply_moves(project, {milestone.id: int(new_index)}, cascade=True)
+
     milestone.start_index = new_index
     milestone.save()
     return Response({"updated": "true"})
@@ -127,73 +118,95 @@ def update_start_index(request, project_id):
 
 @api_view(["PATCH"])
 @permission_classes([IsAuthenticated])
-def bulk_update_start_index(request, project_id):
+@project_access_required
+def bulk_update_start_index(request, project):
     """
     Move multiple milestones at once (single atomic operation).
-    Body: { "moves": [ { "milestone_id": <id>, "index": <new_index> }, ... ] }
+    Body: { "moves": [ { "milestone_id": <id>, "index": <new_index> }, ... ], "cascade"?: bool, "dry_run"?: bool }
+    The whole move set is validated together (see _apply_moves) and rejected
+    with every violation if anything breaks. With "cascade", milestones
+    depending on the moved ones are pushed along; with "dry_run", nothing
+    is written and the response previews the result.
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     moves = request.data.get("moves")
     if not moves or not isinstance(moves, list):
         return Response({"detail": "moves array is required"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        requested = {int(m["milestone_id"]): int(m["index"]) for m in moves}
+    except (KeyError, TypeError, ValueError):
+        return Response({"detail": "Each move needs an integer milestone_id and index"}, status=status.HTTP_400_BAD_REQUEST)
 
-    # Validate all moves first before persisting any
-    milestone_ids = [int(m["milestone_id"]) for m in moves]
-    milestones = {
-        ms.id: ms
-        for ms in Milestone.objects.select_related("task").filter(id__in=milestone_ids, project=project)
-    }
+    try:
+        cascade = parse_flag(request.data, "cascade")
+        dry_run = parse_flag(request.data, "dry_run")
+    except ValueError as exc:
+        return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
-    for m in moves:
-        ms_id = int(m["milestone_id"])
-        new_index = int(m["index"])
+    found = set(Milestone.objects.filter(id__in=requested, project=project).values_list("id", flat=True))
+    missing = [ms_id for ms_id in requested if ms_id not in found]
+    if missing:
+        return Response({"detail": f"Milestone {missing[0]} not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        if new_index < 0:
-            return Response({"detail": f"Milestone {ms_id} cannot be placed before day 0"}, status=status.HTTP_400_BAD_REQUEST)
+    return _apply_moves(project, requested, cascade=cascade, dry_run=dry_run)
 
-        ms = milestones.get(ms_id)
-        if not ms:
-            return Response({"detail": f"Milestone {ms_id} not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        if ms.task and ms.task.hard_deadline is not None:
-            new_end = new_index + (ms.duration or 1) - 1
-            if new_end > ms.task.hard_deadline:
-                return Response(
-                    {"detail": f"Move blocked: milestone {ms_id} would exceed task hard deadline"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+def _apply_moves(project, moves, cascade=False, dry_run=False):
+    """
+    Validate and apply ``moves`` ({milestone_id: start_index}) as one set.
+
+    With ``cascade`` every milestone that transitively depends on a moved
+    one is first shifted forward just enough to keep its dependencies
+    satisfied (skipping blocked start days). The resulting move set is then
+    checked in one pass against hard deadlines, the project date range and
+    every dependency touching a moved milestone; any violation rejects the
+    whole set. Moves are written with one bulk_update.
+    """
+    graph = get_dependency_graph(project)
+    starts, durations, deadlines = schedule_arrays(graph, project.id)
+    if cascade:
+        blocked_days = set(project.blocked_day_indices())
+        try:
+            moves = cascade_shift(graph, starts, durations, moves, blocked_days)
+        except DependencyCycleError as exc:
+            return Response(
+                {"detail": "Dependencies contain a cycle", "milestones": exc.milestone_ids},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+    days_count = project.get_days_count() or None
+    violations = validate_moves(graph, starts, durations, deadlines, moves, days_count)
+    move_list = [
+        {"milestone_id": milestone_id, "index": index, "previous_index": starts[graph.index[milestone_id]]}
+        for milestone_id, index in sorted(moves.items())
+    ]
 
-    # All validated — persist
-    for m in moves:
-        ms = milestones[int(m["milestone_id"])]
-        ms.start_index = int(m["index"])
-        ms.save(update_fields=["start_index"])
+    if dry_run:
+        return Response({"valid": not violations, "violations": violations, "moves": move_list})
+    if violations:
+        return Response(
+            {"detail": f"Move blocked: {violations[0]['detail']}", "violations": violations},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    with transaction.atomic():
+        Milestone.objects.bulk_update(
+            [Milestone(id=milestone_id, start_index=index) for milestone_id, index in moves.items()],
+            ["start_index"],
+        )
+    # bulk_update sends no signals
+    record_change("milestones", moves)
 
-    return Response({"updated": len(moves)})
+    return Response({"updated": len(moves), "moves": move_list})
 
 
 @api_view(["DELETE"])
 @permission_classes([IsAuthenticated])
-def delete_milestones(request, project_id):
+@project_access_required
+def delete_milestones(request, project):
     """
     Delete a milestone.
     Body: { "id": <milestone_id> }
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     milestone_id = request.data.get("id")
     if not milestone_id:
         return Response({"detail": "id is required"}, status=status.HTTP_400_BAD_REQUEST)
@@ -209,21 +222,14 @@ def delete_milestones(request, project_id):
 
 @api_view(["PATCH"])
 @permission_classes([IsAuthenticated])
-def toggle_milestone_done(request, project_id):
+@project_access_required
+def toggle_milestone_done(request, project):
     """
     Toggle the done state of a milestone by toggling its todos.
     is_done is computed: all todos must be done.
     If force_complete=true, marks all todos as done.
     Otherwise, returns an error listing incomplete todos.
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     milestone_id = request.data.get("milestone_id")
     if not milestone_id:
         return Response({"detail": "milestone_id is required"}, status=status.HTTP_400_BAD_REQUEST)
@@ -241,6 +247,7 @@ def toggle_milestone_done(request, project_id):
     if all_done:
         # Currently done → mark all todos as not done
         todos.update(done=False)
+        record_change("milestones", [milestone.id])
     else:
         # Currently not done → try to mark all as done
         incomplete = [t for t in todos if not t.done]
@@ -248,6 +255,7 @@ def toggle_milestone_done(request, project_id):
             force = request.data.get("force_complete", False)
             if force:
                 todos.filter(done=False).update(done=True)
+                record_change("milestones", [milestone.id])
             else:
                 return Response({
                     "detail": "Cannot mark milestone as done: not all TODOs are completed.",
@@ -255,26 +263,19 @@ def toggle_milestone_done(request, project_id):
                 }, status=status.HTTP_400_BAD_REQUEST)
 
     # Re-fetch to get updated state
-    milestone = Milestone.objects.prefetch_related("todos", "task__acceptance_criteria").get(pk=milestone.pk)
+    milestone = Milestone.objects.with_done_state().prefetch_related("todos").get(pk=milestone.pk)
     serialized = MilestoneSerializer_Deps(milestone)
     return Response(serialized.data, status=status.HTTP_200_OK)
 
 
 @api_view(["PATCH"])
 @permission_classes([IsAuthenticated])
-def toggle_milestone_todo(request, project_id):
+@project_access_required
+def toggle_milestone_todo(request, project):
     """
     Toggle an individual MilestoneTodo's done state.
     Body: { "milestone_id": <id>, "todo_id": <id> }
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     milestone_id = request.data.get("milestone_id")
     todo_id = request.data.get("todo_id")
     if not milestone_id or not todo_id:
@@ -294,26 +295,19 @@ def toggle_milestone_todo(request, project_id):
     todo.save(update_fields=["done"])
 
     # Return full milestone with updated computed fields
-    milestone = Milestone.objects.prefetch_related("todos", "task__acceptance_criteria").get(pk=milestone.pk)
+    milestone = Milestone.objects.with_done_state().prefetch_related("todos").get(pk=milestone.pk)
     serialized = MilestoneSerializer_Deps(milestone)
     return Response(serialized.data, status=status.HTTP_200_OK)
 
 
 @api_view(["PATCH"])
 @permission_classes([IsAuthenticated])
-def change_duration(request, project_id):
+@project_access_required
+def change_duration(request, project):
     """
     Change a milestone's duration.
     Body: { "id": <milestone_id>, "change": <delta> }
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     milestone_id = request.data.get("id")
     change = request.data.get("change")
 
@@ -352,19 +346,12 @@ def change_duration(request, project_id):
 
 @api_view(["PATCH"])
 @permission_classes([IsAuthenticated])
-def rename_milestone(request, project_id):
+@project_access_required
+def rename_milestone(request, project):
     """
     Rename a milestone.
     Body: { "id": <milestone_id>, "name": <new_name> }
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     milestone_id = request.data.get("id")
     new_name = request.data.get("name")
 
@@ -385,19 +372,12 @@ def rename_milestone(request, project_id):
 
 @api_view(["PATCH"])
 @permission_classes([IsAuthenticated])
-def move_milestone_task(request, project_id):
+@project_access_required
+def move_milestone_task(request, project):
     """
     Move a milestone to a different task within the same project.
     Body: { "milestone_id": <id>, "new_task_id": <id> }
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     milestone_id = request.data.get("milestone_id")
     new_task_id = request.data.get("new_task_id")
 
@@ -423,7 +403,8 @@ def move_milestone_task(request, project_id):
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
-def bulk_import_dependencies(request, project_id):
+@project_access_required
+def bulk_import_dependencies(request, project):
     """
     Create milestones for selected tasks and wire up dependencies from an AI-generated JSON.
 
@@ -439,154 +420,120 @@ def bulk_import_dependencies(request, project_id):
     to a description string (or null) for that dependency edge.
 
     Algorithm:
-    1. Create one milestone per task (named <task_name>_0).
-    2. Topological sort the DAG to assign layers (longest-path / level scheduling).
-    3. Tasks with no incoming → start_index = 0.
-       Tasks depending on others → start_index = max(dep.start_index + dep.duration) for all deps.
-       (duration defaults to 1, so the minimum gap is 1 day.)
-    4. Create Dependency records between the corresponding milestones.
+    1. Map the referenced tasks to dense indices and load the edges into a
+       DependencyGraph (prerequisite -> dependent) over integer arrays.
+    2. Walk it in topological order to assign layers (longest path):
+       tasks with no incoming edge start at 0, every other task the day
+       after its latest prerequisite (duration is 1).
+    3. In one transaction, bulk_create one milestone per task (named
+       <task_name>_0), its default todo, and the Dependency records.
+
+    The response carries row counts and per-phase timings (ms).
     """
-    from collections import defaultdict, deque
-    import json
-
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
+    started = time.perf_counter()
     deps_list = request.data.get("dependencies")
     if not deps_list or not isinstance(deps_list, list):
         return Response({"detail": '"dependencies" array is required'}, status=status.HTTP_400_BAD_REQUEST)
 
-    # Collect all referenced task IDs
+    # (prerequisite task, dependent task, description) per edge
     task_ids = set()
-    adj = defaultdict(list)       # task_id -> [task_ids it depends on]
-    in_degree = defaultdict(int)
-
-    for entry in deps_list:
-        tid = entry.get("task_id")
-        if tid is None:
-            return Response({"detail": 'Each entry needs "task_id"'}, status=status.HTTP_400_BAD_REQUEST)
-        tid = int(tid)
-        task_ids.add(tid)
-        depends_on = entry.get("depends_on", [])
-        if not isinstance(depends_on, list):
-            depends_on = []
-        for dep_id in depends_on:
-            dep_id = int(dep_id)
-            task_ids.add(dep_id)
-            adj[tid].append(dep_id)      # tid depends on dep_id  →  dep_id -> tid (edge)
+    edges = []
+    try:
+        for entry in deps_list:
+            if entry.get("task_id") is None:
+                return Response({"detail": 'Each entry needs "task_id"'}, status=status.HTTP_400_BAD_REQUEST)
+            tid = int(entry["task_id"])
+            task_ids.add(tid)
+            depends_on = entry.get("depends_on", [])
+            descriptions = entry.get("descriptions", {})
+            if not isinstance(depends_on, list):
+                depends_on = []
+            if not isinstance(descriptions, dict):
+                descriptions = {}
+            for dep_id in depends_on:
+                dep_id = int(dep_id)
+                task_ids.add(dep_id)
+                edges.append((dep_id, tid, descriptions.get(str(dep_id)) or descriptions.get(dep_id) or None))
+    except (AttributeError, TypeError, ValueError):
+        return Response({"detail": "task_id and depends_on must be task ids"}, status=status.HTTP_400_BAD_REQUEST)
 
     # Verify all tasks belong to this project
-    existing_tasks = {t.id: t for t in Task.objects.filter(id__in=task_ids, project=project)}
-    missing = task_ids - set(existing_tasks.keys())
+    existing_tasks = dict(Task.objects.filter(id__in=task_ids, project=project).values_list("id", "name"))
+    missing = task_ids - set(existing_tasks)
     if missing:
         return Response(
             {"detail": f"Tasks not found in project: {sorted(missing)}"},
             status=status.HTTP_400_BAD_REQUEST,
         )
+    validated = time.perf_counter()
 
-    # Build the DAG (edges go from dependency → dependent, i.e. prerequisite → task)
-    # For topological sort with "level" scheduling:
-    # forward_adj: dep_id -> [tasks that depend on dep_id]
-    forward_adj = defaultdict(list)
-    reverse_adj = defaultdict(list)   # task_id -> [task_ids it depends on]  (same as adj)
-    in_deg = defaultdict(int)
-
-    for entry in deps_list:
-        tid = int(entry["task_id"])
-        depends_on = entry.get("depends_on", [])
-        if not isinstance(depends_on, list):
-            depends_on = []
-        for dep_id in depends_on:
-            dep_id = int(dep_id)
-            forward_adj[dep_id].append(tid)
-            reverse_adj[tid].append(dep_id)
-            in_deg[tid] += 1
-
-    # Ensure every task_id is in in_deg (even roots)
-    for tid in task_ids:
-        if tid not in in_deg:
-            in_deg[tid] = 0
-
-    # Kahn's algorithm (topological sort) — also computes start_index per task
-    queue = deque()
-    start_indices = {}
-
-    for tid in task_ids:
-        if in_deg[tid] == 0:
-            queue.append(tid)
-            start_indices[tid] = 0
-
-    processed = 0
-    while queue:
-        tid = queue.popleft()
-        processed += 1
-        for dependent in forward_adj[tid]:
-            # The dependent's start must be at least (this task's start + 1)
-            candidate = start_indices[tid] + 1  # duration=1, so end = start+1-1 = start, next day = start+1
-            if dependent not in start_indices or candidate > start_indices[dependent]:
-                start_indices[dependent] = candidate
-            in_deg[dependent] -= 1
-            if in_deg[dependent] == 0:
-                queue.append(dependent)
-
-    if processed != len(task_ids):
+    # Layers: longest path from the roots, over the graph's CSR arrays
+    graph = DependencyGraph(task_ids, ((dep_id, tid, "strong") for dep_id, tid, _ in edges))
+    try:
+        layer = graph.layers()
+    except DependencyCycleError:
         return Response(
             {"detail": "Cycle detected in dependency graph — cannot schedule"},
             status=status.HTTP_400_BAD_REQUEST,
         )
-
-    # Create milestones
-    task_to_milestone = {}
-    created_milestones = []
-    for tid in task_ids:
-        task_obj = existing_tasks[tid]
-        ms = Milestone.objects.create(
-            project=project,
-            task=task_obj,
-            name=f"{task_obj.name}_0",
-            description="",
-            start_index=start_indices[tid],
-            duration=1,
-        )
-        task_to_milestone[tid] = ms
-        created_milestones.append(ms)
-
-    # Create dependencies between milestones
-    created_deps = []
-    for entry in deps_list:
-        tid = int(entry["task_id"])
-        depends_on = entry.get("depends_on", [])
-        descriptions = entry.get("descriptions", {})
-        if not isinstance(depends_on, list):
-            depends_on = []
-        if not isinstance(descriptions, dict):
-            descriptions = {}
-        for dep_id in depends_on:
-            dep_id = int(dep_id)
-            source_ms = task_to_milestone[dep_id]    # prerequisite
-            target_ms = task_to_milestone[tid]        # dependent
-            dep_desc = descriptions.get(str(dep_id)) or descriptions.get(dep_id)
-            dep_obj = Dependency.objects.create(
-                source=source_ms,
-                target=target_ms,
-                weight='strong',
-                description=dep_desc if dep_desc else None,
+    layered = time.perf_counter()
+
+    with transaction.atomic():
+        milestones = Milestone.objects.bulk_create([
+            Milestone(
+                project=project,
+                task_id=tid,
+                name=f"{existing_tasks[tid]}_0",
+                description="",
+                start_index=layer[i],
+                duration=1,
             )
-            created_deps.append(dep_obj)
-
+            for i, tid in enumerate(graph.ids)
+        ])
+        # Default todo so is_done can be derived (as in add_milestone)
+        todos = MilestoneTodo.objects.bulk_create([
+            MilestoneTodo(milestone=ms, title="Milestone finished", order=0) for ms in milestones
+        ])
+        task_to_milestone = dict(zip(graph.ids, milestones))
+        created_deps = Dependency.objects.bulk_create([
+            Dependency(
+                source=task_to_milestone[dep_id],    # prerequisite
+                target=task_to_milestone[tid],       # dependent
+                weight="strong",
+                description=description,
+            )
+            for dep_id, tid, description in edges
+        ])
+    # bulk_create sends no signals
+    invalidate_dependency_graph(project.id)
+    record_change("milestones", [ms.id for ms in milestones], "created")
+    record_change("dependencies", [dep.id for dep in created_deps], "created")
+    inserted = time.perf_counter()
+
+    created_milestones = (
+        Milestone.objects.filter(id__in=[ms.id for ms in milestones])
+        .with_done_state()
+        .prefetch_related("todos")
+        .order_by("id")
+    )
     milestones_data = MilestoneSerializer_Deps(created_milestones, many=True).data
     deps_data = DependencySerializer_Deps(created_deps, many=True).data
+    finished = time.perf_counter()
 
     return Response({
         "milestones": milestones_data,
         "dependencies": deps_data,
         "count": {
-            "milestones": len(created_milestones),
+            "milestones": len(milestones),
+            "todos": len(todos),
             "dependencies": len(created_deps),
+            "layers": max(layer, default=-1) + 1,
+        },
+        "timings_ms": {
+            "validate": round((validated - started) * 1000, 2),
+            "layers": round((layered - validated) * 1000, 2),
+            "insert": round((inserted - layered) * 1000, 2),
+            "serialize": round((finished - inserted) * 1000, 2),
+            "total": round((finished - started) * 1000, 2),
         },
-    }, status=status.HTTP_201_CREATED)
\ No newline at end of file
+    }, status=status.HTTP_201_CREATED)
@@ -1,11 +1,14 @@
+from django.db import transaction
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from ..models import Project, Phase, Team
+from ..changes import record_change
+from ..models import Phase, Team
+from ..phase_index import PhaseIndex
 from .serializers import PhaseSerializer
-from .helpers import user_has_project_access
+from .helpers import project_access_required, revision_etag
 
 
 def _check_phase_overlap(project, start_index, duration, team_id, exclude_phase_id=None):
@@ -17,37 +20,54 @@ def _check_phase_overlap(project, start_index, duration, team_id, exclude_phase_
       - Team-specific phases CAN overlap global phases and phases for different teams.
     Returns list of overlapping phase names, or empty list if no overlap.
     """
-    end_index = start_index + duration
-    candidates = Phase.objects.filter(project=project)
-    if exclude_phase_id:
-        candidates = candidates.exclude(pk=exclude_phase_id)
+    index = PhaseIndex.load(project, [team_id], exclude=[exclude_phase_id] if exclude_phase_id else ())
+    return [name for _, name in index.overlapping(team_id, start_index, duration)]
 
-    if team_id is None:
-        # Global phase: only conflicts with other global phases
-        candidates = candidates.filter(team__isnull=True)
-    else:
-        # Team phase: only conflicts with other phases for the same team
-        candidates = candidates.filter(team_id=team_id)
 
-    overlapping = []
-    for other in candidates:
-        if start_index < other.start_index + other.duration and other.start_index < end_index:
-            overlapping.append(other.name)
-    return overlapping
+def _apply_phase_fields(phase, data, project, teams=None):
+    """
+    Copy the editable fields present in ``data`` onto ``phase`` (unsaved).
+    ``teams`` ({id: Team}) saves a lookup per phase in batch updates.
+    Returns an error Response, or None.
+    """
+    if "name" in data:
+        phase.name = data["name"]
+    if "start_index" in data:
+        si = int(data["start_index"])
+        if si < 0:
+            return Response({"detail": "start_index must be >= 0"}, status=status.HTTP_400_BAD_REQUEST)
+        phase.start_index = si
+    if "duration" in data:
+        d = int(data["duration"])
+        if d < 1:
+            return Response({"detail": "duration must be >= 1"}, status=status.HTTP_400_BAD_REQUEST)
+        phase.duration = d
+    if "color" in data:
+        phase.color = data["color"]
+    if "order_index" in data:
+        phase.order_index = int(data["order_index"])
+    if "team" in data:
+        team_id = data["team"]
+        if team_id is None:
+            phase.team = None
+        elif teams is not None:
+            if int(team_id) not in teams:
+                return Response({"detail": "Team not found"}, status=status.HTTP_404_NOT_FOUND)
+            phase.team = teams[int(team_id)]
+        else:
+            try:
+                phase.team = Team.objects.get(pk=int(team_id), project=project)
+            except Team.DoesNotExist:
+                return Response({"detail": "Team not found"}, status=status.HTTP_404_NOT_FOUND)
+    return None
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
-def get_all_phases(request, project_id):
+@project_access_required
+@revision_etag
+def get_all_phases(request, project):
     """Get all phases for a project."""
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     phases = Phase.objects.filter(project=project)
     serialized = PhaseSerializer(phases, many=True)
     return Response({"phases": serialized.data})
@@ -55,19 +75,12 @@ def get_all_phases(request, project_id):
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
-def create_phase(request, project_id):
+@project_access_required
+def create_phase(request, project):
     """
     Create a new phase.
     Body: { "name": str, "start_index": int, "duration": int, "color"?: str, "team"?: int|null }
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     name = request.data.get("name", "New Phase")
     start_index = int(request.data.get("start_index", 0))
     duration = int(request.data.get("duration", 1))
@@ -114,49 +127,20 @@ def create_phase(request, project_id):
 
 @api_view(["PATCH"])
 @permission_classes([IsAuthenticated])
-def update_phase(request, project_id, phase_id):
+@project_access_required
+def update_phase(request, project, phase_id):
     """
     Update a phase's fields.
     Body: any of { "name", "start_index", "duration", "color", "order_index", "team" }
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     try:
         phase = Phase.objects.get(pk=phase_id, project=project)
     except Phase.DoesNotExist:
         return Response({"detail": "Phase not found"}, status=status.HTTP_404_NOT_FOUND)
 
-    if "name" in request.data:
-        phase.name = request.data["name"]
-    if "start_index" in request.data:
-        si = int(request.data["start_index"])
-        if si < 0:
-            return Response({"detail": "start_index must be >= 0"}, status=status.HTTP_400_BAD_REQUEST)
-        phase.start_index = si
-    if "duration" in request.data:
-        d = int(request.data["duration"])
-        if d < 1:
-            return Response({"detail": "duration must be >= 1"}, status=status.HTTP_400_BAD_REQUEST)
-        phase.duration = d
-    if "color" in request.data:
-        phase.color = request.data["color"]
-    if "order_index" in request.data:
-        phase.order_index = int(request.data["order_index"])
-    if "team" in request.data:
-        team_id = request.data["team"]
-        if team_id is None:
-            phase.team = None
-        else:
-            try:
-                phase.team = Team.objects.get(pk=int(team_id), project=project)
-            except Team.DoesNotExist:
-                return Response({"detail": "Team not found"}, status=status.HTTP_404_NOT_FOUND)
+    error = _apply_phase_fields(phase, request.data, project)
+    if error:
+        return error
 
     # Check overlap with new values
     overlapping = _check_phase_overlap(
@@ -174,18 +158,75 @@ def update_phase(request, project_id, phase_id):
     return Response({"phase": serialized.data})
 
 
-@api_view(["DELETE"])
+@api_view(["PATCH"])
 @permission_classes([IsAuthenticated])
-def delete_phase(request, project_id, phase_id):
-    """Delete a phase."""
+@project_access_required
+def bulk_update_phases(request, project):
+    """
+    Move / resize / edit many phases at once.
+    Body: { "phases": [ { "id": <phase_id>, ...any update_phase field }, ... ] }
+    The batch is checked as a whole, against the untouched phases and
+    against itself, and either every change is saved or none is.
+    """
+    changes = request.data.get("phases")
+    if not changes or not isinstance(changes, list):
+        return Response({"detail": "phases array is required"}, status=status.HTTP_400_BAD_REQUEST)
     try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
+        phase_ids = [int(change["id"]) for change in changes]
+    except (KeyError, TypeError, ValueError):
+        return Response({"detail": "Each change needs a phase id"}, status=status.HTTP_400_BAD_REQUEST)
+    if len(set(phase_ids)) != len(phase_ids):
+        return Response({"detail": "Each phase may appear only once"}, status=status.HTTP_400_BAD_REQUEST)
+
+    phases = Phase.objects.filter(project=project).in_bulk(phase_ids)
+    missing = [phase_id for phase_id in phase_ids if phase_id not in phases]
+    if missing:
+        return Response({"detail": f"Phase {missing[0]} not found"}, status=status.HTTP_404_NOT_FOUND)
+    teams = Team.objects.filter(project=project).in_bulk()
+
+    fields = set()
+    for phase_id, change in zip(phase_ids, changes):
+        error = _apply_phase_fields(phases[phase_id], change, project, teams)
+        if error:
+            error.data["id"] = phase_id
+            return error
+        fields.update(field for field in ("name", "start_index", "duration", "color", "order_index", "team") if field in change)
+
+    # every changed phase against the untouched ones, then against each other
+    untouched = PhaseIndex.load(project, {phase.team_id for phase in phases.values()}, exclude=phase_ids)
+    changed = PhaseIndex(
+        (phase.id, phase.team_id, phase.start_index, phase.duration, phase.name) for phase in phases.values()
+    )
+    conflicts = []
+    for phase_id in phase_ids:
+        phase = phases[phase_id]
+        overlapping = (
+            untouched.overlapping(phase.team_id, phase.start_index, phase.duration)
+            + changed.overlapping(phase.team_id, phase.start_index, phase.duration, exclude_id=phase.id)
+        )
+        if overlapping:
+            conflicts.append({"id": phase.id, "overlapping_phases": [name for _, name in overlapping]})
+    if conflicts:
+        return Response({
+            "detail": f"{len(conflicts)} phase(s) would overlap",
+            "conflicts": conflicts,
+        }, status=status.HTTP_409_CONFLICT)
 
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+    if fields:
+        with transaction.atomic():
+            Phase.objects.bulk_update(list(phases.values()), sorted(fields))
+        # bulk_update sends no signals
+        record_change("phases", phase_ids)
 
+    serialized = PhaseSerializer([phases[phase_id] for phase_id in phase_ids], many=True)
+    return Response({"phases": serialized.data})
+
+
+@api_view(["DELETE"])
+@permission_classes([IsAuthenticated])
+@project_access_required
+def delete_phase(request, project, phase_id):
+    """Delete a phase."""
     try:
         phase = Phase.objects.get(pk=phase_id, project=project)
     except Phase.DoesNotExist:
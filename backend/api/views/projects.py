@@ -12,7 +12,11 @@ from .serializers import (
     ProjectSerializer,
     ProjectSerializer_Deps,
 )
-from .helpers import user_has_project_access
+from .helpers import (
+    invalidate_project_access,
+    project_access_required,
+    user_has_project_access,
+)
 
 # List Projects
 @api_view(["GET"])
@@ -41,16 +45,15 @@ def list_all_projects(request):
     List ALL projects in the system, with info about user's relationship to each.
     """
     user = request.user
-    all_projects = Project.objects.all().order_by("-created_at")
+    all_projects = Project.objects.select_related("owner").prefetch_related("members").order_by("-created_at")
 
     serializer = ProjectSerializer(all_projects, many=True)
     data = serializer.data
 
     # Add membership info for each project
     for project_data in data:
-        project = Project.objects.get(id=project_data['id'])
-        project_data['is_owner'] = project.owner == user
-        project_data['is_member'] = user in project.members.all()
+        project_data['is_owner'] = project_data['owner'] == user.id
+        project_data['is_member'] = any(m['id'] == user.id for m in project_data['members_data'])
 
     return Response(data, status=status.HTTP_200_OK)
 
@@ -73,7 +76,7 @@ def join_project(request, pk):
         )
 
     # Check if already a member or owner
-    if project.owner == user or user in project.members.all():
+    if user_has_project_access(user, project):
         return Response(
             {"detail": "Already a member or owner of this project."},
             status=status.HTTP_400_BAD_REQUEST,
@@ -81,6 +84,7 @@ def join_project(request, pk):
 
     # Add user as member
     project.members.add(user)
+    invalidate_project_access(user)
 
     # Auto-adopt all contexts linked to this project
     ctx_ids = ProjectContextPlacement.objects.filter(
@@ -111,15 +115,15 @@ def leave_project(request, pk):
         )
 
     # Check if owner (can't leave own project)
-    if project.owner == user:
+    if project.owner_id == user.id:
         return Response(
             {"detail": "Project owner cannot leave their own project."},
             status=status.HTTP_400_BAD_REQUEST,
         )
 
     # Remove from members
-    if user in project.members.all():
-        project.members.remove(user)
+    project.members.remove(user)
+    invalidate_project_access(user)
 
     serializer = ProjectSerializer(project)
     return Response(serializer.data, status=status.HTTP_200_OK)
@@ -154,6 +158,7 @@ def create_project(request):
     )
     # Optional: Owner auch gleich als Mitglied hinzufügen
     project.members.add(request.user)
+    invalidate_project_access(request.user)
 
     # Auto-create a context for the project and link it
     ctx = Context.objects.create(
@@ -217,7 +222,10 @@ def delete_project(request, pk):
     if project.owner_id != user.id:
         return Response({"detail": "Only project owner can delete"}, status=status.HTTP_403_FORBIDDEN)
 
+    member_ids = list(project.members.values_list("id", flat=True))
     project.delete()
+    for member_id in member_ids:
+        invalidate_project_access(member_id)
     return Response({"detail": "Project deleted successfully"}, status=status.HTTP_204_NO_CONTENT)
 
 
@@ -269,18 +277,11 @@ def update_project(request, pk):
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
-def get_project_details(request, project_id):
+@project_access_required
+def get_project_details(request, project):
     """
     Get detailed project information.
     Used by the Dependencies view.
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     serialized = ProjectSerializer_Deps(project).data
     return Response({"project": serialized})
\ No newline at end of file
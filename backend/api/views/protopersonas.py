@@ -3,23 +3,16 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from ..models import Project, ProtoPersona, Milestone, Team, Task
+from ..models import ProtoPersona, Milestone, Team, Task
 from .serializers import ProtoPersonaSerializer
-from .helpers import user_has_project_access
+from .helpers import project_access_required
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
-def get_all_protopersonas(request, project_id):
+@project_access_required
+def get_all_protopersonas(request, project):
     """Get all protopersonas for a project."""
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     personas = ProtoPersona.objects.filter(project=project).prefetch_related("milestones", "teams", "tasks")
     serialized = ProtoPersonaSerializer(personas, many=True)
     return Response({"personas": serialized.data})
@@ -27,20 +20,13 @@ def get_all_protopersonas(request, project_id):
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
-def create_protopersona(request, project_id):
+@project_access_required
+def create_protopersona(request, project):
     """
     Create a new protopersona.
     Body: { "name": str, "color": str, "x": float, "z": float,
             "milestones": [int], "teams": [int], "tasks": [int] }
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     name = str(request.data.get("name", "")).strip()
     if not name:
         return Response({"detail": "Name is required"}, status=status.HTTP_400_BAD_REQUEST)
@@ -80,19 +66,12 @@ def create_protopersona(request, project_id):
 
 @api_view(["PATCH"])
 @permission_classes([IsAuthenticated])
-def update_protopersona(request, project_id, persona_id):
+@project_access_required
+def update_protopersona(request, project, persona_id):
     """
     Update a protopersona's position, M2M assignments, name, or color.
     Body: any of { "name", "color", "x", "z", "milestones": [int], "teams": [int], "tasks": [int] }
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     try:
         persona = ProtoPersona.objects.get(pk=persona_id, project=project)
     except ProtoPersona.DoesNotExist:
@@ -140,16 +119,9 @@ def update_protopersona(request, project_id, persona_id):
 
 @api_view(["DELETE"])
 @permission_classes([IsAuthenticated])
-def delete_protopersona(request, project_id, persona_id):
+@project_access_required
+def delete_protopersona(request, project, persona_id):
     """Delete a protopersona."""
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     try:
         persona = ProtoPersona.objects.get(pk=persona_id, project=project)
     except ProtoPersona.DoesNotExist:
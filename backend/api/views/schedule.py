@@ -0,0 +1,223 @@
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from ..changes import record_change
+from ..graph import DependencyCycleError, get_dependency_graph
+from ..leveling import level_resources
+from ..models import Milestone, Team
+from ..risk import duration_ranges, simulate
+from ..schedule import CriticalPath, schedule_arrays
+from ..workload import team_workload
+from .helpers import parse_flag, project_access_required, revision_etag
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@project_access_required
+@revision_etag
+def get_critical_path(request, project):
+    """
+    Earliest / latest start, slack and driving predecessor of every
+    milestone, plus the project's critical chain. Milestones start no
+    earlier than their planned start_index.
+    Suggestion dependencies are ignored; task hard deadlines cap latest finish.
+    """
+    graph = get_dependency_graph(project)
+    starts, durations, deadlines = schedule_arrays(graph, project.id)
+    try:
+        result = CriticalPath(graph, starts, durations, deadlines)
+    except DependencyCycleError as exc:
+        return Response(
+            {"detail": "Dependencies contain a cycle", "milestones": exc.milestone_ids},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    return Response({
+        "finish": result.finish,
+        "critical_path": result.critical_chain(),
+        "milestones": result.rows(),
+    })
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@project_access_required
+@revision_etag
+def get_team_workload(request, project):
+    """
+    Milestones active per team per day: ``load[i][d]`` is the count for
+    ``teams[i]`` on day ``d`` (0 on blocked days). A team id of null
+    collects milestones whose task has no team.
+    """
+    return Response(team_workload(project))
+
+
+def _parse_capacity(value, project):
+    """{team_id: capacity} from an int (every team) or a {team_id: int} mapping; None if invalid."""
+    team_ids = set(Team.objects.filter(project=project).values_list("id", flat=True))
+    try:
+        if isinstance(value, dict):
+            capacity = {int(team_id): int(limit) for team_id, limit in value.items()}
+        else:
+            capacity = dict.fromkeys(team_ids, int(value))
+    except (TypeError, ValueError):
+        return None
+    if not capacity.keys() <= team_ids or any(limit < 1 for limit in capacity.values()):
+        return None
+    return capacity
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+@project_access_required
+def level_project_resources(request, project):
+    """
+    Propose start indices that keep every team within its daily capacity,
+    only delaying milestones and never past a hard deadline, the project
+    end or a (non-suggestion) dependency. See api.leveling.
+    Body: { "capacity": <int for every team> | { "<team_id>": <int>, ... }, "apply"?: bool }
+    Without "apply" nothing is written.
+    """
+    capacity = _parse_capacity(request.data.get("capacity"), project)
+    if capacity is None:
+        return Response(
+            {"detail": "capacity must be a positive integer or a mapping of this project's team ids to one"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    try:
+        apply = parse_flag(request.data, "apply")
+    except ValueError as exc:
+        return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+    graph = get_dependency_graph(project)
+    starts, durations, deadlines = schedule_arrays(graph, project.id)
+    teams = [None] * len(graph)
+    for milestone_id, team_id in Milestone.objects.filter(project=project).values_list("id", "task__team_id"):
+        if milestone_id in graph.index:
+            teams[graph.index[milestone_id]] = team_id
+    try:
+        placed, overloads, overloads_before = level_resources(
+            graph, starts, durations, deadlines, teams, capacity, project.get_days_count(), project.blocked_day_indices(),
+        )
+    except DependencyCycleError as exc:
+        return Response(
+            {"detail": "Dependencies contain a cycle", "milestones": exc.milestone_ids},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    moves = {graph.ids[i]: placed[i] for i in range(len(graph)) if placed[i] != starts[i]}
+    if apply and moves:
+        with transaction.atomic():
+            Milestone.objects.bulk_update(
+                [Milestone(id=milestone_id, start_index=index) for milestone_id, index in moves.items()],
+                ["start_index"],
+            )
+        # bulk_update sends no signals
+        record_change("milestones", moves)
+
+    return Response({
+        "applied": apply,
+        "moves": [
+            {"milestone_id": milestone_id, "index": index, "previous_index": starts[graph.index[milestone_id]]}
+            for milestone_id, index in sorted(moves.items())
+        ],
+        "total_delay": sum(index - starts[graph.index[milestone_id]] for milestone_id, index in moves.items()),
+        "overloads_before": overloads_before,
+        "overloads": [
+            {"team": team_id, "day": day, "load": load, "capacity": capacity[team_id]}
+            for team_id, day, load in overloads
+        ],
+    })
+
+
+RISK_PERCENTILES = (10, 50, 80, 90, 95)
+
+
+def _parse_ranges(value, graph):
+    """{graph index: (low, mode, high)} from {"<milestone_id>": [low, mode, high]}; None if invalid."""
+    ranges = {}
+    try:
+        for milestone_id, (low, mode, high) in (value or {}).items():
+            low, mode, high = float(low), float(mode), float(high)
+            if not 0 < low <= mode <= high:
+                return None
+            ranges[graph.index[int(milestone_id)]] = (low, mode, high)
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+    return ranges
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+@project_access_required
+def simulate_schedule_risk(request, project):
+    """
+    Monte Carlo simulation of the project finish (see api.risk). Durations
+    vary by task difficulty unless given explicitly. Nothing is written.
+    Body: {
+      "samples"?: int (default 2000), "seed"?: int, "workers"?: int,
+      "target_day"?: int (default: the project's last day),
+      "ranges"?: { "<milestone_id>": [low, most_likely, high] }   (days)
+    }
+    """
+    try:
+        samples = int(request.data.get("samples", 2000))
+        seed = request.data.get("seed")
+        seed = None if seed is None else int(seed)
+        workers = min(max(int(request.data.get("workers", 1)), 1), settings.SCHEDULE_RISK_MAX_WORKERS)
+        target_day = request.data.get("target_day")
+        target_day = project.get_days_count() - 1 if target_day is None else int(target_day)
+    except (TypeError, ValueError):
+        return Response({"detail": "samples, seed, workers and target_day must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+    if not 1 <= samples <= settings.SCHEDULE_RISK_MAX_SAMPLES:
+        return Response(
+            {"detail": f"samples must be between 1 and {settings.SCHEDULE_RISK_MAX_SAMPLES}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    graph = get_dependency_graph(project)
+    explicit = _parse_ranges(request.data.get("ranges"), graph)
+    if explicit is None:
+        return Response(
+            {"detail": "ranges must map this project's milestone ids to [low, most_likely, high] with 0 < low <= most_likely <= high"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    starts, durations, _ = schedule_arrays(graph, project.id)
+    difficulties = [None] * len(graph)
+    for milestone_id, difficulty in Milestone.objects.filter(project=project).values_list("id", "task__difficulty"):
+        if milestone_id in graph.index:
+            difficulties[graph.index[milestone_id]] = difficulty
+    low, mode, high = duration_ranges(durations, difficulties, explicit)
+    try:
+        finish, criticality = simulate(graph, starts, low, mode, high, samples, seed=seed, workers=workers)
+    except DependencyCycleError as exc:
+        return Response(
+            {"detail": "Dependencies contain a cycle", "milestones": exc.milestone_ids},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    percentiles = {
+        f"p{p}": int(day) for p, day in zip(RISK_PERCENTILES, np.percentile(finish, RISK_PERCENTILES, method="inverted_cdf"))
+    }
+    data = {
+        "samples": samples,
+        "planned_finish": max((starts[i] + durations[i] - 1 for i in range(len(graph))), default=None),
+        "target_day": target_day if target_day >= 0 else None,
+        "on_time_probability": float((finish <= target_day).mean()) if target_day >= 0 else None,
+        "percentiles": percentiles,
+        "milestones": [
+            {"id": milestone_id, "criticality": round(float(index), 4)}
+            for milestone_id, index in zip(graph.ids, criticality)
+        ],
+    }
+    if project.start_date:
+        data["percentile_dates"] = {
+            name: project.start_date + timedelta(days=day) for name, day in percentiles.items()
+        }
+    return Response(data)
@@ -1,5 +1,6 @@
 from datetime import timedelta
 
+from django.db.models import Manager, Prefetch, prefetch_related_objects
 from rest_framework import serializers
 
 from ..models import (
@@ -28,6 +29,62 @@ from ..models import (
 )
 
 
+def _is_prefetched(obj, relation):
+    """True when ``obj.<relation>`` was loaded via prefetch_related, so
+    ``.all()`` can be read from memory without another query."""
+    return relation in getattr(obj, '_prefetched_objects_cache', {})
+
+
+def _items_done(items):
+    """True when there is at least one item and every item is done."""
+    items = list(items)
+    return bool(items) and all(i.done for i in items)
+
+
+def _task_is_done(task):
+    # Prefer the ``with_done_state()`` annotation; fall back to the criteria.
+    annotated = getattr(task, "is_done", None)
+    if annotated is not None:
+        return annotated
+    return _items_done(task.acceptance_criteria.all())
+
+
+def _prefetch_legend_assignments(tasks):
+    """Load ``legend_assignments`` (with their legend types) for every task
+    that does not already carry them, in one batched query."""
+    missing = [t for t in tasks if not _is_prefetched(t, "legend_assignments")]
+    if missing:
+        prefetch_related_objects(
+            missing,
+            Prefetch("legend_assignments", queryset=TaskLegendAssignment.objects.select_related("legend_type")),
+        )
+
+
+def _task_legend_types(task):
+    """Return {legend_id: {legend_type_id, name, color, icon}} for a task,
+    reading prefetched assignments when they are available."""
+    _prefetch_legend_assignments([task])
+    result = {}
+    for a in task.legend_assignments.all():
+        result[str(a.legend_id)] = {
+            "legend_type_id": a.legend_type_id,
+            "name": a.legend_type.name,
+            "color": a.legend_type.color,
+            "icon": a.legend_type.icon,
+        }
+    return result
+
+
+class TaskLegendListSerializer(serializers.ListSerializer):
+    """List serializer for tasks exposing ``legend_types``: batches the
+    legend-assignment lookup for the whole list up front."""
+
+    def to_representation(self, data):
+        tasks = list(data.all() if isinstance(data, Manager) else data)
+        _prefetch_legend_assignments(tasks)
+        return super().to_representation(tasks)
+
+
 # AcceptanceCriterionSerializer
 class AcceptanceCriterionSerializer(serializers.ModelSerializer):
     class Meta:
@@ -54,22 +111,21 @@ class MilestoneSerializer_Deps(serializers.ModelSerializer):
         fields = ["id", "name", "description", "project", "task", "start_index", "duration", "todos", "is_done", "is_done_effective"]
 
     def get_is_done(self, obj):
-        todos = obj.todos.all()
-        return todos.exists() and all(t.done for t in todos)
+        annotated = getattr(obj, "is_done", None)
+        if annotated is not None:
+            return annotated
+        return _items_done(obj.todos.all())
 
     def get_is_done_effective(self, obj):
+        annotated = getattr(obj, "is_done_effective", None)
+        if annotated is not None:
+            return annotated
         # Own TODOs done?
-        todos = obj.todos.all()
-        own_done = todos.exists() and all(t.done for t in todos)
-        if own_done:
+        if self.get_is_done(obj):
             return True
         # Parent task done? (all acceptance criteria done)
         task = obj.task
-        if task:
-            criteria = task.acceptance_criteria.all()
-            if criteria.exists() and all(c.done for c in criteria):
-                return True
-        return False
+        return bool(task) and _task_is_done(task)
 
 
 # ProjectSerializer
@@ -107,8 +163,7 @@ class TaskSerializer(serializers.ModelSerializer):
         ]
 
     def get_is_done(self, obj):
-        criteria = obj.acceptance_criteria.all()
-        return criteria.exists() and all(c.done for c in criteria)
+        return _task_is_done(obj)
 
 
 # TeamExpandedSerializer
@@ -168,21 +223,13 @@ class TaskSerializer_TeamView(serializers.ModelSerializer):
             "order_index",
             "legend_types",
         ]
+        list_serializer_class = TaskLegendListSerializer
 
     def get_is_done(self, obj):
-        criteria = obj.acceptance_criteria.all()
-        return criteria.exists() and all(c.done for c in criteria)
+        return _task_is_done(obj)
 
     def get_legend_types(self, obj):
-        result = {}
-        for a in obj.legend_assignments.select_related('legend', 'legend_type').all():
-            result[str(a.legend_id)] = {
-                "legend_type_id": a.legend_type_id,
-                "name": a.legend_type.name,
-                "color": a.legend_type.color,
-                "icon": a.legend_type.icon,
-            }
-        return result
+        return _task_legend_types(obj)
 
 
 # TaskExpandedSerializer
@@ -213,24 +260,16 @@ class TaskExpandedSerializer(serializers.ModelSerializer):
             'milestones',
             'legend_types',
         ]
+        list_serializer_class = TaskLegendListSerializer
 
     def get_assigned_members_data(self, obj):
         return [{"id": u.id, "username": u.username, "email": u.email} for u in obj.assigned_members.all()]
 
     def get_legend_types(self, obj):
-        result = {}
-        for a in obj.legend_assignments.select_related('legend', 'legend_type').all():
-            result[str(a.legend_id)] = {
-                "legend_type_id": a.legend_type_id,
-                "name": a.legend_type.name,
-                "color": a.legend_type.color,
-                "icon": a.legend_type.icon,
-            }
-        return result
+        return _task_legend_types(obj)
 
     def get_is_done(self, obj):
-        criteria = obj.acceptance_criteria.all()
-        return criteria.exists() and all(c.done for c in criteria)
+        return _task_is_done(obj)
 
 
 # IdeaSerializer
@@ -257,12 +296,15 @@ class IdeaSerializer(serializers.ModelSerializer):
         return obj.owner.username if obj.owner else None
 
     def get_placement_count(self, obj):
+        if _is_prefetched(obj, 'placements'):
+            return len(obj.placements.all())
         return obj.placements.count()
 
     def get_placement_categories(self, obj):
         """Return list of {id, name} dicts for categories where this idea is placed."""
+        placements = obj.placements.all() if _is_prefetched(obj, 'placements') else obj.placements.select_related('category').all()
         cats = []
-        for p in obj.placements.select_related('category').all():
+        for p in placements:
             cats.append({
                 "id": p.category.id if p.category else None,
                 "name": p.category.name if p.category else "Unassigned",
@@ -272,8 +314,9 @@ class IdeaSerializer(serializers.ModelSerializer):
 
     def get_legend_types(self, obj):
         """Return {legend_id: {legend_type_id, name, color, icon}} for every assigned legend."""
+        assignments = obj.legend_types.all() if _is_prefetched(obj, 'legend_types') else obj.legend_types.select_related('legend', 'legend_type').all()
         result = {}
-        for dt in obj.legend_types.select_related('legend', 'legend_type').all():
+        for dt in assignments:
             result[str(dt.legend_id)] = {
                 "legend_type_id": dt.legend_type_id,
                 "name": dt.legend_type.name,
@@ -283,14 +326,20 @@ class IdeaSerializer(serializers.ModelSerializer):
         return result
 
     def get_upvote_count(self, obj):
+        if _is_prefetched(obj, 'upvotes'):
+            return len(obj.upvotes.all())
         return obj.upvotes.count()
 
     def get_comment_count(self, obj):
+        if _is_prefetched(obj, 'comments'):
+            return len(obj.comments.all())
         return obj.comments.count()
 
     def get_user_has_upvoted(self, obj):
         request = self.context.get('request')
         if request and hasattr(request, 'user') and request.user.is_authenticated:
+            if _is_prefetched(obj, 'upvotes'):
+                return any(u.user_id == request.user.id for u in obj.upvotes.all())
             return obj.upvotes.filter(user=request.user).exists()
         return False
 
@@ -401,21 +450,13 @@ class TaskSerializer_Deps(serializers.ModelSerializer):
     class Meta:
         model = Task
         fields = "__all__"
+        list_serializer_class = TaskLegendListSerializer
 
     def get_is_done(self, obj):
-        criteria = obj.acceptance_criteria.all()
-        return criteria.exists() and all(c.done for c in criteria)
+        return _task_is_done(obj)
 
     def get_legend_types(self, obj):
-        result = {}
-        for a in obj.legend_assignments.select_related('legend', 'legend_type').all():
-            result[str(a.legend_id)] = {
-                "legend_type_id": a.legend_type_id,
-                "name": a.legend_type.name,
-                "color": a.legend_type.color,
-                "icon": a.legend_type.icon,
-            }
-        return result
+        return _task_legend_types(obj)
 
 
 class DependencySerializer_Deps(serializers.ModelSerializer):
@@ -426,6 +467,8 @@ class DependencySerializer_Deps(serializers.ModelSerializer):
 
 # DaySerializer
 class DaySerializer(serializers.ModelSerializer):
+    # days are addressed by index, and computed days have no row, so the index is the id
+    id = serializers.IntegerField(source="day_index", read_only=True)
     is_weekend = serializers.BooleanField(read_only=True)
     is_sunday = serializers.BooleanField(read_only=True)
     day_name = serializers.CharField(read_only=True)
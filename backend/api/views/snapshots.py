@@ -1,18 +1,26 @@
 """
 Project Snapshot endpoints — save and restore complete project state.
 """
+import time
+from contextlib import contextmanager
+from datetime import date as date_type, timedelta
+
+from django.db import transaction
+
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 
-from datetime import date as date_type
-
 from ..models import (
-    Project, ProjectSnapshot, Team, Task, Milestone,
-    Dependency, Day, Phase, DependencyView,
+    Project, ProjectSnapshot, Team, Task, AcceptanceCriterion, Milestone,
+    MilestoneTodo, Dependency, Day, Phase, DependencyView,
 )
 from .helpers import user_has_project_access
+from ..changes import record_reset
+
+# Rows per INSERT when rebuilding a project from a snapshot.
+RESTORE_BATCH_SIZE = 500
 
 
 def _capture_snapshot_data(project):
@@ -25,7 +33,12 @@ def _capture_snapshot_data(project):
     tasks = list(
         Task.objects.filter(project=project)
         .values('id', 'name', 'description', 'difficulty', 'priority',
-                'asking', 'team_id', 'order_index', 'hard_deadline')
+                'needs_approval', 'team_id', 'order_index', 'hard_deadline')
+    )
+
+    acceptance_criteria = list(
+        AcceptanceCriterion.objects.filter(task__project=project)
+        .values('task_id', 'title', 'description', 'done', 'order')
     )
 
     milestones = list(
@@ -33,16 +46,22 @@ def _capture_snapshot_data(project):
         .values('id', 'name', 'description', 'task_id', 'start_index', 'duration')
     )
 
+    milestone_todos = list(
+        MilestoneTodo.objects.filter(milestone__project=project)
+        .values('milestone_id', 'title', 'description', 'done', 'order')
+    )
+
     dependencies = list(
         Dependency.objects.filter(source__project=project)
-        .values('source_id', 'target_id', 'weight', 'reason')
+        .values('source_id', 'target_id', 'weight', 'reason', 'description')
     )
 
-    days = list(
-        Day.objects.filter(project=project)
-        .values('day_index', 'purpose', 'purpose_teams', 'description',
-                'is_blocked', 'color')
-    )
+    # only overridden days are stored; index them from the current start date
+    days = [
+        {'day_index': (d.pop('date') - project.start_date).days, **d}
+        for d in Day.objects.filter(project=project, date__range=(project.start_date, project.end_date))
+        .order_by('date').values('date', *Day.OVERRIDE_FIELDS)
+    ] if project.start_date and project.end_date else []
 
     phases = list(
         Phase.objects.filter(project=project)
@@ -62,7 +81,9 @@ def _capture_snapshot_data(project):
         },
         'teams': teams,
         'tasks': tasks,
+        'acceptance_criteria': acceptance_criteria,
         'milestones': milestones,
+        'milestone_todos': milestone_todos,
         'dependencies': dependencies,
         'days': days,
         'phases': phases,
@@ -70,6 +91,329 @@ def _capture_snapshot_data(project):
     }
 
 
+
+@contextmanager
+def _timed(report, entity):
+    """Record the wall time of the block (in ms) under ``report[entity]``."""
+    started = time.perf_counter()
+    entry = report.setdefault(entity, {'rows': 0})
+    yield entry
+    entry['ms'] = round((time.perf_counter() - started) * 1000, 2)
+
+
+def _restore_snapshot_data(project, data, user):
+    """
+    Replace the project's planning data with a captured snapshot.
+
+    Everything runs in one transaction: either the whole snapshot is applied
+    or the project is left untouched. Each entity class is inserted with a
+    single bulk_create and old snapshot ids are remapped to the new rows
+    through in-memory maps. Returns per-entity row counts and timings.
+    """
+    report = {}
+    with transaction.atomic():
+        # ── 1. Restore project dates ──
+        with _timed(report, 'project'):
+            proj_data = data.get('project', {})
+            if proj_data.get('start_date'):
+                sd = proj_data['start_date']
+                project.start_date = date_type.fromisoformat(sd) if isinstance(sd, str) else sd
+            if proj_data.get('end_date'):
+                ed = proj_data['end_date']
+                project.end_date = date_type.fromisoformat(ed) if isinstance(ed, str) else ed
+            project.save(update_fields=['start_date', 'end_date'])
+
+        # ── 2. Wipe current data ──
+        with _timed(report, 'wipe'):
+            Dependency.objects.filter(source__project=project).delete()
+            Milestone.objects.filter(project=project).delete()
+            Phase.objects.filter(project=project).delete()
+            DependencyView.objects.filter(project=project).delete()
+            Day.objects.filter(project=project).delete()
+            Task.objects.filter(project=project).delete()
+            Team.objects.filter(project=project).delete()
+            # every row gets a new id: the change log can't bridge this revision
+            record_reset()
+
+        # ── 3. Rebuild teams ──
+        with _timed(report, 'teams') as entry:
+            rows = data.get('teams', [])
+            teams = Team.objects.bulk_create([
+                Team(
+                    project=project,
+                    name=t['name'],
+                    color=t.get('color'),
+                    order_index=t.get('order_index', 0),
+                )
+                for t in rows
+            ], batch_size=RESTORE_BATCH_SIZE)
+            team_id_map = {t['id']: team.id for t, team in zip(rows, teams)}
+            entry['rows'] = len(teams)
+
+        # ── 4. Rebuild tasks (+ acceptance criteria) ──
+        with _timed(report, 'tasks') as entry:
+            rows = data.get('tasks', [])
+            tasks = Task.objects.bulk_create([
+                Task(
+                    project=project,
+                    name=tk['name'],
+                    description=tk.get('description'),
+                    difficulty=tk.get('difficulty'),
+                    priority=tk.get('priority'),
+                    needs_approval=tk.get('needs_approval', False),
+                    team_id=team_id_map.get(tk.get('team_id')),
+                    order_index=tk.get('order_index', 0),
+                    hard_deadline=tk.get('hard_deadline'),
+                )
+                for tk in rows
+            ], batch_size=RESTORE_BATCH_SIZE)
+            task_id_map = {tk['id']: task.id for tk, task in zip(rows, tasks)}
+            entry['rows'] = len(tasks)
+
+        with _timed(report, 'acceptance_criteria') as entry:
+            criteria = AcceptanceCriterion.objects.bulk_create([
+                AcceptanceCriterion(
+                    task_id=task_id_map[c['task_id']],
+                    title=c['title'],
+                    description=c.get('description', ''),
+                    done=c.get('done', False),
+                    order=c.get('order', 0),
+                )
+                for c in data.get('acceptance_criteria', [])
+                if c.get('task_id') in task_id_map
+            ], batch_size=RESTORE_BATCH_SIZE)
+            entry['rows'] = len(criteria)
+
+        # ── 5. Rebuild milestones (+ todos) ──
+        with _timed(report, 'milestones') as entry:
+            rows = [ms for ms in data.get('milestones', []) if ms.get('task_id') in task_id_map]
+            milestones = Milestone.objects.bulk_create([
+                Milestone(
+                    project=project,
+                    task_id=task_id_map[ms['task_id']],
+                    name=ms['name'],
+                    description=ms.get('description'),
+                    start_index=ms.get('start_index', 0),
+                    duration=ms.get('duration', 1),
+                )
+                for ms in rows
+            ], batch_size=RESTORE_BATCH_SIZE)
+            milestone_id_map = {ms['id']: new_ms.id for ms, new_ms in zip(rows, milestones)}
+            entry['rows'] = len(milestones)
+
+        with _timed(report, 'milestone_todos') as entry:
+            todos = MilestoneTodo.objects.bulk_create([
+                MilestoneTodo(
+                    milestone_id=milestone_id_map[t['milestone_id']],
+                    title=t['title'],
+                    description=t.get('description', ''),
+                    done=t.get('done', False),
+                    order=t.get('order', 0),
+                )
+                for t in data.get('milestone_todos', [])
+                if t.get('milestone_id') in milestone_id_map
+            ], batch_size=RESTORE_BATCH_SIZE)
+            entry['rows'] = len(todos)
+
+        # ── 6. Rebuild dependencies ──
+        with _timed(report, 'dependencies') as entry:
+            deps = Dependency.objects.bulk_create([
+                Dependency(
+                    source_id=milestone_id_map[dep['source_id']],
+                    target_id=milestone_id_map[dep['target_id']],
+                    weight=dep.get('weight', 'strong'),
+                    reason=dep.get('reason'),
+                    description=dep.get('description'),
+                )
+                for dep in data.get('dependencies', [])
+                if dep.get('source_id') in milestone_id_map and dep.get('target_id') in milestone_id_map
+            ], batch_size=RESTORE_BATCH_SIZE)
+            entry['rows'] = len(deps)
+
+        # ── 7. Rebuild day overrides (plain days are computed) ──
+        with _timed(report, 'days') as entry:
+            days = []
+            for d in data.get('days', []):
+                index = d.get('day_index')
+                if index is None or not 0 <= index < project.get_days_count():
+                    continue
+                day = Day(
+                    project=project,
+                    date=project.start_date + timedelta(days=index),
+                    day_index=index,
+                    purpose=d.get('purpose'),
+                    purpose_teams=d.get('purpose_teams'),
+                    description=d.get('description'),
+                    is_blocked=d.get('is_blocked', False),
+                    color=d.get('color'),
+                )
+                if day.has_overrides:
+                    days.append(day)
+            entry['rows'] = len(Day.objects.bulk_create(days, batch_size=RESTORE_BATCH_SIZE))
+
+        # ── 8. Rebuild phases ──
+        with _timed(report, 'phases') as entry:
+            phases = Phase.objects.bulk_create([
+                Phase(
+                    project=project,
+                    team_id=team_id_map.get(ph.get('team_id')),
+                    name=ph['name'],
+                    start_index=ph.get('start_index', 0),
+                    duration=ph.get('duration', 1),
+                    color=ph.get('color', '#3b82f6'),
+                    order_index=ph.get('order_index', 0),
+                )
+                for ph in data.get('phases', [])
+            ], batch_size=RESTORE_BATCH_SIZE)
+            entry['rows'] = len(phases)
+
+        # ── 9. Rebuild views ──
+        with _timed(report, 'views') as entry:
+            views = DependencyView.objects.bulk_create([
+                DependencyView(
+                    project=project,
+                    name=v['name'],
+                    state=v.get('state', {}),
+                    is_default=v.get('is_default', False),
+                    created_by=user,
+                )
+                for v in data.get('views', [])
+            ], batch_size=RESTORE_BATCH_SIZE)
+            entry['rows'] = len(views)
+
+    return report
+
+
+
+# ═══════════════════════════════════════════════════════
+#  SNAPSHOT DIFF
+# ═══════════════════════════════════════════════════════
+#
+# Entities are matched by id first and then by name among the leftovers, so a
+# snapshot still lines up with the live project after a restore remapped the
+# ids. Foreign keys (team_id, task_id, source/target) are translated through
+# the matches before comparing, so only real changes are reported.
+
+_DIFF_IGNORED_FIELDS = {'id'}
+
+
+def _match_rows(old_rows, new_rows):
+    """Pair rows by id, then by name. Returns {old_id: new_id} plus the unmatched rows."""
+    new_by_id = {row['id']: row for row in new_rows}
+    matches = {}
+    unmatched_old = []
+    for row in old_rows:
+        if row['id'] in new_by_id:
+            matches[row['id']] = row['id']
+        else:
+            unmatched_old.append(row)
+
+    matched_new = set(matches.values())
+    new_by_name = {}
+    for row in new_rows:
+        if row['id'] not in matched_new:
+            new_by_name.setdefault(row.get('name'), []).append(row)
+
+    removed = []
+    for row in unmatched_old:
+        candidates = new_by_name.get(row.get('name'))
+        if candidates:
+            matches[row['id']] = candidates.pop(0)['id']
+        else:
+            removed.append(row)
+    added = [row for rows in new_by_name.values() for row in rows]
+    return matches, added, removed
+
+
+def _field_changes(old, new, fk_maps):
+    """{field: [old, new]} for every differing field, with foreign keys translated."""
+    changes = {}
+    for field, value in new.items():
+        if field in _DIFF_IGNORED_FIELDS:
+            continue
+        before = old.get(field)
+        if field in fk_maps and before is not None:
+            before = fk_maps[field].get(before, before)
+        if before != value:
+            changes[field] = [old.get(field), value]
+    return changes
+
+
+def _diff_section(old_rows, new_rows, fk_maps):
+    matches, added, removed = _match_rows(old_rows, new_rows)
+    new_by_id = {row['id']: row for row in new_rows}
+    changed = []
+    for row in old_rows:
+        new_id = matches.get(row['id'])
+        if new_id is None:
+            continue
+        changes = _field_changes(row, new_by_id[new_id], fk_maps)
+        if changes:
+            changed.append({'id': new_id, 'name': new_by_id[new_id].get('name'), 'changes': changes})
+    return matches, {
+        'added': added,
+        'removed': [{'id': row['id'], 'name': row.get('name')} for row in removed],
+        'changed': changed,
+    }
+
+
+def _diff_dependencies(old_rows, new_rows, milestone_map):
+    def key(dep, translate):
+        if translate:
+            return milestone_map.get(dep['source_id']), milestone_map.get(dep['target_id'])
+        return dep['source_id'], dep['target_id']
+
+    new_by_key = {key(dep, False): dep for dep in new_rows}
+    seen = set()
+    removed, changed = [], []
+    for dep in old_rows:
+        k = key(dep, True)
+        match = new_by_key.get(k)
+        if match is None:
+            removed.append({'source_id': dep['source_id'], 'target_id': dep['target_id']})
+            continue
+        seen.add(k)
+        changes = {
+            field: [dep.get(field), match.get(field)]
+            for field in ('weight', 'reason', 'description')
+            if dep.get(field) != match.get(field)
+        }
+        if changes:
+            changed.append({'source_id': k[0], 'target_id': k[1], 'changes': changes})
+    added = [dep for k, dep in new_by_key.items() if k not in seen]
+    return {'added': added, 'removed': removed, 'changed': changed}
+
+
+def _diff_snapshot_data(old, new):
+    """
+    Structural diff between two captured states (see _capture_snapshot_data):
+    what changes when going from ``old`` to ``new``. Runs in linear time.
+    """
+    diff = {}
+    old_project, new_project = old.get('project', {}), new.get('project', {})
+    diff['project'] = {
+        field: [old_project.get(field), new_project.get(field)]
+        for field in ('start_date', 'end_date')
+        if old_project.get(field) != new_project.get(field)
+    }
+
+    team_map, diff['teams'] = _diff_section(old.get('teams', []), new.get('teams', []), {})
+    task_map, diff['tasks'] = _diff_section(
+        old.get('tasks', []), new.get('tasks', []), {'team_id': team_map})
+    milestone_map, diff['milestones'] = _diff_section(
+        old.get('milestones', []), new.get('milestones', []), {'task_id': task_map})
+    diff['dependencies'] = _diff_dependencies(
+        old.get('dependencies', []), new.get('dependencies', []), milestone_map)
+    _, diff['phases'] = _diff_section(
+        old.get('phases', []), new.get('phases', []), {'team_id': team_map})
+
+    diff['summary'] = {
+        section: {kind: len(entries) for kind, entries in diff[section].items()}
+        for section in ('teams', 'tasks', 'milestones', 'dependencies', 'phases')
+    }
+    return diff
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def list_snapshots(request, project_id):
@@ -104,11 +448,11 @@ def create_snapshot(request, project_id):
 
     data = _capture_snapshot_data(project)
 
-    snapshot = ProjectSnapshot.objects.create(
-        project=project,
+    snapshot = ProjectSnapshot.store(
+        project,
+        data,
         name=name,
         description=description,
-        data=data,
         created_by=request.user,
     )
 
@@ -138,18 +482,51 @@ def get_snapshot(request, project_id, snapshot_id):
         'id': snapshot.id,
         'name': snapshot.name,
         'description': snapshot.description,
-        'data': snapshot.data,
+        'data': snapshot.load_data(),
         'created_at': snapshot.created_at,
         'created_by': snapshot.created_by.username if snapshot.created_by else None,
     })
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def diff_snapshot(request, project_id, snapshot_id):
+    """
+    Diff a snapshot against the live project (default) or another snapshot
+    (?against=<snapshot_id>). Reports what changes when going from the
+    ``against`` state to the snapshot, i.e. what a restore would do.
+    """
+    project = Project.objects.filter(id=project_id).first()
+    if not project:
+        return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
+    if not user_has_project_access(request.user, project):
+        return Response({'error': 'Access denied'}, status=status.HTTP_403_FORBIDDEN)
+
+    snapshot = ProjectSnapshot.objects.filter(id=snapshot_id, project=project).first()
+    if not snapshot:
+        return Response({'error': 'Snapshot not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    against = request.query_params.get('against', 'live')
+    if against == 'live':
+        old = _capture_snapshot_data(project)
+    else:
+        other = ProjectSnapshot.objects.filter(id=against, project=project).first() if against.isdigit() else None
+        if not other:
+            return Response({'error': 'Snapshot to compare against not found'}, status=status.HTTP_404_NOT_FOUND)
+        old = other.load_data()
+        against = other.id
+
+    diff = _diff_snapshot_data(old, snapshot.load_data())
+    return Response({'from': against, 'to': snapshot.id, **diff})
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def restore_snapshot(request, project_id, snapshot_id):
     """
     Restore a project to a saved snapshot state.
     This REPLACES all teams, tasks, milestones, dependencies, days, phases, views.
+    The response reports rows and milliseconds per entity under "timings".
     """
     project = Project.objects.filter(id=project_id).first()
     if not project:
@@ -161,120 +538,19 @@ def restore_snapshot(request, project_id, snapshot_id):
     if not snapshot:
         return Response({'error': 'Snapshot not found'}, status=status.HTTP_404_NOT_FOUND)
 
-    data = snapshot.data
+    data = snapshot.load_data()
     if not data:
         return Response({'error': 'Snapshot data is empty'}, status=status.HTTP_400_BAD_REQUEST)
 
-    # ── 1. Restore project dates ──
-    proj_data = data.get('project', {})
-    if proj_data.get('start_date'):
-        sd = proj_data['start_date']
-        project.start_date = date_type.fromisoformat(sd) if isinstance(sd, str) else sd
-    if proj_data.get('end_date'):
-        ed = proj_data['end_date']
-        project.end_date = date_type.fromisoformat(ed) if isinstance(ed, str) else ed
-    project.save()
-
-    # ── 2. Wipe current data ──
-    Dependency.objects.filter(source__project=project).delete()
-    Milestone.objects.filter(project=project).delete()
-    Phase.objects.filter(project=project).delete()
-    DependencyView.objects.filter(project=project).delete()
-    Day.objects.filter(project=project).delete()
-    Task.objects.filter(project=project).delete()
-    Team.objects.filter(project=project).delete()
-
-    # ── 3. Rebuild teams ──
-    team_id_map = {}  # old id → new Team
-    for t in data.get('teams', []):
-        new_team = Team.objects.create(
-            project=project,
-            name=t['name'],
-            color=t.get('color'),
-            order_index=t.get('order_index', 0),
-        )
-        team_id_map[t['id']] = new_team
-
-    # ── 4. Rebuild tasks ──
-    task_id_map = {}  # old id → new Task
-    for tk in data.get('tasks', []):
-        new_team = team_id_map.get(tk.get('team_id'))
-        new_task = Task.objects.create(
-            project=project,
-            name=tk['name'],
-            description=tk.get('description'),
-            difficulty=tk.get('difficulty'),
-            priority=tk.get('priority'),
-            asking=tk.get('asking'),
-            team=new_team,
-            order_index=tk.get('order_index', 0),
-            hard_deadline=tk.get('hard_deadline'),
-        )
-        task_id_map[tk['id']] = new_task
-
-    # ── 5. Rebuild milestones ──
-    milestone_id_map = {}  # old id → new Milestone
-    for ms in data.get('milestones', []):
-        new_task = task_id_map.get(ms.get('task_id'))
-        if not new_task:
-            continue
-        new_ms = Milestone.objects.create(
-            project=project,
-            task=new_task,
-            name=ms['name'],
-            description=ms.get('description'),
-            start_index=ms.get('start_index', 0),
-            duration=ms.get('duration', 1),
-        )
-        milestone_id_map[ms['id']] = new_ms
-
-    # ── 6. Rebuild dependencies ──
-    for dep in data.get('dependencies', []):
-        src = milestone_id_map.get(dep.get('source_id'))
-        tgt = milestone_id_map.get(dep.get('target_id'))
-        if src and tgt:
-            Dependency.objects.create(
-                source=src,
-                target=tgt,
-                weight=dep.get('weight', 'strong'),
-                reason=dep.get('reason'),
-            )
-
-    # ── 7. Rebuild days ──
-    project.create_days()  # create Day objects from start/end dates
-    for d in data.get('days', []):
-        Day.objects.filter(project=project, day_index=d['day_index']).update(
-            purpose=d.get('purpose'),
-            purpose_teams=d.get('purpose_teams'),
-            description=d.get('description'),
-            is_blocked=d.get('is_blocked', False),
-            color=d.get('color'),
-        )
-
-    # ── 8. Rebuild phases ──
-    for ph in data.get('phases', []):
-        new_team = team_id_map.get(ph.get('team_id'))
-        Phase.objects.create(
-            project=project,
-            team=new_team,
-            name=ph['name'],
-            start_index=ph.get('start_index', 0),
-            duration=ph.get('duration', 1),
-            color=ph.get('color', '#3b82f6'),
-            order_index=ph.get('order_index', 0),
-        )
-
-    # ── 9. Rebuild views ──
-    for v in data.get('views', []):
-        DependencyView.objects.create(
-            project=project,
-            name=v['name'],
-            state=v.get('state', {}),
-            is_default=v.get('is_default', False),
-            created_by=request.user,
-        )
-
-    return Response({'success': True, 'message': f'Restored snapshot "{snapshot.name}"'})
+    started = time.perf_counter()
+    timings = _restore_snapshot_data(project, data, request.user)
+
+    return Response({
+        'success': True,
+        'message': f'Restored snapshot "{snapshot.name}"',
+        'timings': timings,
+        'total_ms': round((time.perf_counter() - started) * 1000, 2),
+    })
 
 
 @api_view(['DELETE'])
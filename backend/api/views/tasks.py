@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.db.models import Prefetch
 
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
@@ -13,10 +14,26 @@ from .serializers import (
     TaskSerializer_Deps,
     AcceptanceCriterionSerializer,
 )
-from .helpers import user_has_project_access
+from .helpers import project_access_required, user_has_project_access, revision_etag
+from ..changes import record_change, record_task_done_change
 from django.db import transaction
 
 
+def _milestones_with_done_state():
+    """Prefetch for ``task.milestones`` carrying the done-state annotations."""
+    return Prefetch("milestones", queryset=Milestone.objects.with_done_state().prefetch_related("todos"))
+
+
+def project_tasks_queryset(project):
+    """Tasks of ``project`` with everything TaskSerializer_Deps reads prefetched."""
+    return (
+        Task.objects
+        .filter(project=project)
+        .with_done_state()
+        .prefetch_related(_milestones_with_done_state(), "acceptance_criteria", "assigned_members", "legend_assignments__legend_type")
+    )
+
+
 # delete_task_by_id
 @api_view(["DELETE"])
 @permission_classes([IsAuthenticated])
@@ -51,19 +68,12 @@ def delete_task_by_id(request, project_id, task_id):
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
-def bulk_delete_tasks(request, project_id):
+@project_access_required
+def bulk_delete_tasks(request, project):
     """
     Delete multiple tasks at once.
     Body: { "task_ids": [1, 2, 3] }
     """
-    try:
-        project = Project.objects.get(id=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     task_ids = request.data.get("task_ids", [])
     if not isinstance(task_ids, list) or len(task_ids) == 0:
         return Response({"detail": "Provide a non-empty 'task_ids' array."}, status=status.HTTP_400_BAD_REQUEST)
@@ -99,8 +109,9 @@ def project_tasks(request, project_id):
         tasks = (
             Task.objects
             .filter(project=project)
+            .with_done_state()
             .select_related("team")
-            .prefetch_related("acceptance_criteria", "milestones", "milestones__todos")
+            .prefetch_related("acceptance_criteria", _milestones_with_done_state())
         )
 
         serializer = TaskSerializer_TeamView(tasks, many=True)
@@ -175,7 +186,7 @@ def project_tasks(request, project_id):
                 task.assigned_members.set(users)
 
         # Re-fetch with prefetch to include newly created criteria
-        task = Task.objects.select_related("team").prefetch_related("acceptance_criteria").get(pk=task.pk)
+        task = Task.objects.with_done_state().select_related("team").prefetch_related("acceptance_criteria").get(pk=task.pk)
         serializer = TaskSerializer_TeamView(task)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
@@ -193,8 +204,9 @@ def task_detail_view(request, project_id, task_id):
     try:
         task = (
             Task.objects
+            .with_done_state()
             .select_related("project", "team")
-            .prefetch_related("acceptance_criteria", "milestones__todos")
+            .prefetch_related("acceptance_criteria", _milestones_with_done_state())
             .get(
                 id=task_id,
                 project_id=project_id,
@@ -285,7 +297,7 @@ def task_detail_view(request, project_id, task_id):
         task.save()
 
         # Re-fetch with prefetch to include updated criteria
-        task = Task.objects.select_related("project", "team").prefetch_related("acceptance_criteria").get(pk=task.pk)
+        task = Task.objects.with_done_state().select_related("project", "team").prefetch_related("acceptance_criteria").get(pk=task.pk)
         serializer = TaskExpandedSerializer(task)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -406,21 +418,10 @@ def user_tasks(request):
 # fetch_project_tasks - Used by Dependencies view
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
-def fetch_project_tasks(request, project_id):
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
-    all_tasks = (
-        Task.objects
-        .filter(project=project)
-        .prefetch_related("milestones", "milestones__todos", "acceptance_criteria", "legend_assignments", "legend_assignments__legend", "legend_assignments__legend_type")  
-        .order_by("team_id", "order_index")
-    )
+@project_access_required
+@revision_etag
+def fetch_project_tasks(request, project):
+    all_tasks = project_tasks_queryset(project).order_by("team_id", "order_index")
 
     serialized = TaskSerializer_Deps(all_tasks, many=True).data
 
@@ -449,7 +450,8 @@ def fetch_project_tasks(request, project_id):
 # reorder_team_tasks - Reorder tasks within a team or move between teams
 @api_view(["PATCH"])
 @permission_classes([IsAuthenticated])
-def reorder_team_tasks(request, project_id):
+@project_access_required
+def reorder_team_tasks(request, project):
     """
     Reorder tasks within a team, or move a task to another team.
     Body:
@@ -459,14 +461,6 @@ def reorder_team_tasks(request, project_id):
         "order": [10, 123, 11, 12]  # task ids in desired order for target team
       }
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     task_id = request.data.get("task_id")
     target_team_id = request.data.get("target_team_id")
     order = request.data.get("order")
@@ -505,10 +499,12 @@ def reorder_team_tasks(request, project_id):
                 for idx, t in enumerate(old_team_tasks):
                     if t.order_index != idx:
                         Task.objects.filter(pk=t.pk).update(order_index=idx)
+                        record_change("tasks", [t.pk])
 
         # Apply new order in target team
         for idx, tid in enumerate(order):
-            Task.objects.filter(pk=tid, project=project, team=target_team).update(order_index=idx)
+            if Task.objects.filter(pk=tid, project=project, team=target_team).update(order_index=idx):
+                record_change("tasks", [tid])
 
     return Response({
         "status": "ok",
@@ -521,19 +517,12 @@ def reorder_team_tasks(request, project_id):
 # set_task_deadline
 @api_view(["PATCH"])
 @permission_classes([IsAuthenticated])
-def set_task_deadline(request, project_id, task_id):
+@project_access_required
+def set_task_deadline(request, project, task_id):
     """
     Set or clear a hard deadline on a task.
     Body: { "hard_deadline": <day_index | null> }
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     try:
         task = Task.objects.get(pk=task_id, project=project)
     except Task.DoesNotExist:
@@ -630,6 +619,7 @@ def toggle_task_done(request, project_id, task_id):
     if all_done:
         # Currently done → mark all criteria as not done
         criteria.update(done=False)
+        record_task_done_change([task.id])
     else:
         # Currently not done → try to mark all as done
         incomplete = [c for c in criteria if not c.done]
@@ -637,6 +627,7 @@ def toggle_task_done(request, project_id, task_id):
             force = request.data.get("force_complete_criteria", False)
             if force:
                 criteria.filter(done=False).update(done=True)
+                record_task_done_change([task.id])
             else:
                 return Response({
                     "detail": "Cannot mark task as done: not all acceptance criteria are completed.",
@@ -644,7 +635,7 @@ def toggle_task_done(request, project_id, task_id):
                 }, status=status.HTTP_400_BAD_REQUEST)
 
     # Re-fetch to get updated criteria
-    task = Task.objects.select_related("project", "team").prefetch_related("acceptance_criteria").get(pk=task.pk)
+    task = Task.objects.with_done_state().select_related("project", "team").prefetch_related("acceptance_criteria").get(pk=task.pk)
     serializer = TaskExpandedSerializer(task)
     return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -1,17 +1,19 @@
 from django.db import transaction
+from django.db.models import Prefetch
 
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from ..models import Project, Team
+from ..models import Project, Team, Task
 from .serializers import (
     TeamExpandedSerializer,
     BasicTeamSerializer,
     TeamSerializer_Deps,
 )
-from .helpers import user_has_project_access
+from .helpers import project_access_required, user_has_project_access
+from ..changes import record_change
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
@@ -101,8 +103,8 @@ def project_teams_expanded(request, project_id):
     all_teams = (
         Team.objects
         .prefetch_related(
-            "tasks",
-            "tasks__milestones",  # was "tasks__attempts"
+            Prefetch("tasks", queryset=Task.objects.with_done_state().prefetch_related("acceptance_criteria")),
+            "members",
         )
         .filter(project_id=project_id)
     )
@@ -167,6 +169,7 @@ def reorder_project_teams(request, project_id):
     with transaction.atomic():
         for idx, team_id in enumerate(order):
             Team.objects.filter(project_id=project_id, id=team_id).update(line_index=idx)
+        record_change("teams", order)
 
     return Response({"ok": True, "saved_order": order}, status=status.HTTP_200_OK)
 
@@ -238,19 +241,12 @@ def user_teams(request):
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
-def fetch_project_teams(request, project_id):
+@project_access_required
+def fetch_project_teams(request, project):
     """
     Fetch all teams for a project ordered by order_index.
     Used by the Dependencies view.
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     all_teams = Team.objects.filter(project=project).order_by("order_index")
     serialized_teams = TeamSerializer_Deps(all_teams, many=True)
 
@@ -259,19 +255,12 @@ def fetch_project_teams(request, project_id):
 
 @api_view(["PATCH"])
 @permission_classes([IsAuthenticated])
-def safe_team_order(request, project_id):
+@project_access_required
+def safe_team_order(request, project):
     """
     Save the team order for a project.
     Body: { "order": [team_id, team_id, ...] }
     """
-    try:
-        project = Project.objects.get(pk=project_id)
-    except Project.DoesNotExist:
-        return Response({"detail": "Project not found"}, status=status.HTTP_404_NOT_FOUND)
-
-    if not user_has_project_access(request.user, project):
-        return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
-
     order = request.data.get("order")
 
     if not isinstance(order, list):
@@ -279,6 +268,7 @@ def safe_team_order(request, project_id):
 
     with transaction.atomic():
         for index, team_id in enumerate(order):
-            Team.objects.filter(id=team_id, project=project).update(order_index=index)
+            if Team.objects.filter(id=team_id, project=project).update(order_index=index):
+                record_change("teams", [team_id])
 
     return Response({"status": "ok"})
\ No newline at end of file
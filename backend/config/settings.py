@@ -14,6 +14,7 @@ import os
 from datetime import timedelta
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
 from dotenv import load_dotenv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -75,6 +76,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.middleware.ProjectRevisionMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -164,6 +166,58 @@ REST_FRAMEWORK = {
 }
 
 
+# Project access cache: seconds to cache each user's accessible project ids
+# across requests (0 = only memoise within a request). Needs a cache shared by
+# every worker process, so it stays off while the default cache is the
+# per-process in-memory one; set CACHE_DIR (e.g. /app/db/cache on the mounted
+# volume) to share a file-based cache between the gunicorn workers.
+PROJECT_ACCESS_CACHE_TIMEOUT = int(os.getenv("PROJECT_ACCESS_CACHE_TIMEOUT", "0"))
+if os.getenv("CACHE_DIR"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.getenv("CACHE_DIR"),
+        }
+    }
+
+# Project snapshots: write a full keyframe every N snapshots of a project,
+# the ones in between are stored as compressed deltas against it.
+SNAPSHOT_KEYFRAME_INTERVAL = int(os.getenv("SNAPSHOT_KEYFRAME_INTERVAL", "10"))
+
+# IdeaBin streaming import (?stream=1): the most backup text held in memory
+# at once. A single row larger than this is rejected.
+IDEABIN_IMPORT_MAX_BUFFER_BYTES = int(os.getenv("IDEABIN_IMPORT_MAX_BUFFER_BYTES", str(16 * 1024 * 1024)))
+
+# Project change log (GET /projects/<id>/changes/?since=N): how many revisions
+# of history to keep, and how often (in revisions) to compact it. Clients
+# older than the retained window get 410 and refetch everything.
+PROJECT_CHANGE_LOG_RETENTION = int(os.getenv("PROJECT_CHANGE_LOG_RETENTION", "500"))
+PROJECT_CHANGE_LOG_COMPACT_EVERY = int(os.getenv("PROJECT_CHANGE_LOG_COMPACT_EVERY", "200"))
+
+# Live project events (GET /projects/<id>/events/, server-sent events).
+# The backend carries events between processes: api.events.LocalBackend only
+# reaches streams in the writing process, api.events.ChangeLogBackend polls
+# the change log so every gunicorn worker sees every write.
+PROJECT_EVENTS_BACKEND = os.getenv("PROJECT_EVENTS_BACKEND", "api.events.ChangeLogBackend")
+PROJECT_EVENTS_POLL_SECONDS = float(os.getenv("PROJECT_EVENTS_POLL_SECONDS", "1"))
+PROJECT_EVENTS_HEARTBEAT_SECONDS = float(os.getenv("PROJECT_EVENTS_HEARTBEAT_SECONDS", "15"))
+# Streams end after this long (clients reconnect with Last-Event-ID).
+PROJECT_EVENTS_STREAM_SECONDS = float(os.getenv("PROJECT_EVENTS_STREAM_SECONDS", "300"))
+PROJECT_EVENTS_RETRY_MS = int(os.getenv("PROJECT_EVENTS_RETRY_MS", "3000"))
+# Events queued per stream before a slow client is told to resync instead.
+PROJECT_EVENTS_MAX_PENDING = int(os.getenv("PROJECT_EVENTS_MAX_PENDING", "100"))
+# Change-log entries replayed on reconnect before falling back to resync.
+PROJECT_EVENTS_REPLAY_LIMIT = int(os.getenv("PROJECT_EVENTS_REPLAY_LIMIT", "2000"))
+
+# Milestone dependency graphs kept in memory per process (LRU by project).
+DEPENDENCY_GRAPH_CACHE_SIZE = int(os.getenv("DEPENDENCY_GRAPH_CACHE_SIZE", "128"))
+
+# Monte Carlo schedule risk: most scenarios per request, and most worker
+# processes a request may shard them over (1 = simulate in the request thread).
+SCHEDULE_RISK_MAX_SAMPLES = int(os.getenv("SCHEDULE_RISK_MAX_SAMPLES", "50000"))
+SCHEDULE_RISK_MAX_WORKERS = int(os.getenv("SCHEDULE_RISK_MAX_WORKERS", "1"))
+
+
 # JWT Settings
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=120),
@@ -173,6 +227,9 @@ SIMPLE_JWT = {
 
 # CORS Settings
 CORS_ALLOW_CREDENTIALS = True
+# Conditional GETs on planning endpoints (ETag / If-None-Match)
+CORS_ALLOW_HEADERS = (*default_headers, "if-none-match")
+CORS_EXPOSE_HEADERS = ["ETag"]
 
 if DEBUG:
     # Development - allow localhost